@@ -0,0 +1,161 @@
+import math
+import cairo
+import constants
+
+
+def draw_sky_gradient(ctx, width, ground_y):
+    sky_top = constants.SKY_TOP_COLOR
+    sky_bottom = constants.SKY_BOTTOM_COLOR
+    pat = cairo.LinearGradient(0, 0, 0, ground_y)
+    pat.add_color_stop_rgb(0, sky_top[0]/255.0, sky_top[1]/255.0, sky_top[2]/255.0)
+    pat.add_color_stop_rgb(1, sky_bottom[0]/255.0, sky_bottom[1]/255.0, sky_bottom[2]/255.0)
+    ctx.rectangle(0, 0, width, ground_y)
+    ctx.set_source(pat)
+    ctx.fill()
+
+
+def draw_city_pattern(ctx, x, ground_y):
+    city = constants.CITY_COLOR
+    window = constants.CITY_WINDOW_COLOR
+    ctx.set_source_rgb(city[0]/255.0, city[1]/255.0, city[2]/255.0)
+    ctx.rectangle(x + 20, ground_y - 180, 50, 180)
+    ctx.fill()
+    ctx.rectangle(x + 80, ground_y - 120, 60, 120)
+    ctx.fill()
+    ctx.rectangle(x + 150, ground_y - 220, 70, 220)
+    ctx.fill()
+    ctx.rectangle(x + 230, ground_y - 150, 90, 150)
+    ctx.fill()
+    ctx.set_source_rgb(window[0]/255.0, window[1]/255.0, window[2]/255.0)
+    for row in range(6):
+        for col in range(3):
+            ctx.rectangle(x + 160 + col*15, ground_y - 200 + row*25, 8, 15)
+    ctx.fill()
+
+
+def draw_cloud_pattern(ctx, x):
+    ctx.set_source_rgba(1, 1, 1, 0.6)
+    ctx.arc(x + 100, 80, 40, 0, 2 * math.pi)
+    ctx.arc(x + 140, 70, 50, 0, 2 * math.pi)
+    ctx.arc(x + 180, 80, 40, 0, 2 * math.pi)
+    ctx.fill()
+    ctx.arc(x + 320, 120, 25, 0, 2 * math.pi)
+    ctx.arc(x + 350, 120, 30, 0, 2 * math.pi)
+    ctx.fill()
+
+
+def draw_ground_base(ctx, width, ground_y, height):
+    ground = constants.GROUND_COLOR
+    ctx.set_source_rgb(ground[0]/255.0, ground[1]/255.0, ground[2]/255.0)
+    ctx.rectangle(0, ground_y, width, height - ground_y)
+    ctx.fill()
+    ctx.set_source_rgba(1, 1, 1, 0.15)
+    ctx.rectangle(0, ground_y, width, 10)
+    ctx.fill()
+
+
+def draw_ground_pattern(ctx, x, ground_y):
+    detail = constants.GROUND_DETAIL_COLOR
+    ctx.set_source_rgb(detail[0]/255.0, detail[1]/255.0, detail[2]/255.0)
+    for i in range(5):
+        gx = x + i * 40
+        ctx.move_to(gx, ground_y)
+        ctx.line_to(gx + 10, ground_y + 15)
+        ctx.line_to(gx + 20, ground_y)
+        ctx.fill()
+
+
+class ParallaxLayer:
+    # Satu strip parallax yang dirender sekali ke tile selebar layar + satu pola
+    def __init__(self, pattern_width, top, height, tile):
+        self.pattern_width = pattern_width
+        self.top = top
+        self.height = height
+        self.tile = tile
+
+    def offset(self, scroll):
+        # Offset sama persis dengan loop lama: pola mulai di (-int(scroll) % lebar) - lebar
+        return (-int(scroll) % self.pattern_width) - self.pattern_width
+
+    def composite(self, ctx, scroll):
+        x = self.offset(scroll)
+        ctx.set_source_surface(self.tile, x, self.top)
+        ctx.rectangle(x, self.top, self.tile.get_width(), self.height)
+        ctx.fill()
+
+
+class ParallaxLayerCache:
+    def __init__(self):
+        self.key = None
+        self.sky = None
+        self.city = None
+        self.clouds = None
+        self.ground = None
+        self.builds = 0
+
+    def current_key(self):
+        return (
+            constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT, constants.GROUND_Y,
+            constants.SKY_TOP_COLOR, constants.SKY_BOTTOM_COLOR,
+            constants.CITY_COLOR, constants.CITY_WINDOW_COLOR,
+            constants.GROUND_COLOR, constants.GROUND_DETAIL_COLOR,
+            constants.PARALLAX_CITY_PATTERN_WIDTH,
+            constants.PARALLAX_SKY_PATTERN_WIDTH,
+            constants.PARALLAX_GROUND_PATTERN_WIDTH,
+        )
+
+    def invalidate(self):
+        self.key = None
+
+    def _make_tile(self, pattern_width, top, height, draw_pattern, draw_base=None):
+        width = constants.SCREEN_WIDTH
+        repeats = int(math.ceil(width / float(pattern_width))) + 1
+        tile_width = repeats * pattern_width
+        tile = cairo.ImageSurface(cairo.FORMAT_ARGB32, tile_width, height)
+        ctx = cairo.Context(tile)
+        ctx.translate(0, -top)
+        if draw_base is not None:
+            draw_base(ctx, tile_width)
+        for i in range(repeats):
+            draw_pattern(ctx, i * pattern_width)
+        tile.flush()
+        return ParallaxLayer(pattern_width, top, height, tile)
+
+    def build(self):
+        width = constants.SCREEN_WIDTH
+        height = constants.SCREEN_HEIGHT
+        ground_y = constants.GROUND_Y
+
+        sky = cairo.ImageSurface(cairo.FORMAT_RGB24, width, ground_y)
+        draw_sky_gradient(cairo.Context(sky), width, ground_y)
+        sky.flush()
+        self.sky = sky
+
+        # Gedung tertinggi setinggi 220px di atas tanah, awan antara y=20 dan y=150
+        city_top = ground_y - 220
+        self.city = self._make_tile(
+            constants.PARALLAX_CITY_PATTERN_WIDTH, city_top, ground_y - city_top,
+            lambda ctx, x: draw_city_pattern(ctx, x, ground_y)
+        )
+        self.clouds = self._make_tile(
+            constants.PARALLAX_SKY_PATTERN_WIDTH, 0, 160, draw_cloud_pattern
+        )
+        self.ground = self._make_tile(
+            constants.PARALLAX_GROUND_PATTERN_WIDTH, ground_y, height - ground_y,
+            lambda ctx, x: draw_ground_pattern(ctx, x, ground_y),
+            lambda ctx, tile_width: draw_ground_base(ctx, tile_width, ground_y, height)
+        )
+        self.key = self.current_key()
+        self.builds += 1
+
+    def draw(self, ctx, sky_scroll, city_scroll, ground_scroll):
+        if self.key != self.current_key():
+            self.build()
+        ctx.save()
+        ctx.set_source_surface(self.sky, 0, 0)
+        ctx.rectangle(0, 0, self.sky.get_width(), self.sky.get_height())
+        ctx.fill()
+        self.city.composite(ctx, city_scroll)
+        self.clouds.composite(ctx, sky_scroll)
+        self.ground.composite(ctx, ground_scroll)
+        ctx.restore()
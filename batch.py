@@ -0,0 +1,229 @@
+import argparse
+import ast
+import itertools
+import json
+import statistics
+import sys
+import time
+from multiprocessing import Pool
+import constants
+from constants import GROUND_Y, PLAYER_DUCK_HEIGHT
+from headless import run_headless
+
+_MISSING = object()
+# Nilai asli konstanta yang sedang di-override di proses ini
+_ORIGINALS = {}
+
+
+def _set_constant(name, value):
+    # Modul lain memakai "from constants import X", jadi salinan namanya ikut diganti.
+    # Default argumen fungsi sudah terikat saat import dan tidak ikut berubah.
+    old = getattr(constants, name)
+    for module in list(sys.modules.values()):
+        if module is not None and getattr(module, name, _MISSING) is old:
+            setattr(module, name, value)
+
+
+def apply_overrides(overrides):
+    # Kembalikan override episode sebelumnya, lalu pasang yang baru
+    for name, value in _ORIGINALS.items():
+        _set_constant(name, value)
+    _ORIGINALS.clear()
+    for name, value in overrides.items():
+        if not hasattr(constants, name):
+            raise KeyError("unknown constant %r" % (name,))
+        _ORIGINALS[name] = getattr(constants, name)
+        _set_constant(name, value)
+
+
+class IdlePolicy:
+    def __call__(self, game):
+        pass
+
+
+class PeriodicJumpPolicy:
+    # Policy scripted: lompat setiap `interval` detik tanpa melihat rintangan
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self.next_jump = interval
+
+    def __call__(self, game):
+        if game.survival_time >= self.next_jump:
+            self.next_jump += self.interval
+            game.player.jump()
+
+
+class HeuristicPolicy:
+    # Lihat awan polusi terdekat di depan player: jongkok jika awan cukup tinggi, kalau tidak lompat
+    def __init__(self, jump_lead=0.2, duck_lead=0.3):
+        self.jump_lead = jump_lead
+        self.duck_lead = duck_lead
+
+    def __call__(self, game):
+        player = game.player
+        front = player.x + player.width
+        nearest = None
+        nearest_time = None
+        for pollution in game.pollution_objects:
+            if pollution.x + pollution.radius < player.x:
+                continue
+            time_to_reach = max(0.0, pollution.x - pollution.radius - front) / pollution.speed
+            if nearest_time is None or time_to_reach < nearest_time:
+                nearest = pollution
+                nearest_time = time_to_reach
+        if nearest is None:
+            player.unduck()
+            return
+        duck_clears = nearest.y + nearest.radius < GROUND_Y - PLAYER_DUCK_HEIGHT
+        if duck_clears and nearest_time < self.duck_lead:
+            player.duck()
+        elif not duck_clears and nearest_time < self.jump_lead:
+            player.jump()
+        elif not duck_clears or nearest_time >= self.duck_lead:
+            player.unduck()
+
+
+POLICIES = {
+    "idle": IdlePolicy,
+    "periodic": PeriodicJumpPolicy,
+    "heuristic": HeuristicPolicy,
+}
+
+
+def run_episode(task):
+    # Dijalankan di worker; task harus bisa di-pickle, jadi policy dikirim sebagai nama
+    apply_overrides(task["overrides"])
+    result = run_headless(task["seconds"], seed=task["seed"], policy=POLICIES[task["policy"]]())
+    result["overrides"] = task["overrides"]
+    result["policy"] = task["policy"]
+    return result
+
+
+def build_tasks(grid, seeds, policies=("heuristic",), seconds=120.0, base_seed=0):
+    # grid: dict nama konstanta -> daftar nilai; hasil perkalian kartesius x seed x policy
+    names = sorted(grid)
+    tasks = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        overrides = dict(zip(names, values))
+        for policy in policies:
+            for seed in range(base_seed, base_seed + seeds):
+                tasks.append({"seed": seed, "overrides": overrides, "policy": policy, "seconds": seconds})
+    return tasks
+
+
+def run_batch(tasks, workers=None, chunksize=4):
+    # Generator: hasil episode dikirim balik ke parent segera setelah selesai (urutan tidak dijamin)
+    if workers == 1:
+        try:
+            for task in tasks:
+                yield run_episode(task)
+        finally:
+            apply_overrides({})
+        return
+    with Pool(workers) as pool:
+        for result in pool.imap_unordered(run_episode, tasks, chunksize):
+            yield result
+
+
+def config_key(result):
+    return (result["policy"],) + tuple(sorted(result["overrides"].items()))
+
+
+class Distributions:
+    # Kumpulkan survival time dan skor per konfigurasi selagi hasil mengalir masuk
+    def __init__(self):
+        self.samples = {}
+
+    def add(self, result):
+        survival, scores = self.samples.setdefault(config_key(result), ([], []))
+        survival.append(result["survival_time"])
+        scores.append(result["score"])
+
+    def summary(self):
+        rows = []
+        for key, (survival, scores) in sorted(self.samples.items(), key=lambda item: repr(item[0])):
+            rows.append({
+                "policy": key[0],
+                "overrides": dict(key[1:]),
+                "episodes": len(survival),
+                "survival": describe(survival),
+                "score": describe(scores),
+            })
+        return rows
+
+
+def describe(values):
+    ordered = sorted(values)
+    n = len(ordered)
+
+    def pct(p):
+        return ordered[min(n - 1, int(round(p / 100.0 * (n - 1))))]
+
+    return {
+        "mean": statistics.fmean(ordered),
+        "stdev": statistics.pstdev(ordered),
+        "min": ordered[0],
+        "p10": pct(10),
+        "p50": pct(50),
+        "p90": pct(90),
+        "max": ordered[-1],
+    }
+
+
+def parse_grid(specs):
+    # "POLLUTION_MIN_SPEED=200,250,300" -> {"POLLUTION_MIN_SPEED": [200, 250, 300]}
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if not values:
+            raise ValueError("expected NAME=v1,v2,... got %r" % (spec,))
+        grid[name.strip()] = [ast.literal_eval(value.strip()) for value in values.split(",")]
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless episodes over a grid of constant overrides.")
+    parser.add_argument("--set", dest="grid", action="append", default=[], metavar="NAME=V1,V2",
+                        help="constant values to sweep (repeatable)")
+    parser.add_argument("--seeds", type=int, default=16, help="episodes per configuration")
+    parser.add_argument("--base-seed", type=int, default=0)
+    parser.add_argument("--seconds", type=float, default=120.0, help="max simulated seconds per episode")
+    parser.add_argument("--policy", action="append", choices=sorted(POLICIES),
+                        help="policy to evaluate (repeatable, default: heuristic)")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=4)
+    parser.add_argument("--output", help="append every episode result to this JSON-lines file")
+    args = parser.parse_args()
+
+    tasks = build_tasks(
+        parse_grid(args.grid), args.seeds, tuple(args.policy or ("heuristic",)),
+        args.seconds, args.base_seed
+    )
+    distributions = Distributions()
+    output = open(args.output, "a") if args.output else None
+    start = time.perf_counter()
+    sim_seconds = 0.0
+    try:
+        for done, result in enumerate(run_batch(tasks, args.workers, args.chunksize), 1):
+            distributions.add(result)
+            sim_seconds += result["sim_seconds"]
+            if output is not None:
+                output.write(json.dumps(result) + "\n")
+            print("\r%d/%d episodes" % (done, len(tasks)), end="", file=sys.stderr, flush=True)
+    finally:
+        if output is not None:
+            output.close()
+    wall = time.perf_counter() - start
+    print("", file=sys.stderr)
+
+    for row in distributions.summary():
+        print("%-9s %-50s n=%-4d survival p50 %6.1fs (p10 %6.1f, p90 %6.1f)  score mean %7.1f" % (
+            row["policy"], row["overrides"] or "defaults", row["episodes"],
+            row["survival"]["p50"], row["survival"]["p10"], row["survival"]["p90"],
+            row["score"]["mean"]
+        ))
+    print("%d episodes, %.0f simulated seconds in %.1f s wall" % (len(tasks), sim_seconds, wall))
+
+
+if __name__ == "__main__":
+    main()
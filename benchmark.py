@@ -0,0 +1,287 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import random
+import cairo
+import numpy as np
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, FPS
+from game import Game, PLAYING
+from pollution import Pollution, draw_clouds
+from mask import Mask
+from quality import LEVEL_NAMES
+
+DEFAULT_COUNTS = (1, 10, 100, 1000)
+
+
+def make_context():
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, SCREEN_WIDTH, SCREEN_HEIGHT)
+    return surface, cairo.Context(surface)
+
+
+def make_game(clouds, seed=0):
+    # Game dengan n awan tersebar di layar; player dibuat kebal agar tidak game over
+    rng = random.Random(seed)
+    game = Game(seed=seed)
+    game.state = PLAYING
+    game.reset_game()
+    game.player.protection_timer = 1e9
+    for _ in range(clouds):
+        pollution = Pollution.create_random(rng)
+        pollution.x = rng.uniform(200, SCREEN_WIDTH)
+        pollution.prev_x = pollution.x
+        game.pollution_objects.append(pollution)
+    return game
+
+
+def make_masks(count, seed=0):
+    rng = random.Random(seed)
+    masks = []
+    for _ in range(count):
+        mask = Mask.create_random(rng)
+        mask.x = rng.uniform(0, SCREEN_WIDTH)
+        mask.prev_x = mask.x
+        masks.append(mask)
+    return masks
+
+
+def measure(setup, run, repeat, number):
+    # Tiap sampel: setup (tidak diukur), lalu run() dipanggil `number` kali
+    samples = []
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            run(state)
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    samples.sort()
+    return {
+        "unit": "us",
+        "repeat": repeat,
+        "number": number,
+        "min": samples[0],
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "p95": samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))],
+    }
+
+
+def measure_memory(count=1000):
+    # Byte per objek Pollution hidup (termasuk emitter dan data gumpalan), diukur dengan tracemalloc
+    import tracemalloc
+    rng = random.Random(0)
+    placements = [Pollution.random_placement(rng) for _ in range(count)]
+    clouds = [None] * count
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i, placement in enumerate(placements):
+        clouds[i] = Pollution.from_placement(placement)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return {"pollution_bytes_per_instance": used / count}
+
+
+def build_cases(counts):
+    cases = []
+    dt = 1.0 / FPS
+
+    for n in counts:
+        def setup_update(n=n):
+            return make_game(n)
+        cases.append(("game_update[%d]" % n, setup_update, lambda game: game.update(dt)))
+
+    # Satu step VecRunnerEnv untuk n game sekaligus (lari terus, tanpa aksi)
+    for n in counts:
+        def setup_vec_env(n=n):
+            from vec_env import VecRunnerEnv
+            env = VecRunnerEnv(n, seed=0)
+            env.reset(copy=False)
+            return env, np.zeros(n, dtype=np.int64)
+        cases.append(("vec_env_step[%d]" % n, setup_vec_env, lambda state: state[0].step(state[1], copy=False)))
+
+    def setup_background():
+        surface, ctx = make_context()
+        game = make_game(0)
+        game.draw_background(ctx)  # bangun cache layer di luar pengukuran
+        return game, ctx
+    cases.append(("draw_background", setup_background,
+                  lambda state: state[0].draw_background(state[1])))
+
+    for n in counts:
+        def setup_pollution(n=n):
+            surface, ctx = make_context()
+            return make_game(n).pollution_objects, ctx
+
+        def run_pollution(state):
+            clouds, ctx = state
+            draw_clouds(ctx, clouds)
+        cases.append(("pollution_draw[%d]" % n, setup_pollution, run_pollution))
+
+    # Partikel asap: 50 per awan (1000 awan = 50k partikel). update() vektor penuh; draw() memakai
+    # arc Cairo di bawah PARTICLE_SPLAT_MIN, di atasnya stamp NumPy, maks. PARTICLE_MAX_DRAWN partikel
+    for n in counts:
+        def setup_particles(n=n):
+            from particle import ParticleSystem
+            surface, ctx = make_context()
+            particles = ParticleSystem(seed=0)
+            rng = np.random.default_rng(0)
+            count = n * 50
+            particles.emit(rng.uniform(0, SCREEN_WIDTH, count), rng.uniform(0, SCREEN_HEIGHT, count), count)
+            return particles, ctx
+        cases.append(("particles_update[%d]" % (n * 50), setup_particles,
+                      lambda state: state[0].update(1e-6)))
+        cases.append(("particles_draw[%d]" % (n * 50), setup_particles,
+                      lambda state: state[0].draw(state[1])))
+
+    for n in counts:
+        def setup_mask(n=n):
+            surface, ctx = make_context()
+            return make_masks(n), ctx
+
+        def run_mask(state):
+            masks, ctx = state
+            for mask in masks:
+                mask.draw(ctx)
+        cases.append(("mask_draw[%d]" % n, setup_mask, run_mask))
+
+    def setup_player():
+        surface, ctx = make_context()
+        game = make_game(0)
+        game.player.update(dt)
+        return game.player, ctx
+    cases.append(("player_draw", setup_player, lambda state: state[0].draw(state[1])))
+
+    # Semua entity (partikel, awan, mask, player) per tingkat kualitas (quality.py)
+    for level, level_name in enumerate(LEVEL_NAMES):
+        for n in counts:
+            def setup_entities(n=n, level=level):
+                surface, ctx = make_context()
+                game = make_game(n)
+                game.quality = level
+                game.particles.emit_from(game.pollution_objects, 0.5)
+                return game, ctx
+            cases.append(("entities_%s[%d]" % (level_name, n), setup_entities,
+                          lambda state: state[0].draw_entities(state[1])))
+
+    def setup_hud():
+        surface, ctx = make_context()
+        return make_game(0), ctx
+    cases.append(("draw_hud", setup_hud, lambda state: state[0].draw_hud(state[1])))
+
+    # Observasi piksel grayscale untuk 16 game sekaligus (render + luma, tanpa tick)
+    for n in counts:
+        def setup_pixels(n=n):
+            from pixels import PixelObservations
+            return PixelObservations([make_game(n, seed) for seed in range(16)], grayscale=True)
+        cases.append(("pixel_obs_x16[%d]" % n, setup_pixels, lambda observations: observations.observe()))
+
+    try:
+        import pygame
+    except ImportError:
+        pygame = None
+    if pygame is not None:
+        from game import cairo_surface_to_pygame
+
+        def setup_convert():
+            surface, ctx = make_context()
+            return surface
+        cases.append(("cairo_surface_to_pygame", setup_convert, cairo_surface_to_pygame))
+
+        # Satu frame penuh per backend render (termasuk konversi ke surface pygame untuk Cairo)
+        from framebuffer import FrameBufferChain
+        from profiler import NULL_PROFILER
+        from render_backend import CairoBackend, PygameBackend
+        backends = (
+            ("cairo", lambda: CairoBackend(FrameBufferChain(SCREEN_WIDTH, SCREEN_HEIGHT))),
+            ("pygame", PygameBackend),
+        )
+        for backend_name, create in backends:
+            for n in counts:
+                def setup_frame(n=n, create=create):
+                    game = make_game(n)
+                    target = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+                    backend = create()
+                    backend.draw_frame(target, game, 0, 0, 1.0, NULL_PROFILER)  # bangun cache/sprite dulu
+                    return backend, game, target
+
+                def run_frame(state):
+                    backend, game, target = state
+                    backend.draw_frame(target, game, 0, 0, 1.0, NULL_PROFILER)
+                cases.append(("frame_%s[%d]" % (backend_name, n), setup_frame, run_frame))
+
+    return cases
+
+
+def run_benchmarks(counts=DEFAULT_COUNTS, repeat=15, number=20, name_filter=None):
+    results = {}
+    for name, setup, run in build_cases(counts):
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = measure(setup, run, repeat, number)
+        print("%-28s median %10.1f us   p95 %10.1f us" % (
+            name, results[name]["median"], results[name]["p95"]))
+    memory = measure_memory()
+    for name, value in sorted(memory.items()):
+        print("%-28s %10.1f bytes" % (name, value))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cairo": cairo.version,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "counts": list(counts),
+        },
+        "results": results,
+        "memory": memory,
+    }
+
+
+def compare(current, baseline, threshold):
+    # Tandai regresi bila median lebih lambat dari baseline melebihi threshold (mis. 0.10 = 10%)
+    regressions = []
+    for name, stats in sorted(current["results"].items()):
+        base = baseline["results"].get(name)
+        if base is None or base["median"] <= 0:
+            continue
+        ratio = stats["median"] / base["median"]
+        flag = "REGRESSION" if ratio > 1.0 + threshold else ""
+        print("%-28s %10.1f -> %10.1f us  x%.2f %s" % (
+            name, base["median"], stats["median"], ratio, flag))
+        if flag:
+            regressions.append(name)
+    for name, value in sorted(current.get("memory", {}).items()):
+        base = baseline.get("memory", {}).get(name)
+        if base:
+            print("%-28s %10.1f -> %10.1f bytes  x%.2f" % (name, base, value, value / base))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark update and draw hot paths.")
+    parser.add_argument("--counts", default=",".join(str(n) for n in DEFAULT_COUNTS),
+                        help="comma separated pollution cloud counts")
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--filter", default=None, help="only run cases containing this text")
+    parser.add_argument("--output", default=None, help="write results as JSON to this path")
+    parser.add_argument("--compare", default=None, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    counts = tuple(int(n) for n in args.counts.split(",") if n)
+    current = run_benchmarks(counts, args.repeat, args.number, args.filter)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(current, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import numpy as np
+
+
+def gather_circles(objects, y_attr=None):
+    # Kumpulkan posisi dan radius semua objek ke array NumPy dalam satu lintasan
+    n = len(objects)
+    xs = np.fromiter((obj.x for obj in objects), dtype=np.float64, count=n)
+    if y_attr is None:
+        ys = np.fromiter((obj.y for obj in objects), dtype=np.float64, count=n)
+    else:
+        ys = np.fromiter((getattr(obj, y_attr)() for obj in objects), dtype=np.float64, count=n)
+    radii = np.fromiter((obj.radius for obj in objects), dtype=np.float64, count=n)
+    return xs, ys, radii
+
+
+def circles_vs_aabb(xs, ys, radii, left, top, right, bottom):
+    # Titik terdekat pada kotak terhadap pusat lingkaran, dibandingkan tanpa sqrt
+    dx = xs - np.clip(xs, left, right)
+    dy = ys - np.clip(ys, top, bottom)
+    return dx * dx + dy * dy < radii * radii
+
+
+def circles_vs_circle(xs, ys, radii, cx, cy, cr):
+    dx = xs - cx
+    dy = ys - cy
+    reach = radii + cr
+    return dx * dx + dy * dy < reach * reach
+
+
+def swap_remove(items, indices):
+    # Hapus indeks dari list dalam O(k): isi lubang dengan elemen terakhir.
+    # Urutan list berubah, tapi tidak ada pergeseran O(n) seperti list.remove.
+    removed = []
+    for index in sorted(set(int(i) for i in indices), reverse=True):
+        last = items.pop()
+        if index < len(items):
+            removed.append(items[index])
+            items[index] = last
+        else:
+            removed.append(last)
+    return removed
@@ -4,8 +4,76 @@
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
+# Fixed-step simulation (independent of the render frame rate)
+SIM_TICK_RATE = 60
+SIM_MAX_STEPS_PER_FRAME = 8
 GROUND_Y = SCREEN_HEIGHT - 60
 
+# Startup: pemanasan cache/font/pool selama menu, dibatasi waktu per frame
+PREWARM_FRAME_BUDGET = 0.004
+PREWARM_POLLUTION_OBJECTS = 16
+PREWARM_MASK_OBJECTS = 4
+
+# Offline frame export: maks. frame mentah yang menunggu encoder PNG
+EXPORT_MAX_IN_FLIGHT = 8
+
+# Input replay: state keyframe setiap N tick untuk seek
+REPLAY_KEYFRAME_INTERVAL = 600
+
+# Vectorized training envs (vec_env.py): slot per env dan jumlah awan terdekat di observasi
+VEC_ENV_MAX_OBSTACLES = 8
+VEC_ENV_MAX_MASKS = 2
+VEC_ENV_OBS_OBSTACLES = 3
+
+# Pixel observations (pixels.py): resolusi frame observasi, dunia digambar langsung pada ukuran ini
+PIXEL_OBS_WIDTH = 96
+PIXEL_OBS_HEIGHT = 72
+
+# Entity pools (max. jumlah objek bebas yang disimpan untuk dipakai ulang)
+ENTITY_POOL_SIZE = 256
+
+# Dirty-rectangle presentation (redraw and push only the changed regions)
+DIRTY_RECTS_ENABLED = False
+DIRTY_RECT_FULL_FRACTION = 0.6
+
+# Render backend: "cairo" (antialiased paths) atau "pygame" (sprite pre-baked, blit saja)
+RENDER_BACKEND = "cairo"
+MASK_SPRITE_ROTATIONS = 64
+PLAYER_SPRITE_FRAMES = 64
+
+# Dynamic resolution (backend cairo): dunia digambar pada skala lebih kecil lalu di-upscale,
+# HUD dan teks tetap resolusi penuh. Skala turun/naik berdasarkan rata-rata waktu frame.
+DYNAMIC_RESOLUTION_ENABLED = False
+DYNAMIC_RESOLUTION_MIN_SCALE = 0.5
+DYNAMIC_RESOLUTION_MAX_SCALE = 1.0
+DYNAMIC_RESOLUTION_STEP = 0.1
+DYNAMIC_RESOLUTION_WINDOW = 30
+# Batas sebagai fraksi budget frame (1/FPS); jarak di antaranya = hysteresis
+DYNAMIC_RESOLUTION_DOWN_THRESHOLD = 0.9
+DYNAMIC_RESOLUTION_UP_THRESHOLD = 0.6
+DYNAMIC_RESOLUTION_SMOOTH = True
+
+# Quality governor: tingkat detail entity ("ultra", "high", "low", "minimal", lihat quality.py)
+QUALITY_GOVERNOR_ENABLED = False
+QUALITY_START_LEVEL = "ultra"
+QUALITY_MIN_LEVEL = "minimal"
+QUALITY_WINDOW = 20
+QUALITY_DOWN_THRESHOLD = 0.85
+QUALITY_UP_THRESHOLD = 0.5
+# Jumlah jendela cepat berturut-turut sebelum tingkat dinaikkan lagi
+QUALITY_UP_WINDOWS = 3
+QUALITY_MAX_TRANSITIONS = 64
+
+# Threaded simulation/render pipeline (render thread draws frame N while frame N+1 simulates)
+RENDER_PIPELINE_ENABLED = False
+
+# Rendered text cache
+TEXT_CACHE_MAX_ENTRIES = 128
+
+# Frame profiler (F3: overlay, F12: export Chrome trace)
+PROFILER_CAPACITY = 600
+TRACE_EXPORT_PATH = "frame_trace.json"
+
 # Block system
 BLOCK_SIZE = 30
 
@@ -13,6 +81,15 @@ BLOCK_SIZE = 30
 DAMAGE_COOLDOWN = 1.0  
 PARTICLE_DAMAGE = 5
 
+# Smoke particles
+PARTICLE_CAPACITY = 65536
+PARTICLE_EMIT_RATE = 30
+PARTICLE_ALPHA_BUCKETS = 8
+# Mulai jumlah partikel ini, draw() men-stamp semua partikel ke satu gambar (NumPy) alih-alih satu arc per partikel
+PARTICLE_SPLAT_MIN = 2000
+# Batas partikel yang digambar per frame; di atasnya hanya setiap partikel ke-k yang digambar
+PARTICLE_MAX_DRAWN = 8192
+
 # Player physics
 PLAYER_WIDTH = 40
 PLAYER_HEIGHT = 60
@@ -27,15 +104,25 @@ POLLUTION_MIN_SPEED = 250
 POLLUTION_MAX_SPEED = 320
 POLLUTION_MIN_ALPHA = 0.85
 POLLUTION_MAX_ALPHA = 0.95
+POLLUTION_DAMAGE = 15
 
 # Obstacle spawn heights
 POLLUTION_SPAWN_MIN_Y = 450 
 POLLUTION_SPAWN_MID_Y = 480
 POLLUTION_SPAWN_MAX_Y = 510 
 
+# Pollution cloud shapes and sprite atlas
+POLLUTION_LAYOUT_VARIANTS = 32
+POLLUTION_MAX_PUFFS = 7
+POLLUTION_ATLAS_ENABLED = False
+POLLUTION_ATLAS_MAX_BYTES = 32 * 1024 * 1024
+
 # Spawn timing
 POLLUTION_SPAWN_INTERVAL_MIN = 1.2
 POLLUTION_SPAWN_INTERVAL_MAX = 2.2
+# World stream: jadwal spawn dibangkitkan per chunk (detik survival_time) dari seed course
+WORLD_CHUNK_SECONDS = 10.0
+WORLD_LOOKAHEAD_CHUNKS = 1
 
 # Mask settings
 MASK_SPAWN_INTERVAL_MIN = 8.0
@@ -0,0 +1,84 @@
+from constants import DIRTY_RECT_FULL_FRACTION
+
+
+def clip_rect(rect, width, height):
+    x, y, w, h = rect
+    x0 = max(0, int(x))
+    y0 = max(0, int(y))
+    x1 = min(width, int(x + w + 1))
+    y1 = min(height, int(y + h + 1))
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (x0, y0, x1 - x0, y1 - y0)
+
+
+def merge_rects(rects):
+    # Gabungkan rect yang saling tumpang tindih sampai tidak ada lagi yang overlap
+    merged = list(rects)
+    changed = True
+    while changed:
+        changed = False
+        result = []
+        while merged:
+            ax, ay, aw, ah = merged.pop()
+            i = 0
+            while i < len(merged):
+                bx, by, bw, bh = merged[i]
+                if ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah:
+                    x0, y0 = min(ax, bx), min(ay, by)
+                    x1, y1 = max(ax + aw, bx + bw), max(ay + ah, by + bh)
+                    ax, ay, aw, ah = x0, y0, x1 - x0, y1 - y0
+                    merged.pop(i)
+                    changed = True
+                else:
+                    i += 1
+            result.append((ax, ay, aw, ah))
+        merged = result
+    return merged
+
+
+class DirtyRectTracker:
+    # Membandingkan region yang digambar frame ini dengan frame sebelumnya.
+    # regions: dict key -> (rect, state). Region baru, hilang, pindah, atau state-nya
+    # berubah menyumbang rect lama dan rect baru ke daftar dirty.
+    def __init__(self, width, height, full_fraction=DIRTY_RECT_FULL_FRACTION):
+        self.width = width
+        self.height = height
+        self.full_fraction = full_fraction
+        self.previous = {}
+        self.full = True
+
+    def invalidate(self):
+        self.full = True
+
+    def update(self, regions):
+        screen = (0, 0, self.width, self.height)
+        if self.full:
+            self.full = False
+            self.previous = regions
+            return [screen]
+        dirty = []
+        previous = self.previous
+        for key, region in regions.items():
+            old = previous.get(key)
+            if old is None:
+                dirty.append(region[0])
+            elif old != region:
+                dirty.append(old[0])
+                dirty.append(region[0])
+        for key, old in previous.items():
+            if key not in regions:
+                dirty.append(old[0])
+        self.previous = regions
+
+        clipped = []
+        for rect in dirty:
+            rect = clip_rect(rect, self.width, self.height)
+            if rect is not None:
+                clipped.append(rect)
+        merged = merge_rects(clipped)
+        area = sum(w * h for _, _, w, h in merged)
+        if area > self.full_fraction * self.width * self.height:
+            # Terlalu banyak yang berubah: satu rect layar penuh lebih murah
+            return [screen]
+        return merged
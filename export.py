@@ -0,0 +1,168 @@
+import argparse
+import os
+import sys
+from collections import deque
+from fractions import Fraction
+from multiprocessing import Pool
+
+# Banner pygame ditulis ke stdout dan akan merusak stream RGBA mentah ke stdout
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import cairo
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, SIM_TICK_RATE, EXPORT_MAX_IN_FLIGHT
+from game import Game, INPUT_START
+from pixels import surface_array
+
+
+class SeededRun:
+    # Sumber frame: permainan baru dengan seed tertentu, opsional dikendalikan policy (lihat batch.py)
+    def __init__(self, seed, policy=None, tick_rate=SIM_TICK_RATE):
+        self.game = Game(seed=seed)
+        self.game.apply_input(INPUT_START)
+        self.policy = policy
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+
+    def step(self):
+        if self.policy is not None:
+            self.policy(self.game)
+        self.game.update(self.dt)
+
+
+class ReplayRun:
+    def __init__(self, path):
+        from replay import Replay, ReplayPlayer
+        self.player = ReplayPlayer(Replay.load(path))
+        self.game = self.player.game
+        self.tick_rate = self.player.replay.tick_rate
+        self.end_tick = self.player.replay.end_tick
+
+    def step(self):
+        self.player.step()
+
+
+def frame_schedule(index, fps, tick_rate):
+    # Jumlah tick yang harus sudah disimulasikan untuk frame ke-index, dan faktor interpolasinya.
+    # Dihitung dengan pecahan agar tidak ada tick yang hilang/ganda akibat pembulatan float.
+    exact = Fraction(index) * Fraction(tick_rate) / Fraction(fps)
+    ticks = exact.numerator // exact.denominator
+    return ticks, float(exact - ticks)
+
+
+def render_frames(source, frame_count, fps=FPS, text=True):
+    # Generator: satu FrameBuffer yang sama dipakai ulang, jadi isi frame harus diproses
+    # (disalin/di-encode) sebelum frame berikutnya diminta.
+    from framebuffer import FrameBuffer
+    framebuffer = FrameBuffer(SCREEN_WIDTH, SCREEN_HEIGHT)
+    text_renderer = None
+    if text:
+        import pygame
+        from text_cache import TextRenderer
+        from constants import BUTTON_TEXT_COLOR
+        pygame.font.init()
+        text_renderer = TextRenderer()
+    game = source.game
+    ticks = 0
+    for index in range(frame_count):
+        target, alpha = frame_schedule(index, fps, source.tick_rate)
+        while ticks < target:
+            source.step()
+            ticks += 1
+        framebuffer.clear()
+        game.draw(framebuffer.ctx, alpha=alpha)
+        framebuffer.surface.flush()
+        if text_renderer is not None:
+            # Teks digambar pygame langsung ke memori yang sama dengan surface Cairo
+            target_surface = framebuffer.pygame_surface
+            for text_item, x, y, size, color, bold in game._text_overlays:
+                text_renderer.blit_centered(target_surface, text_item, size, color, (x, y))
+            for x, y, width, height, label in game._button_texts:
+                text_renderer.blit_centered(target_surface, label, 32, BUTTON_TEXT_COLOR, (x + width / 2, y + height / 2))
+            framebuffer.surface.mark_dirty()
+        yield index, framebuffer
+
+
+def to_rgba(framebuffer):
+    # ARGB32 Cairo = BGRA per piksel (little-endian); frame selalu opak, jadi tidak perlu unpremultiply
+    return surface_array(framebuffer.surface)[..., (2, 1, 0, 3)].tobytes()
+
+
+def rgba_frames(source, frame_count, fps=FPS, text=True):
+    for index, framebuffer in render_frames(source, frame_count, fps, text):
+        yield index, to_rgba(framebuffer)
+
+
+def encode_png(job):
+    # Dijalankan di worker process
+    path, data, width, height, stride = job
+    surface = cairo.ImageSurface.create_for_data(bytearray(data), cairo.FORMAT_ARGB32, width, height, stride)
+    surface.write_to_png(path)
+    return path
+
+
+def png_frames(source, frame_count, directory, fps=FPS, text=True, workers=None,
+               max_in_flight=EXPORT_MAX_IN_FLIGHT, pattern="frame_%06d.png"):
+    # Generator path PNG berurutan. Encoding dikerjakan pool proses; paling banyak
+    # `max_in_flight` frame mentah menunggu di antrian, jadi memori tetap terbatas.
+    os.makedirs(directory, exist_ok=True)
+    pending = deque()
+    with Pool(workers) as pool:
+        for index, framebuffer in render_frames(source, frame_count, fps, text):
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().get()
+            job = (
+                os.path.join(directory, pattern % index),
+                bytes(framebuffer.surface.get_data()),
+                framebuffer.width, framebuffer.height, framebuffer.stride,
+            )
+            pending.append(pool.apply_async(encode_png, (job,)))
+        while pending:
+            yield pending.popleft().get()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a seeded or replayed run to frames offline.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policy", default="heuristic", help="policy for seeded runs (see batch.py)")
+    parser.add_argument("--replay", metavar="PATH", help="render a recorded session instead of a seeded run")
+    parser.add_argument("--seconds", type=float, default=None,
+                        help="length to render (default: 10 s, or the whole replay)")
+    parser.add_argument("--fps", type=int, default=FPS)
+    parser.add_argument("--format", choices=("png", "rgba"), default="png")
+    parser.add_argument("--out", default="frames",
+                        help="directory for PNGs, or file for raw RGBA ('-' = stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="PNG encoder processes")
+    parser.add_argument("--max-in-flight", type=int, default=EXPORT_MAX_IN_FLIGHT)
+    parser.add_argument("--no-text", action="store_true", help="skip pygame text overlays")
+    args = parser.parse_args()
+
+    if args.replay:
+        source = ReplayRun(args.replay)
+        seconds = args.seconds if args.seconds is not None else source.end_tick / source.tick_rate
+    else:
+        from batch import POLICIES
+        source = SeededRun(args.seed, POLICIES[args.policy]())
+        seconds = args.seconds if args.seconds is not None else 10.0
+    frame_count = int(round(seconds * args.fps))
+    text = not args.no_text
+
+    if args.format == "png":
+        for count, path in enumerate(png_frames(
+            source, frame_count, args.out, args.fps, text, args.workers, args.max_in_flight
+        ), 1):
+            print("\r%d/%d %s" % (count, frame_count, path), end="", file=sys.stderr, flush=True)
+        print("", file=sys.stderr)
+    else:
+        out = sys.stdout.buffer if args.out == "-" else open(args.out, "wb")
+        try:
+            for index, data in rgba_frames(source, frame_count, args.fps, text):
+                out.write(data)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+        print("%d frames %dx%d rgba @ %d fps" % (frame_count, SCREEN_WIDTH, SCREEN_HEIGHT, args.fps),
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import cairo
+import pygame
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+class FrameBuffer:
+    # Satu buffer ARGB32 yang dipakai bersama oleh Cairo dan pygame.
+    # Surface pygame dibuat dengan frombuffer, jadi keduanya menunjuk ke memori yang sama.
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+        self.stride = self.surface.get_stride()
+        self.nbytes = self.stride * height
+        self.ctx = cairo.Context(self.surface)
+        self.pygame_surface = pygame.image.frombuffer(
+            self.surface.get_data(), (width, height), "BGRA"
+        )
+
+    def clear(self):
+        self.ctx.save()
+        self.ctx.set_operator(cairo.OPERATOR_CLEAR)
+        self.ctx.paint()
+        self.ctx.restore()
+
+
+class FrameBufferChain:
+    # Mengelola satu atau dua FrameBuffer (double buffering) yang dialokasikan sekali di awal.
+    # Di steady state tidak ada alokasi per frame. Yang tersisa adalah satu blit ke surface
+    # display di akhir frame, dan itu disengaja: Cairo tidak bisa menggambar langsung ke
+    # pixel display karena format pixel display tidak dijamin ARGB32 (SDL memilihnya), menulis
+    # ke sana butuh surface display terkunci sepanjang frame (bentrok dengan blit teks dan
+    # overlay), dan mode dirty-rect/pipeline butuh buffer bersih yang dipertahankan antar frame.
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, count=1, clear=True):
+        if count not in (1, 2):
+            raise ValueError("FrameBufferChain supports 1 or 2 buffers, got %r" % (count,))
+        self.count = count
+        self.clear_each_frame = clear
+        self.frames = 0
+        self.frame_bytes_allocated = 0
+        self.total_bytes_allocated = 0
+        self.buffers = []
+        self.resize(width, height)
+
+    def resize(self, width, height):
+        self.width = width
+        self.height = height
+        self.buffers = []
+        for _ in range(self.count):
+            buffer = FrameBuffer(width, height)
+            self.frame_bytes_allocated += buffer.nbytes
+            self.total_bytes_allocated += buffer.nbytes
+            self.buffers.append(buffer)
+        self.back_index = 0
+
+    @property
+    def back(self):
+        return self.buffers[self.back_index]
+
+    @property
+    def front(self):
+        return self.buffers[(self.back_index + 1) % self.count]
+
+    def begin_frame(self):
+        # Reset counter alokasi, lalu kembalikan context Cairo milik back buffer
+        self.frames += 1
+        self.frame_bytes_allocated = 0
+        back = self.back
+        if self.clear_each_frame:
+            back.clear()
+        return back.ctx
+
+    def end_frame(self):
+        # Pastikan Cairo selesai menulis sebelum pygame membaca buffer yang sama
+        back = self.back
+        back.surface.flush()
+        self.back_index = (self.back_index + 1) % self.count
+        return back.pygame_surface
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "buffers": self.count,
+            "bytes_per_buffer": self.buffers[0].nbytes,
+            "frame_bytes_allocated": self.frame_bytes_allocated,
+            "total_bytes_allocated": self.total_bytes_allocated,
+        }
@@ -1,73 +1,149 @@
-import pygame
-import cairo
-import random
+import copy
 import math
+import numpy as np
 from constants import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, GROUND_Y,
-    GROUND_COLOR, GROUND_DETAIL_COLOR,
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, SIM_TICK_RATE, GROUND_Y,
     HEALTH_BAR_COLOR, BUTTON_COLOR, BUTTON_HOVER_COLOR, BUTTON_TEXT_COLOR,
     TITLE_COLOR, SCORE_COLOR, SHADOW_COLOR,
-    PARTICLE_DAMAGE, POLLUTION_SPAWN_INTERVAL_MIN, POLLUTION_SPAWN_INTERVAL_MAX,
-    MASK_SPAWN_INTERVAL_MIN, MASK_SPAWN_INTERVAL_MAX,
+    PARTICLE_DAMAGE, POLLUTION_DAMAGE,
     PARALLAX_GROUND_SPEED, PARALLAX_SKY_SPEED, PARALLAX_CITY_SPEED,
     PARALLAX_GROUND_PATTERN_WIDTH, PARALLAX_SKY_PATTERN_WIDTH, PARALLAX_CITY_PATTERN_WIDTH,
-    SKY_TOP_COLOR, SKY_BOTTOM_COLOR, CITY_COLOR, CITY_WINDOW_COLOR
+    POLLUTION_ATLAS_ENABLED, TRACE_EXPORT_PATH, DIRTY_RECTS_ENABLED,
+    RENDER_PIPELINE_ENABLED, RENDER_BACKEND, DYNAMIC_RESOLUTION_ENABLED, QUALITY_GOVERNOR_ENABLED
 )
 from player import Player
-from pollution import Pollution
-from particle import Particle
+from pollution import Pollution, draw_clouds
+from particle import ParticleSystem
 from mask import Mask
-
-pygame.init()
+from rng_streams import RngStreams
+from pool import EntityPool
+from profiler import NULL_PROFILER
+from shape_cache import SHAPES, draw_shape
+from quality import ULTRA, LOW, MINIMAL
+from world_stream import WorldStream, POLLUTION as WORLD_POLLUTION
+from collision import gather_circles, circles_vs_aabb, circles_vs_circle, swap_remove
 
 MENU = 0
 PLAYING = 1
 GAME_OVER = 2
 
+# Kode input yang masuk ke simulasi (juga format event di log replay)
+INPUT_JUMP = 0
+INPUT_DUCK = 1
+INPUT_UNDUCK = 2
+INPUT_START = 3
+
+# Area yang ditutupi health bar + ikon hati di draw_hud
+HUD_BOUNDS = (15, 15, 255, 40)
+HEALTH_BAR_RECT = (60, 25, 200, 22)
+# Kegelapan lapisan hitam di layar game over
+GAME_OVER_DIM = 0.6
+
+
+def health_fill_rect(health_pct):
+    bar_x, bar_y, bar_w, bar_h = HEALTH_BAR_RECT
+    return (bar_x + 2, bar_y + 2, int((bar_w - 4) * health_pct), bar_h - 4)
+
+
 class Game:
-    def __init__(self):
+    # Atribut yang bukan state simulasi: tidak ikut disimpan di keyframe replay
+    TRANSIENT_ATTRS = (
+        "background", "pollution_atlas", "profiler",
+        "pollution_pool", "mask_pool", "_text_overlays", "_button_texts", "quality",
+        "menu_scroll"
+    )
+
+    def __init__(self, seed=None):
         self.state = MENU
+        # Jumlah update yang sudah dijalankan; input direkam dengan indeks tick ini
+        self.tick = 0
         self.score = 0
         self.survival_time = 0.0
         self.best_score = 0
         self.menu_anim_timer = 0.0
+        self.seed = seed
+        self.rng = RngStreams(seed)
+        # Cache rendering dibuat saat pertama kali menggambar, jadi mode headless tidak butuh Cairo
+        self.background = None
+        self.pollution_atlas = None
+        self.particles = ParticleSystem(seed=self.rng.numpy_seed("particles"))
+        # Profiler opt-in: main() memasang FrameProfiler, default-nya tanpa overhead
+        self.profiler = NULL_PROFILER
+        # Tingkat detail entity (quality.py); diatur QualityGovernor di main() bila aktif
+        self.quality = ULTRA
+        # Parallax bergerak pelan di menu/game over; dimatikan main() di mode dirty-rect
+        # agar layar statis benar-benar statis (hanya judul dan tombol yang digambar ulang)
+        self.menu_scroll = True
+        self.pollution_pool = EntityPool(Pollution)
+        self.mask_pool = EntityPool(Mask)
+        self.pollution_objects = []
+        self.masks = []
         self.reset_game()
 
     def reset_game(self):
         self.player = Player(100, GROUND_Y - 60)
+        self.pollution_pool.release_all(self.pollution_objects)
         self.pollution_objects = []
-        self.particles = [] 
+        self.particles.clear()
+        self.mask_pool.release_all(self.masks)
         self.masks = []
-        self.pollution_spawn_timer = 0
-        self.pollution_spawn_interval = random.uniform(
-            POLLUTION_SPAWN_INTERVAL_MIN,
-            POLLUTION_SPAWN_INTERVAL_MAX
-        )
-        self.mask_spawn_timer = 0
-        self.mask_spawn_interval = random.uniform(
-            MASK_SPAWN_INTERVAL_MIN,
-            MASK_SPAWN_INTERVAL_MAX
-        )
+        # Setiap run punya course sendiri; seed-nya diambil dari stream spawn game
+        self.world = WorldStream(self.rng.spawn.getrandbits(63))
         self.ground_scroll = 0.0
         self.sky_scroll = 0.0
         self.city_scroll = 0.0
+        self.prev_scrolls = (0.0, 0.0, 0.0)
+        self.render_alpha = 1.0
         self.survival_time = 0.0
         self.score = 0
 
-    def spawn_pollution(self):
-        pollution = Pollution.create_random()
-        self.pollution_objects.append(pollution)
+    def spawn_entering(self, t0, t1):
+        # Spawn semua rintangan/mask dari world stream yang masuk layar di [t0, t1)
+        for _, kind, placement in self.world.entering(t0, t1):
+            if kind == WORLD_POLLUTION:
+                self.pollution_objects.append(Pollution.from_placement(placement, self.pollution_pool))
+            else:
+                self.masks.append(Mask.from_placement(placement, self.mask_pool))
+        self.world.discard_before(t0)
+
+    def apply_input(self, code):
+        # Semua input pemain lewat sini agar bisa direkam dan diputar ulang per tick
+        if code == INPUT_START:
+            if self.state == PLAYING:
+                return False
+            self.state = PLAYING
+            self.reset_game()
+            return True
+        if self.state != PLAYING:
+            return False
+        if code == INPUT_JUMP:
+            self.player.jump()
+        elif code == INPUT_DUCK:
+            self.player.duck()
+        elif code == INPUT_UNDUCK:
+            self.player.unduck()
+        else:
+            raise ValueError("unknown input code %r" % (code,))
+        return True
+
+    def save_state(self):
+        state = {
+            name: value for name, value in vars(self).items()
+            if name not in self.TRANSIENT_ATTRS
+        }
+        return copy.deepcopy(state)
 
-    def spawn_mask(self):
-        mask = Mask.create_random()
-        self.masks.append(mask)
+    def restore_state(self, state):
+        self.__dict__.update(copy.deepcopy(state))
 
     def update(self, dt):
+        self.tick += 1
         self.menu_anim_timer += dt
+        self.prev_scrolls = (self.sky_scroll, self.city_scroll, self.ground_scroll)
 
         scroll_speed_factor = 1.0
         if self.state != PLAYING:
-            scroll_speed_factor = 0.2
+            scroll_speed_factor = 0.2 if self.menu_scroll else 0.0
 
         self.ground_scroll += PARALLAX_GROUND_SPEED * dt * scroll_speed_factor
         if self.ground_scroll >= PARALLAX_GROUND_PATTERN_WIDTH:
@@ -84,6 +160,7 @@ class Game:
         if self.state != PLAYING:
             return
 
+        start_time = self.survival_time
         self.survival_time += dt
         self.score = int(self.survival_time * 10)
         self.player.update(dt)
@@ -93,117 +170,94 @@ class Game:
                 self.best_score = self.score
             self.state = GAME_OVER
             
-        self.pollution_spawn_timer += dt
-        if self.pollution_spawn_timer >= self.pollution_spawn_interval:
-            self.spawn_pollution()
-            self.pollution_spawn_timer = 0
-            self.pollution_spawn_interval = random.uniform(
-                POLLUTION_SPAWN_INTERVAL_MIN,
-                POLLUTION_SPAWN_INTERVAL_MAX
-            )
-            
-        self.mask_spawn_timer += dt
-        if self.mask_spawn_timer >= self.mask_spawn_interval:
-            self.spawn_mask()
-            self.mask_spawn_timer = 0
-            self.mask_spawn_interval = random.uniform(
-                MASK_SPAWN_INTERVAL_MIN,
-                MASK_SPAWN_INTERVAL_MAX
-            )
+        self.spawn_entering(start_time, self.survival_time)
             
         # LOGIKA TABRAKAN: POLUSI
-        for pollution in self.pollution_objects[:]:
+        for pollution in self.pollution_objects:
             pollution.update(dt)
-            
-            # Cek Tabrakan: Player vs Awan Polusi
-            if self.player.check_collision_with_particle(pollution):
-                # Kurangi darah saat nabrak
-                self.player.take_damage(15) 
-                self.pollution_objects.remove(pollution)
-                continue
-            
-            if pollution.is_off_screen():
-                self.pollution_objects.remove(pollution)
-                
+        with self.profiler.section("collision"):
+            self.resolve_pollution_collisions()
+
+        with self.profiler.section("particles"):
+            self.particles.emit_from(self.pollution_objects, dt)
+            self.particles.update(dt)
+
         # LOGIKA TABRAKAN: MASKER
-        for mask in self.masks[:]:
+        for mask in self.masks:
             mask.update(dt)
-            if mask.check_collision_with_player(self.player):
-                self.player.collect_mask()
-                self.masks.remove(mask)
-            if mask.is_off_screen():
-                self.masks.remove(mask)
+        with self.profiler.section("collision"):
+            self.resolve_mask_collisions()
+
+    def resolve_pollution_collisions(self):
+        if not self.pollution_objects:
+            return
+        player = self.player
+        left, top = player.x, player.y
+        right, bottom = player.x + player.width, player.y + player.height
+        xs, ys, radii = gather_circles(self.pollution_objects)
+        # Cek Tabrakan: Player vs Awan Polusi, satu batch untuk semua awan.
+        # Tanpa broad phase: semua objek bergerak tiap tick dan hanya ada satu query (player),
+        # jadi membangun grid sendiri sudah O(n), sama seperti narrow phase vektor ini
+        hits = circles_vs_aabb(xs, ys, radii, left, top, right, bottom)
+        # Kurangi darah saat nabrak
+        for _ in range(int(np.count_nonzero(hits))):
+            player.take_damage(POLLUTION_DAMAGE)
+        gone = hits | (xs + radii + Pollution.OFF_SCREEN_MARGIN < 0)
+        if gone.any():
+            self.pollution_pool.release_all(
+                swap_remove(self.pollution_objects, np.flatnonzero(gone))
+            )
+
+    def resolve_mask_collisions(self):
+        if not self.masks:
+            return
+        player = self.player
+        center_x = player.x + player.width / 2
+        center_y = player.y + player.height / 2
+        player_radius = max(player.width, player.height) / 2
+        xs, ys, radii = gather_circles(self.masks, "collision_y")
+        hits = circles_vs_circle(xs, ys, radii, center_x, center_y, player_radius)
+        for _ in range(int(np.count_nonzero(hits))):
+            player.collect_mask()
+        gone = hits | (xs + radii + Mask.OFF_SCREEN_MARGIN < 0)
+        if gone.any():
+            self.mask_pool.release_all(swap_remove(self.masks, np.flatnonzero(gone)))
 
     def draw_background(self, ctx):
-        ctx.save()
-        pat = cairo.LinearGradient(0, 0, 0, GROUND_Y)
-        pat.add_color_stop_rgb(0, SKY_TOP_COLOR[0]/255.0, SKY_TOP_COLOR[1]/255.0, SKY_TOP_COLOR[2]/255.0)
-        pat.add_color_stop_rgb(1, SKY_BOTTOM_COLOR[0]/255.0, SKY_BOTTOM_COLOR[1]/255.0, SKY_BOTTOM_COLOR[2]/255.0)
-        ctx.rectangle(0, 0, SCREEN_WIDTH, GROUND_Y)
-        ctx.set_source(pat)
-        ctx.fill()
-        ctx.restore()
+        with self.profiler.section("background"):
+            self._draw_background(ctx)
 
-        ctx.save()
-        pattern_start = -int(self.city_scroll) % PARALLAX_CITY_PATTERN_WIDTH
-        x = pattern_start - PARALLAX_CITY_PATTERN_WIDTH
-        while x < SCREEN_WIDTH + PARALLAX_CITY_PATTERN_WIDTH:
-            ctx.set_source_rgb(CITY_COLOR[0]/255.0, CITY_COLOR[1]/255.0, CITY_COLOR[2]/255.0)
-            ctx.rectangle(x + 20, GROUND_Y - 180, 50, 180)
-            ctx.fill()
-            ctx.rectangle(x + 80, GROUND_Y - 120, 60, 120)
-            ctx.fill()
-            ctx.rectangle(x + 150, GROUND_Y - 220, 70, 220)
-            ctx.fill()
-            ctx.rectangle(x + 230, GROUND_Y - 150, 90, 150)
-            ctx.fill()
-            ctx.set_source_rgb(CITY_WINDOW_COLOR[0]/255.0, CITY_WINDOW_COLOR[1]/255.0, CITY_WINDOW_COLOR[2]/255.0)
-            for row in range(6):
-                for col in range(3):
-                    ctx.rectangle(x + 160 + col*15, GROUND_Y - 200 + row*25, 8, 15)
-            ctx.fill()
-            x += PARALLAX_CITY_PATTERN_WIDTH
-        ctx.restore()
+    def render_scrolls(self, alpha=1.0):
+        prev_sky, prev_city, prev_ground = self.prev_scrolls
+        return (
+            interpolate_scroll(prev_sky, self.sky_scroll, PARALLAX_SKY_PATTERN_WIDTH, alpha),
+            interpolate_scroll(prev_city, self.city_scroll, PARALLAX_CITY_PATTERN_WIDTH, alpha),
+            interpolate_scroll(prev_ground, self.ground_scroll, PARALLAX_GROUND_PATTERN_WIDTH, alpha)
+        )
 
-        ctx.save()
-        ctx.set_source_rgba(1, 1, 1, 0.6)
-        pattern_start = -int(self.sky_scroll) % PARALLAX_SKY_PATTERN_WIDTH
-        x = pattern_start - PARALLAX_SKY_PATTERN_WIDTH
-        while x < SCREEN_WIDTH + PARALLAX_SKY_PATTERN_WIDTH:
-            ctx.arc(x + 100, 80, 40, 0, 2 * math.pi)
-            ctx.arc(x + 140, 70, 50, 0, 2 * math.pi)
-            ctx.arc(x + 180, 80, 40, 0, 2 * math.pi)
-            ctx.fill()
-            ctx.arc(x + 320, 120, 25, 0, 2 * math.pi)
-            ctx.arc(x + 350, 120, 30, 0, 2 * math.pi)
-            ctx.fill()
-            x += PARALLAX_SKY_PATTERN_WIDTH
-        ctx.restore()
+    def ensure_render_caches(self):
+        # Cache rendering dibuat lazily agar Game bisa dipakai tanpa Cairo (mode headless)
+        if self.background is None:
+            from background import ParallaxLayerCache
+            self.background = ParallaxLayerCache()
+        if POLLUTION_ATLAS_ENABLED and self.pollution_atlas is None:
+            from pollution_atlas import PollutionAtlas
+            self.pollution_atlas = PollutionAtlas()
 
-        ctx.save()
-        ctx.set_source_rgb(GROUND_COLOR[0]/255.0, GROUND_COLOR[1]/255.0, GROUND_COLOR[2]/255.0)
-        ctx.rectangle(0, GROUND_Y, SCREEN_WIDTH, SCREEN_HEIGHT - GROUND_Y)
-        ctx.fill()
-        ctx.set_source_rgba(1, 1, 1, 0.15)
-        ctx.rectangle(0, GROUND_Y, SCREEN_WIDTH, 10)
-        ctx.fill()
-        ctx.set_source_rgb(GROUND_DETAIL_COLOR[0]/255.0, GROUND_DETAIL_COLOR[1]/255.0, GROUND_DETAIL_COLOR[2]/255.0)
-        pattern_start = -int(self.ground_scroll) % PARALLAX_GROUND_PATTERN_WIDTH
-        x = pattern_start - PARALLAX_GROUND_PATTERN_WIDTH
-        while x < SCREEN_WIDTH + PARALLAX_GROUND_PATTERN_WIDTH:
-            for i in range(5):
-                gx = x + i * 40
-                ctx.move_to(gx, GROUND_Y)
-                ctx.line_to(gx + 10, GROUND_Y + 15)
-                ctx.line_to(gx + 20, GROUND_Y)
-                ctx.fill()
-            x += PARALLAX_GROUND_PATTERN_WIDTH
-        ctx.restore()
+    def _draw_background(self, ctx):
+        self.ensure_render_caches()
+        self.background.draw(ctx, *self.render_scrolls(self.render_alpha))
 
     def draw_hud(self, ctx):
+        self.draw_hud_frame(ctx)
+        self.draw_hud_fill(ctx, max(0, self.player.health / self.player.max_health))
+
+    @staticmethod
+    def draw_hud_frame(ctx):
+        # Bagian HUD yang statis: bayangan, bar kosong, garis tepi dan ikon hati
         ctx.save()
-        bar_x, bar_y = 60, 25
-        bar_w, bar_h = 200, 22
+        bar_x, bar_y = HEALTH_BAR_RECT[:2]
+        bar_w, bar_h = HEALTH_BAR_RECT[2:]
         ctx.set_source_rgba(0, 0, 0, 0.2)
         ctx.rectangle(bar_x + 3, bar_y + 3, bar_w, bar_h)
         ctx.fill()
@@ -213,15 +267,6 @@ class Game:
         ctx.set_line_width(2)
         ctx.set_source_rgb(0.2, 0.2, 0.2)
         ctx.stroke()
-        health_pct = max(0, self.player.health / self.player.max_health)
-        fill_w = int((bar_w - 4) * health_pct)
-        if fill_w > 0:
-            ctx.set_source_rgb(HEALTH_BAR_COLOR[0]/255.0, HEALTH_BAR_COLOR[1]/255.0, HEALTH_BAR_COLOR[2]/255.0)
-            ctx.rectangle(bar_x + 2, bar_y + 2, fill_w, bar_h - 4)
-            ctx.fill()
-            ctx.set_source_rgba(1, 1, 1, 0.3)
-            ctx.rectangle(bar_x + 2, bar_y + 2, fill_w, (bar_h - 4)/2)
-            ctx.fill()
         ctx.translate(35, 35)
         ctx.scale(1.3, 1.3)
         ctx.set_source_rgb(238/255.0, 82/255.0, 83/255.0)
@@ -231,31 +276,54 @@ class Game:
         ctx.fill()
         ctx.restore()
 
-    def draw_button(self, ctx, x, y, width, height, text, hover=False):
-        ctx.save()
-        radius = 15
-        def rounded_rect(bx, by, bw, bh, br):
-            ctx.new_sub_path()
-            ctx.arc(bx + bw - br, by + br, br, -math.pi/2, 0)
-            ctx.arc(bx + bw - br, by + bh - br, br, 0, math.pi/2)
-            ctx.arc(bx + br, by + bh - br, br, math.pi/2, math.pi)
-            ctx.arc(bx + br, by + br, br, math.pi, 3*math.pi/2)
-            ctx.close_path()
+    @staticmethod
+    def draw_hud_fill(ctx, health_pct):
+        fill_x, fill_y, fill_w, fill_h = health_fill_rect(health_pct)
+        if fill_w > 0:
+            ctx.set_source_rgb(HEALTH_BAR_COLOR[0]/255.0, HEALTH_BAR_COLOR[1]/255.0, HEALTH_BAR_COLOR[2]/255.0)
+            ctx.rectangle(fill_x, fill_y, fill_w, fill_h)
+            ctx.fill()
+            ctx.set_source_rgba(1, 1, 1, 0.3)
+            ctx.rectangle(fill_x, fill_y, fill_w, fill_h / 2)
+            ctx.fill()
 
+    @staticmethod
+    def draw_button_shape(ctx, x, y, width, height, hover=False):
+        ctx.save()
+        shape = SHAPES.get(("button", width, height, 15), Game.build_button_shape)
         ctx.set_source_rgba(0, 0, 0, 0.3)
-        rounded_rect(x + 4, y + 4, width, height, radius)
-        ctx.fill()
+        draw_shape(ctx, shape, x + 4, y + 4)
         color = BUTTON_HOVER_COLOR if hover else BUTTON_COLOR
         ctx.set_source_rgb(color[0]/255.0, color[1]/255.0, color[2]/255.0)
-        rounded_rect(x, y, width, height, radius)
-        ctx.fill()
+        draw_shape(ctx, shape, x, y)
         ctx.set_source_rgba(1, 1, 1, 0.4)
         ctx.set_line_width(2)
         ctx.stroke()
         ctx.restore()
-        if not hasattr(self, '_button_texts'):
-            self._button_texts = []
-        self._button_texts.append((x, y, width, height, text))
+
+    @staticmethod
+    def build_button_shape(recorder, key):
+        # Rounded rectangle di (0, 0); bayangan dan tombol memakai path yang sama di posisi berbeda
+        _, bw, bh, br = key
+        ctx = recorder.ctx
+        ctx.new_sub_path()
+        ctx.arc(bw - br, br, br, -math.pi/2, 0)
+        ctx.arc(bw - br, bh - br, br, 0, math.pi/2)
+        ctx.arc(br, bh - br, br, math.pi/2, math.pi)
+        ctx.arc(br, br, br, math.pi, 3*math.pi/2)
+        ctx.close_path()
+        recorder.fill()
+
+    def button_rect(self):
+        # Posisi tombol untuk state sekarang (dipakai saat menggambar, klik mouse dan dirty rect)
+        if self.state == MENU:
+            return (SCREEN_WIDTH / 2 - 150, SCREEN_HEIGHT / 2 + 20, 300, 65)
+        if self.state == GAME_OVER:
+            return (SCREEN_WIDTH / 2 - 150, SCREEN_HEIGHT / 2 + 60, 300, 65)
+        return None
+
+    def button_label(self):
+        return "PLAY GAME" if self.state == MENU else "TRY AGAIN"
 
     def check_button_click(self, mouse_x, mouse_y, button_x, button_y, button_width, button_height):
         return (button_x <= mouse_x <= button_x + button_width and
@@ -263,43 +331,114 @@ class Game:
 
     def draw_menu(self, ctx, mouse_x, mouse_y):
         self.draw_background(ctx)
+        self._text_overlays.extend(self.menu_overlays())
+
+    def menu_overlays(self):
+        # Teks menu (dipakai semua backend render)
         float_offset = math.sin(self.menu_anim_timer * 2) * 8
         title_y = 150 + float_offset
         title_text = "Healthy Breath Runner"
-        self._text_overlays.append((title_text, SCREEN_WIDTH / 2 + 3, title_y + 3, 64, SHADOW_COLOR, True))
-        self._text_overlays.append((title_text, SCREEN_WIDTH / 2, title_y, 64, TITLE_COLOR, True))
-        button_x = SCREEN_WIDTH / 2 - 150
-        button_y = SCREEN_HEIGHT / 2 + 20
-        button_width = 300
-        button_height = 65
-        hover = self.check_button_click(mouse_x, mouse_y, button_x, button_y, button_width, button_height)
-        self.draw_button(ctx, button_x, button_y, button_width, button_height, "PLAY GAME", hover)
+        button_x, button_y, button_width, button_height = self.button_rect()
         inst_text = "SPACE: Jump   |   DOWN: Duck"
-        self._text_overlays.append((inst_text, SCREEN_WIDTH / 2, button_y + button_height + 60, 24, (100, 100, 100), False))
+        return [
+            (title_text, SCREEN_WIDTH / 2 + 3, title_y + 3, 64, SHADOW_COLOR, True),
+            (title_text, SCREEN_WIDTH / 2, title_y, 64, TITLE_COLOR, True),
+            (inst_text, SCREEN_WIDTH / 2, button_y + button_height + 60, 24, (100, 100, 100), False),
+        ]
 
     def draw_game_over(self, ctx, mouse_x, mouse_y):
         self.draw_background(ctx)
         ctx.save()
-        ctx.set_source_rgba(0, 0, 0, 0.6)
+        ctx.set_source_rgba(0, 0, 0, GAME_OVER_DIM)
         ctx.rectangle(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
         ctx.fill()
         ctx.restore()
+        self._text_overlays.extend(self.game_over_overlays())
+
+    def game_over_overlays(self):
         title_text = "GAME OVER"
-        self._text_overlays.append((title_text, SCREEN_WIDTH / 2 + 4, 160 + 4, 70, SHADOW_COLOR, True))
-        self._text_overlays.append((title_text, SCREEN_WIDTH / 2, 160, 70, (238, 82, 83), True))
         score_text = f"Score: {self.score}"
-        self._text_overlays.append((score_text, SCREEN_WIDTH / 2, 240, 48, SCORE_COLOR, True))
+        overlays = [
+            (title_text, SCREEN_WIDTH / 2 + 4, 160 + 4, 70, SHADOW_COLOR, True),
+            (title_text, SCREEN_WIDTH / 2, 160, 70, (238, 82, 83), True),
+            (score_text, SCREEN_WIDTH / 2, 240, 48, SCORE_COLOR, True),
+        ]
         if self.best_score > 0:
             best_text = f"Best Score: {self.best_score}"
-            self._text_overlays.append((best_text, SCREEN_WIDTH / 2, 290, 32, (220, 220, 220), False))
-        button_x = SCREEN_WIDTH / 2 - 150
-        button_y = SCREEN_HEIGHT / 2 + 60
-        button_width = 300
-        button_height = 65
-        hover = self.check_button_click(mouse_x, mouse_y, button_x, button_y, button_width, button_height)
-        self.draw_button(ctx, button_x, button_y, button_width, button_height, "TRY AGAIN", hover)
+            overlays.append((best_text, SCREEN_WIDTH / 2, 290, 32, (220, 220, 220), False))
+        return overlays
 
-    def draw(self, ctx, mouse_x=0, mouse_y=0):
+    def score_overlays(self):
+        score_text = f"{self.score}"
+        return [
+            (score_text, SCREEN_WIDTH - 60 + 2, 50 + 2, 48, SHADOW_COLOR, True),
+            (score_text, SCREEN_WIDTH - 60, 50, 48, SCORE_COLOR, True),
+        ]
+
+    def draw_entities(self, ctx, alpha=1.0):
+        quality = self.quality
+        if quality > MINIMAL:
+            self.particles.draw(ctx, step=2 if quality == LOW else 1)
+        self.ensure_render_caches()
+        if self.pollution_atlas is not None:
+            for pollution in self.pollution_objects:
+                self.pollution_atlas.draw(ctx, pollution, alpha, quality)
+        else:
+            draw_clouds(ctx, self.pollution_objects, alpha, quality)
+        for mask in self.masks:
+            mask.draw(ctx, alpha, quality)
+        self.player.draw(ctx, alpha, quality)
+
+    def frame_regions(self, mouse_x=0, mouse_y=0, alpha=1.0):
+        # Bounding box semua yang digambar Cairo frame ini, key -> (rect, state).
+        # Dipakai mode dirty-rectangle untuk menentukan region mana yang perlu digambar ulang.
+        sky, city, ground = self.render_scrolls(alpha)
+        regions = {
+            "state": ((0, 0, SCREEN_WIDTH, SCREEN_HEIGHT), (self.state, self.quality)),
+            "clouds": ((0, 0, SCREEN_WIDTH, 160), int(sky)),
+            "city": ((0, GROUND_Y - 220, SCREEN_WIDTH, 220), int(city)),
+            "ground": ((0, GROUND_Y, SCREEN_WIDTH, SCREEN_HEIGHT - GROUND_Y), int(ground)),
+        }
+        if self.state != PLAYING:
+            button_x, button_y, button_width, button_height = self.button_rect()
+            hover = self.check_button_click(mouse_x, mouse_y, button_x, button_y, button_width, button_height)
+            # Bayangan tombol bergeser 4px, garis tepi 2px
+            regions["button"] = (
+                (button_x - 2, button_y - 2, button_width + 8, button_height + 8), hover
+            )
+            return regions
+        particle_bounds = self.particles.bounds()
+        if particle_bounds is not None:
+            regions["particles"] = (particle_bounds, self.menu_anim_timer)
+        for pollution in self.pollution_objects:
+            regions[("pollution", id(pollution))] = (pollution.bounds(alpha), pollution.anim_timer)
+        for mask in self.masks:
+            regions[("mask", id(mask))] = (mask.bounds(alpha), mask.rotation)
+        player = self.player
+        regions["player"] = (
+            player.bounds(alpha),
+            (player.animation_time, player.is_ducking, player.on_ground, player.is_protected)
+        )
+        regions["hud"] = (HUD_BOUNDS, self.player.health)
+        return regions
+
+    def snapshot(self):
+        # Salinan untuk render thread: state entity disalin agar simulasi frame berikutnya
+        # (termasuk reset objek di pool) tidak mengubah apa yang sedang digambar.
+        # Cache rendering (background, atlas) dipakai bersama karena hanya render thread yang memakainya.
+        self.ensure_render_caches()
+        snap = copy.copy(self)
+        snap.player = copy.copy(self.player)
+        snap.pollution_objects = [pollution.snapshot() for pollution in self.pollution_objects]
+        snap.masks = [copy.copy(mask) for mask in self.masks]
+        snap.particles = self.particles.snapshot()
+        snap.profiler = NULL_PROFILER
+        return snap
+
+    def draw(self, ctx, mouse_x=0, mouse_y=0, alpha=1.0, ui=True):
+        # alpha: faktor interpolasi render antara tick sebelumnya dan tick terakhir.
+        # ui=False: hanya dunia game; tombol/HUD digambar terpisah lewat draw_ui (dynamic resolution)
+        self.render_alpha = alpha
         self._text_overlays = []
         self._button_texts = []
         if self.state == MENU:
@@ -308,104 +447,292 @@ class Game:
             self.draw_game_over(ctx, mouse_x, mouse_y)
         else:
             self.draw_background(ctx)
-            for pollution in self.pollution_objects:
-                pollution.draw(ctx)
-            for mask in self.masks:
-                mask.draw(ctx)
-            self.player.draw(ctx)
-            self.draw_hud(ctx)
-            score_text = f"{self.score}"
-            self._text_overlays.append((score_text, SCREEN_WIDTH - 60 + 2, 50 + 2, 48, SHADOW_COLOR, True))
-            self._text_overlays.append((score_text, SCREEN_WIDTH - 60, 50, 48, SCORE_COLOR, True))
+            with self.profiler.section("entities"):
+                self.draw_entities(ctx, alpha)
+            self._text_overlays.extend(self.score_overlays())
+        if self.state != PLAYING:
+            self._button_texts.append(tuple(self.button_rect()) + (self.button_label(),))
+        if ui:
+            self.draw_ui(ctx, mouse_x, mouse_y)
+
+    def draw_ui(self, ctx, mouse_x=0, mouse_y=0):
+        if self.state == PLAYING:
+            with self.profiler.section("hud"):
+                self.draw_hud(ctx)
+            return
+        button_x, button_y, button_width, button_height = self.button_rect()
+        hover = self.check_button_click(mouse_x, mouse_y, button_x, button_y, button_width, button_height)
+        self.draw_button_shape(ctx, button_x, button_y, button_width, button_height, hover)
+
+def interpolate_scroll(prev, current, pattern_width, alpha):
+    # Scroll di-wrap ke [0, pattern_width); buka wrap dulu agar interpolasi tidak melompat mundur
+    if current < prev:
+        current += pattern_width
+    return prev + (current - prev) * alpha
 
 def cairo_surface_to_pygame(cairo_surface):
+    import pygame
     buf = cairo_surface.get_data()
     width = cairo_surface.get_width()
     height = cairo_surface.get_height()
     pygame_surface = pygame.image.frombuffer(buf, (width, height), "BGRA")
     return pygame_surface
 
-def main():
+def format_stats(values):
+    return ", ".join(
+        "%s %s" % (key.replace("_", " "), "%.3g" % value if isinstance(value, float) else value)
+        for key, value in values.items()
+    )
+
+
+def main(record_path=None, replay_path=None, fps=FPS, startup=None, exit_after_first_frame=False,
+         backend_name=RENDER_BACKEND, dynamic_resolution=DYNAMIC_RESOLUTION_ENABLED,
+         quality_governor=QUALITY_GOVERNOR_ENABLED):
+    if fps <= 0:
+        raise ValueError("fps must be positive, got %r" % (fps,))
+    import random
+    import pygame
+    from framebuffer import FrameBufferChain
+    from timestep import FixedTimestep
+    from profiler import FrameProfiler
+    from text_cache import TextRenderer
+    from dirty import DirtyRectTracker, merge_rects
+    from pipeline import RenderPipeline
+    from startup import Prewarmer, menu_prewarm_tasks
+    from render_backend import create_backend
+    # Hanya subsistem yang dipakai: tanpa audio/joystick, yang lambat di-init saat cold start
+    pygame.display.init()
+    pygame.font.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Healthy Breath Runner")
-    game = Game()
+    if startup is not None:
+        startup.mark("window")
+    recorder = None
+    replay_player = None
+    tick_rate = SIM_TICK_RATE
+    if replay_path is not None:
+        # Mode replay: input diambil dari log, keyboard/mouse hanya untuk overlay dan keluar
+        from replay import Replay, ReplayPlayer
+        replay_player = ReplayPlayer(Replay.load(replay_path))
+        game = replay_player.game
+        tick_rate = replay_player.replay.tick_rate
+    elif record_path is not None:
+        from replay import InputRecorder
+        seed = random.getrandbits(63)
+        recorder = InputRecorder(seed)
+        game = Game(seed=seed)
+    else:
+        game = Game()
     game._text_overlays = []
     game._button_texts = []
+    dirty_tracker = None
+    text_tracker = None
+    pipeline = None
+    # Pipeline thread dan dirty-rect adalah mode khusus framebuffer Cairo
+    cairo_modes = backend_name == "cairo"
+    if not cairo_modes:
+        framebuffers = None
+    elif RENDER_PIPELINE_ENABLED:
+        # Mode pipeline: dua buffer bergantian antara render thread dan main thread.
+        # Dirty-rect tidak dipakai di mode ini karena butuh satu buffer persisten.
+        framebuffers = FrameBufferChain(SCREEN_WIDTH, SCREEN_HEIGHT, count=2)
+    else:
+        # Mode dirty-rect butuh isi framebuffer frame sebelumnya, jadi tidak di-clear
+        framebuffers = FrameBufferChain(SCREEN_WIDTH, SCREEN_HEIGHT, clear=not DIRTY_RECTS_ENABLED)
+    if cairo_modes and DIRTY_RECTS_ENABLED and not RENDER_PIPELINE_ENABLED:
+        dirty_tracker = DirtyRectTracker(SCREEN_WIDTH, SCREEN_HEIGHT)
+        text_tracker = DirtyRectTracker(SCREEN_WIDTH, SCREEN_HEIGHT)
+        game.menu_scroll = False
     
-    font_cache = {}
-    def get_font(size):
-        if size not in font_cache:
-            font_cache[size] = pygame.font.Font(None, size)
-        return font_cache[size]
+    text_renderer = TextRenderer()
+    prewarmer = Prewarmer(menu_prewarm_tasks(game, text_renderer))
+    first_frame = True
+
+    def text_items(text_overlays, button_texts):
+        for text, x, y, size, color, bold in text_overlays:
+            yield text, size, color, (x, y)
+        for x, y, width, height, text in button_texts:
+            yield text, 32, BUTTON_TEXT_COLOR, (x + width/2, y + height/2)
         
     running = True
     clock = pygame.time.Clock()
+    timestep = FixedTimestep(tick_rate)
+
+    def send_input(code):
+        if replay_player is not None:
+            return
+        if game.apply_input(code) and recorder is not None:
+            recorder.record(game.tick, code)
+    profiler = FrameProfiler()
+    game.profiler = profiler
+    if cairo_modes and RENDER_PIPELINE_ENABLED:
+        pipeline = RenderPipeline(framebuffers, overlay=profiler.draw_overlay)
+    resolution = None
+    if dynamic_resolution and cairo_modes and pipeline is None and dirty_tracker is None:
+        from resolution import ResolutionController
+        resolution = ResolutionController(budget=1.0 / fps)
+    backend = create_backend(backend_name, framebuffers, resolution)
+    governor = None
+    if quality_governor:
+        from quality import QualityGovernor, LEVEL_NAMES
+        governor = QualityGovernor(budget=1.0 / fps)
+        game.quality = governor.level
+        profiler.set_label("quality", governor.level_name)
     mouse_x, mouse_y = 0, 0
+
+    def runtime_stats():
+        # Statistik komponen render untuk metadata trace (F12) dan ringkasan saat keluar
+        stats = {}
+        if framebuffers is not None:
+            stats["framebuffers"] = framebuffers.stats()
+        stats["text_cache"] = text_renderer.stats()
+        # Atlas awan: milik backend pygame, atau milik game (POLLUTION_ATLAS_ENABLED) di backend Cairo
+        atlas = getattr(backend, "atlas", None) or game.pollution_atlas
+        if atlas is not None:
+            stats["pollution_atlas"] = atlas.stats()
+        stats["pollution_pool"] = game.pollution_pool.stats()
+        stats["mask_pool"] = game.mask_pool.stats()
+        stats["shape_cache"] = SHAPES.stats()
+        if governor is not None:
+            stats["quality_governor"] = governor.stats()
+        return stats
     
     while running:
-        dt = clock.tick(FPS) / 1000.0
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    if game.state == PLAYING:
-                        game.player.jump()
-                elif event.key == pygame.K_DOWN or event.key == pygame.K_s:
-                    if game.state == PLAYING:
-                        game.player.duck()
-            elif event.type == pygame.KEYUP:
-                if event.key == pygame.K_DOWN or event.key == pygame.K_s:
-                    if game.state == PLAYING:
-                        game.player.unduck()
-            elif event.type == pygame.MOUSEMOTION:
-                mouse_x, mouse_y = event.pos
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
+        dt = clock.tick(fps) / 1000.0
+        profiler.begin_frame()
+        with profiler.section("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        send_input(INPUT_JUMP)
+                    elif event.key == pygame.K_F3:
+                        profiler.toggle_overlay()
+                    elif event.key == pygame.K_F12:
+                        profiler.export_chrome_trace(TRACE_EXPORT_PATH, runtime_stats())
+                    elif event.key == pygame.K_DOWN or event.key == pygame.K_s:
+                        send_input(INPUT_DUCK)
+                elif event.type == pygame.KEYUP:
+                    if event.key == pygame.K_DOWN or event.key == pygame.K_s:
+                        send_input(INPUT_UNDUCK)
+                elif event.type == pygame.MOUSEMOTION:
                     mouse_x, mouse_y = event.pos
-                    if game.state == MENU:
-                        button_x = SCREEN_WIDTH / 2 - 150
-                        button_y = SCREEN_HEIGHT / 2 + 20
-                        button_width = 300
-                        button_height = 65
-                        if game.check_button_click(mouse_x, mouse_y, button_x, button_y, button_width, button_height):
-                            game.state = PLAYING
-                            game.reset_game()
-                    elif game.state == GAME_OVER:
-                        button_x = SCREEN_WIDTH / 2 - 150
-                        button_y = SCREEN_HEIGHT / 2 + 60
-                        button_width = 300
-                        button_height = 65
-                        if game.check_button_click(mouse_x, mouse_y, button_x, button_y, button_width, button_height):
-                            game.state = PLAYING
-                            game.reset_game()
-        game.update(dt)
-        cairo_surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, SCREEN_WIDTH, SCREEN_HEIGHT)
-        ctx = cairo.Context(cairo_surface)
-        game.draw(ctx, mouse_x, mouse_y)
-        cairo_surface.flush()
-        draw_surface = cairo_surface_to_pygame(cairo_surface)
-        screen.blit(draw_surface, (0, 0))
-        if game._text_overlays:
-            for text, x, y, size, color, bold in game._text_overlays:
-                try:
-                    font = get_font(size)
-                    text_surface = font.render(text, True, color)
-                    text_rect = text_surface.get_rect(center=(x, y))
-                    screen.blit(text_surface, text_rect)
-                except:
-                    pass
-        if game._button_texts:
-            try:
-                button_font = get_font(32)
-                for x, y, width, height, text in game._button_texts:
-                    text_surface = button_font.render(text, True, BUTTON_TEXT_COLOR)
-                    text_rect = text_surface.get_rect(center=(x + width/2, y + height/2))
-                    screen.blit(text_surface, text_rect)
-            except:
-                pass
-        pygame.display.flip()
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    if event.button == 1:
+                        mouse_x, mouse_y = event.pos
+                        if game.state == MENU or game.state == GAME_OVER:
+                            if game.check_button_click(mouse_x, mouse_y, *game.button_rect()):
+                                send_input(INPUT_START)
+        with profiler.section("simulation"):
+            for _ in range(timestep.advance(dt)):
+                if replay_player is not None:
+                    replay_player.step()
+                else:
+                    game.update(timestep.step_dt)
+        presented = True
+        if pipeline is not None:
+            with profiler.section("render_wait"):
+                frame = pipeline.exchange(game.snapshot(), mouse_x, mouse_y, timestep.alpha)
+            presented = frame is not None
+            if presented:
+                draw_surface, text_overlays, button_texts = frame
+                with profiler.section("convert"):
+                    screen.blit(draw_surface, (0, 0))
+                with profiler.section("text"):
+                    for text, size, color, center in text_items(text_overlays, button_texts):
+                        text_renderer.blit_centered(screen, text, size, color, center)
+                with profiler.section("flip"):
+                    pygame.display.flip()
+        elif dirty_tracker is not None:
+            ctx = framebuffers.begin_frame()
+            regions = game.frame_regions(mouse_x, mouse_y, timestep.alpha)
+            if profiler.visible:
+                regions["profiler"] = ((10, 70, 240, 104 + 22 * len(profiler.labels)), profiler.frames)
+            draw_rects = dirty_tracker.update(regions)
+            # Cairo hanya menggambar ulang di dalam region yang berubah
+            ctx.save()
+            for rect in draw_rects:
+                ctx.rectangle(*rect)
+            ctx.clip()
+            game.draw(ctx, mouse_x, mouse_y, timestep.alpha)
+            profiler.draw_overlay(ctx, game._text_overlays)
+            ctx.restore()
+            with profiler.section("convert"):
+                draw_surface = framebuffers.end_frame()
+                text_regions = {}
+                for i, (text, size, color, center) in enumerate(text_items(game._text_overlays, game._button_texts)):
+                    text_regions[i] = (tuple(text_renderer.rect(text, size, color, center)), (text, size, color))
+                update_rects = merge_rects(draw_rects + text_tracker.update(text_regions))
+                for rect in update_rects:
+                    screen.blit(draw_surface, rect, rect)
+            with profiler.section("text"):
+                for rect in update_rects:
+                    screen.set_clip(rect)
+                    for text, size, color, center in text_items(game._text_overlays, game._button_texts):
+                        text_renderer.blit_centered(screen, text, size, color, center)
+                screen.set_clip(None)
+            with profiler.section("flip"):
+                if update_rects:
+                    pygame.display.update(update_rects)
+        else:
+            backend.draw_frame(screen, game, mouse_x, mouse_y, timestep.alpha, profiler)
+            with profiler.section("text"):
+                for text, size, color, center in text_items(game._text_overlays, game._button_texts):
+                    text_renderer.blit_centered(screen, text, size, color, center)
+            with profiler.section("flip"):
+                pygame.display.flip()
+        if presented and first_frame:
+            first_frame = False
+            if startup is not None:
+                startup.mark("first_frame")
+            if exit_after_first_frame:
+                running = False
+        if game.state == MENU and not prewarmer.done:
+            # Sisa waktu frame menu dipakai untuk memanaskan font, teks dan pool
+            with profiler.section("prewarm"):
+                prewarmer.run()
+        profiler.end_frame()
+        if resolution is not None:
+            resolution.observe(profiler.last_frame_time)
+        if governor is not None and governor.observe(profiler.last_frame_time):
+            previous = LEVEL_NAMES[game.quality]
+            game.quality = governor.level
+            profiler.set_label("quality", governor.level_name)
+            profiler.instant("quality", {"from": previous, "to": governor.level_name})
+    if pipeline is not None:
+        pipeline.close()
+    if recorder is not None:
+        recorder.finish(game.tick)
+        recorder.save(record_path)
+    stats = runtime_stats()
+    if governor is not None:
+        governor_stats = stats.pop("quality_governor")
+        print("quality governor: final level %s, %d transitions, frames per level %s" % (
+            governor_stats["level"], governor_stats["transitions"], governor_stats["frames_at_level"]))
+    for name, values in stats.items():
+        print("%s: %s" % (name.replace("_", " "), format_stats(values)))
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+
+    def positive_int(text):
+        value = int(text)
+        if value <= 0:
+            raise argparse.ArgumentTypeError("must be a positive integer, got %s" % text)
+        return value
+
+    parser = argparse.ArgumentParser(description="Healthy Breath Runner")
+    parser.add_argument("--record", metavar="PATH", help="record the session's inputs to PATH")
+    parser.add_argument("--replay", metavar="PATH", help="play back a recorded session")
+    parser.add_argument("--fps", type=positive_int, default=FPS, help="render frame rate")
+    parser.add_argument("--backend", choices=("cairo", "pygame"), default=RENDER_BACKEND,
+                        help="render backend (pygame: pre-baked sprites, no per-frame Cairo)")
+    parser.add_argument("--dynamic-resolution", action="store_true", default=DYNAMIC_RESOLUTION_ENABLED,
+                        help="scale the cairo render resolution to hold the frame budget")
+    parser.add_argument("--quality-governor", action="store_true", default=QUALITY_GOVERNOR_ENABLED,
+                        help="lower/raise entity detail (ultra/high/low/minimal) to hold the frame budget")
+    args = parser.parse_args()
+    main(record_path=args.record, replay_path=args.replay, fps=args.fps, backend_name=args.backend,
+         dynamic_resolution=args.dynamic_resolution, quality_governor=args.quality_governor)
\ No newline at end of file
@@ -0,0 +1,58 @@
+import argparse
+import time
+from constants import SIM_TICK_RATE
+from game import Game, PLAYING, GAME_OVER
+
+
+def run_headless(seconds, seed=None, dt=1.0 / SIM_TICK_RATE, policy=None, stop_on_game_over=True):
+    # Jalankan simulasi tanpa pygame/display secepat CPU mampu.
+    # policy(game) dipanggil setiap tick sebelum update dan boleh memanggil jump/duck/unduck.
+    game = Game(seed=seed)
+    game.state = PLAYING
+    game.reset_game()
+
+    ticks = 0
+    sim_time = 0.0
+    start = time.perf_counter()
+    while sim_time < seconds:
+        if policy is not None:
+            policy(game)
+        game.update(dt)
+        ticks += 1
+        sim_time += dt
+        if game.state == GAME_OVER and stop_on_game_over:
+            break
+    wall_time = time.perf_counter() - start
+
+    return {
+        "seed": seed,
+        "ticks": ticks,
+        "sim_seconds": sim_time,
+        "wall_seconds": wall_time,
+        "sim_seconds_per_wall_second": sim_time / wall_time if wall_time > 0 else float("inf"),
+        "survival_time": game.survival_time,
+        "score": game.score,
+        "health": game.player.health,
+        "game_over": game.state == GAME_OVER,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Healthy Breath Runner headless.")
+    parser.add_argument("--seconds", type=float, default=60.0, help="simulated seconds to run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tick-rate", type=float, default=SIM_TICK_RATE, help="simulation ticks per second")
+    parser.add_argument("--keep-going", action="store_true",
+                        help="keep simulating after the player dies")
+    args = parser.parse_args()
+
+    result = run_headless(
+        args.seconds, seed=args.seed, dt=1.0 / args.tick_rate,
+        stop_on_game_over=not args.keep_going
+    )
+    for key, value in result.items():
+        print("%s: %s" % (key, value))
+
+
+if __name__ == "__main__":
+    main()
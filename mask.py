@@ -5,19 +5,34 @@ from constants import (
     MASK_SIZE, MASK_SPAWN_MIN_Y, MASK_SPAWN_MAX_Y,
     POLLUTION_MIN_SPEED, POLLUTION_MAX_SPEED
 )
+from quality import ULTRA, HIGH, LOW
+from shape_cache import SHAPES, draw_shape, rgb
 
 class Mask:
-    def __init__(self, x, y):
+    OFF_SCREEN_MARGIN = 0
+
+    def __init__(self, x, y, rng=random, speed=None, float_time=None):
+        self.reset(x, y, rng, speed, float_time)
+
+    def reset(self, x, y, rng=random, speed=None, float_time=None):
         self.x = x
         self.y = y
+        self.prev_x = x
         self.radius = MASK_SIZE
-        self.speed = random.uniform(POLLUTION_MIN_SPEED, POLLUTION_MAX_SPEED)
+        if speed is None:
+            speed = rng.uniform(POLLUTION_MIN_SPEED, POLLUTION_MAX_SPEED)
+        self.speed = speed
         # Variabel untuk animasi rotasi dan floating
         self.rotation = 0.0
         self.float_offset = 0.0
-        self.float_time = random.uniform(0, 2 * math.pi)
+        self.prev_float_offset = 0.0
+        if float_time is None:
+            float_time = rng.uniform(0, 2 * math.pi)
+        self.float_time = float_time
 
     def update(self, dt):
+        self.prev_x = self.x
+        self.prev_float_offset = self.float_offset
         # Gerak ke kiri seperti pollution
         self.x -= self.speed * dt
         # Rotasi untuk efek visual
@@ -28,68 +43,96 @@ class Mask:
 
     def is_off_screen(self):
         # Cek apakah sudah keluar dari layar
-        return self.x + self.radius < 0
+        return self.x + self.radius + self.OFF_SCREEN_MARGIN < 0
+
+    def collision_y(self):
+        # Posisi vertikal yang dipakai untuk tabrakan (termasuk floating offset)
+        return self.y + self.float_offset
 
     def check_collision_with_player(self, player):
         # Hitung jarak antara mask dengan player center
         player_center_x = player.x + player.width / 2
         player_center_y = player.y + player.height / 2
         dx = self.x - player_center_x
-        dy = (self.y + self.float_offset) - player_center_y
+        dy = self.collision_y() - player_center_y
         distance = math.sqrt(dx * dx + dy * dy)
         # Collision kalau jarak kurang dari radius mask + player radius
         player_radius = max(player.width, player.height) / 2
         return distance < (self.radius + player_radius)
 
-    def draw(self, ctx):
+    def render_position(self, alpha=1.0):
+        # Interpolasi posisi dan floating offset antara dua tick
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        float_offset = self.prev_float_offset + (self.float_offset - self.prev_float_offset) * alpha
+        return x, self.y + float_offset
+
+    def bounds(self, alpha=1.0):
+        # Glow (radius + 5) lebih besar dari badan mask yang berputar
+        x, y = self.render_position(alpha)
+        half = self.radius + 8
+        return (x - half, y - half, half * 2, half * 2)
+
+    def draw(self, ctx, alpha=1.0, quality=ULTRA):
         ctx.save()
         # Apply floating offset
-        draw_y = self.y + self.float_offset
+        draw_x, draw_y = self.render_position(alpha)
         # Apply rotation transform
-        ctx.translate(self.x, draw_y)
+        ctx.translate(draw_x, draw_y)
         ctx.rotate(self.rotation)
-        # Gambar body mask
-        ctx.set_source_rgb(
-            MASK_COLOR[0] / 255.0,
-            MASK_COLOR[1] / 255.0,
-            MASK_COLOR[2] / 255.0
-        )
-        mask_width = self.radius * 1.5
-        mask_height = self.radius * 1.2
-        ctx.rectangle(-mask_width/2, -mask_height/2, mask_width, mask_height)
-        ctx.fill()
-        # Gambar tali mask
-        ctx.set_source_rgb(
-            MASK_STRAP_COLOR[0] / 255.0,
-            MASK_STRAP_COLOR[1] / 255.0,
-            MASK_STRAP_COLOR[2] / 255.0
-        )
-        ctx.set_line_width(3)
-        # Tali atas
-        ctx.move_to(-mask_width/2, -mask_height/2 - 2)
-        ctx.line_to(mask_width/2, -mask_height/2 - 2)
-        ctx.stroke()
-        # Tali bawah
-        ctx.move_to(-mask_width/2, mask_height/2 + 2)
-        ctx.line_to(mask_width/2, mask_height/2 + 2)
-        ctx.stroke()
-        # Detail garis vertikal dan circle di tengah
-        ctx.set_line_width(2)
-        ctx.move_to(0, -mask_height/2)
-        ctx.line_to(0, mask_height/2)
-        ctx.stroke()
-        ctx.arc(0, 0, 3, 0, 2 * math.pi)
-        ctx.fill()
+        # Badan, tali dan detail tengah: path statis per tingkat kualitas, diputar ulang dari cache
+        draw_shape(ctx, SHAPES.get(("mask", self.radius, min(quality, HIGH)), Mask.build_shape))
         ctx.restore()
+        if quality < ULTRA:
+            return
         # Gambar efek glow
         ctx.save()
         ctx.set_source_rgba(1.0, 1.0, 1.0, 0.3)
-        ctx.arc(self.x, draw_y, self.radius + 5, 0, 2 * math.pi)
+        ctx.arc(draw_x, draw_y, self.radius + 5, 0, 2 * math.pi)
         ctx.fill()
         ctx.restore()
 
     @staticmethod
-    def create_random():
-        y = random.uniform(MASK_SPAWN_MIN_Y, MASK_SPAWN_MAX_Y)
+    def build_shape(recorder, key):
+        # Dipanggil sekali per (radius, tingkat kualitas), di koordinat lokal mask (sebelum rotasi)
+        _, radius, quality = key
+        ctx = recorder.ctx
+        # Gambar body mask
+        mask_width = radius * 1.5
+        mask_height = radius * 1.2
+        ctx.rectangle(-mask_width/2, -mask_height/2, mask_width, mask_height)
+        recorder.fill(rgb(MASK_COLOR))
+        if quality < LOW:
+            return
+        # Gambar tali mask (atas dan bawah, satu stroke)
+        ctx.move_to(-mask_width/2, -mask_height/2 - 2)
+        ctx.line_to(mask_width/2, -mask_height/2 - 2)
+        ctx.move_to(-mask_width/2, mask_height/2 + 2)
+        ctx.line_to(mask_width/2, mask_height/2 + 2)
+        recorder.stroke(rgb(MASK_STRAP_COLOR), 3)
+        if quality >= HIGH:
+            # Detail garis vertikal dan circle di tengah
+            ctx.move_to(0, -mask_height/2)
+            ctx.line_to(0, mask_height/2)
+            recorder.stroke(rgb(MASK_STRAP_COLOR), 2)
+            ctx.arc(0, 0, 3, 0, 2 * math.pi)
+            recorder.fill(rgb(MASK_STRAP_COLOR))
+
+    @staticmethod
+    def random_placement(rng=random):
+        # Semua nilai acak satu mask: (y, speed, float_time)
+        y = rng.uniform(MASK_SPAWN_MIN_Y, MASK_SPAWN_MAX_Y)
+        speed = rng.uniform(POLLUTION_MIN_SPEED, POLLUTION_MAX_SPEED)
+        float_time = rng.uniform(0, 2 * math.pi)
+        return (y, speed, float_time)
+
+    @staticmethod
+    def from_placement(placement, pool=None):
+        y, speed, float_time = placement
         x = SCREEN_WIDTH + MASK_SIZE
-        return Mask(x, y)
+        if pool is not None:
+            return pool.acquire(x, y, speed=speed, float_time=float_time)
+        return Mask(x, y, speed=speed, float_time=float_time)
+
+    @staticmethod
+    def create_random(rng=random, pool=None):
+        return Mask.from_placement(Mask.random_placement(rng), pool)
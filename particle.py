@@ -1,45 +1,280 @@
-import random
 import math
-from constants import PARTICLE_COLOR
+import numpy as np
+from constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT,
+    PARTICLE_COLOR, PARTICLE_CAPACITY, PARTICLE_EMIT_RATE, PARTICLE_ALPHA_BUCKETS,
+    PARTICLE_SPLAT_MIN, PARTICLE_MAX_DRAWN
+)
 
-class Particle:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
+# Rentang radius partikel (lihat ParticleSystem.emit), dikuantisasi per setengah piksel
+PARTICLE_MIN_RADIUS = 2.0
+PARTICLE_MAX_RADIUS = 5.0
+PARTICLE_RADIUS_STEPS = int((PARTICLE_MAX_RADIUS - PARTICLE_MIN_RADIUS) * 2) + 1
+SPLAT_HALF = int(math.ceil(PARTICLE_MAX_RADIUS)) + 1
+
+
+def _splat_stamps():
+    # Per langkah radius: offset piksel (dy, dx) di sekitar pusat partikel dan coverage antialias-nya
+    stamps = []
+    for step in range(PARTICLE_RADIUS_STEPS):
+        radius = PARTICLE_MIN_RADIUS + step * 0.5
+        half = int(math.ceil(radius)) + 1
+        dy, dx = np.mgrid[-half:half, -half:half].astype(np.int32)
+        coverage = np.clip(radius + 0.5 - np.hypot(dx + 0.5, dy + 0.5), 0.0, 1.0)
+        inside = coverage > 0
+        stamps.append((dy[inside], dx[inside], coverage[inside]))
+    return stamps
+
+
+SPLAT_STAMPS = _splat_stamps()
+# Piksel ARGB32 premultiplied (uint32 native-endian) warna partikel untuk tiap alpha 0..255
+_alpha = np.arange(256) / 255.0
+SPLAT_PIXELS = (
+    (np.arange(256, dtype=np.uint32) << 24)
+    | (np.rint(_alpha * PARTICLE_COLOR[0]).astype(np.uint32) << 16)
+    | (np.rint(_alpha * PARTICLE_COLOR[1]).astype(np.uint32) << 8)
+    | np.rint(_alpha * PARTICLE_COLOR[2]).astype(np.uint32)
+)
+del _alpha
+
+
+class SmokeEmitter:
+    # Emitter asap yang menempel pada satu objek (mis. Pollution)
+    __slots__ = ("rate", "accumulator")
+
+    def __init__(self, rate=PARTICLE_EMIT_RATE):
+        self.rate = rate
+        self.accumulator = 0.0
+
+    def pending(self, dt):
+        # Jumlah partikel yang harus dikeluarkan pada frame ini
+        self.accumulator += self.rate * dt
+        count = int(self.accumulator)
+        self.accumulator -= count
+        return count
+
+
+class ParticleSystem:
+    # Semua partikel disimpan sebagai struct-of-arrays NumPy yang dialokasikan sekali.
+    # Partikel hidup selalu berada di indeks [0, count).
+    ARRAY_NAMES = ("x", "y", "velocity_x", "velocity_y", "radius", "lifetime", "max_lifetime")
+
+    def __init__(self, capacity=PARTICLE_CAPACITY, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.dropped = 0
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.velocity_x = np.zeros(capacity, dtype=np.float32)
+        self.velocity_y = np.zeros(capacity, dtype=np.float32)
+        self.radius = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.float32)
+        self.max_lifetime = np.ones(capacity, dtype=np.float32)
+        self._arrays = (
+            self.x, self.y, self.velocity_x, self.velocity_y,
+            self.radius, self.lifetime, self.max_lifetime
+        )
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y, n=1):
+        # x dan y boleh skalar atau array sepanjang n
+        start = self.count
+        n = min(n, self.capacity - start)
+        if n <= 0:
+            return 0
+        end = start + n
+        rng = self.rng
+        self.x[start:end] = x[:n] if np.ndim(x) else x
+        self.y[start:end] = y[:n] if np.ndim(y) else y
         # Random size dan velocity untuk variasi
-        self.radius = random.uniform(2, 5)
-        self.velocity_x = random.uniform(-20, 20)
-        self.velocity_y = random.uniform(-30, -10)
+        self.radius[start:end] = rng.uniform(PARTICLE_MIN_RADIUS, PARTICLE_MAX_RADIUS, n)
+        self.velocity_x[start:end] = rng.uniform(-20, 20, n)
+        self.velocity_y[start:end] = rng.uniform(-30, -10, n)
         # Lifetime untuk efek fade out
-        self.max_lifetime = random.uniform(0.5, 1.5)
-        self.lifetime = self.max_lifetime
+        lifetime = rng.uniform(0.5, 1.5, n)
+        self.max_lifetime[start:end] = lifetime
+        self.lifetime[start:end] = lifetime
+        self.count = end
+        return n
+
+    def emit_from(self, sources, dt):
+        # Kumpulkan emisi semua sumber lalu keluarkan dalam satu batch
+        xs = []
+        ys = []
+        counts = []
+        for source in sources:
+            count = source.emitter.pending(dt)
+            if count:
+                x, y = source.smoke_origin()
+                xs.append(x)
+                ys.append(y)
+                counts.append(count)
+        if not counts:
+            return 0
+        counts = np.asarray(counts)
+        total = int(counts.sum())
+        x = np.repeat(np.asarray(xs, dtype=np.float32), counts)
+        y = np.repeat(np.asarray(ys, dtype=np.float32), counts)
+        y += self.rng.uniform(-4, 4, total).astype(np.float32)
+        emitted = self.emit(x, y, total)
+        self.dropped += total - emitted
+        return emitted
 
     def update(self, dt):
+        n = self.count
+        if n == 0:
+            return
         # Update posisi berdasarkan velocity
-        self.x += self.velocity_x * dt
-        self.y += self.velocity_y * dt
-        self.lifetime -= dt
+        self.x[:n] += self.velocity_x[:n] * dt
+        self.y[:n] += self.velocity_y[:n] * dt
+        self.lifetime[:n] -= dt
         # Tambah upward drift untuk efek asap
-        self.velocity_y -= 20 * dt
+        self.velocity_y[:n] -= 20 * dt
+
+        alive = self.lifetime[:n] > 0
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count < n:
+            for array in self._arrays:
+                array[:alive_count] = array[:n][alive]
+            self.count = alive_count
+
+    def snapshot(self):
+        # Salinan partikel yang hidup saja, untuk digambar oleh render thread.
+        # Tidak lewat copy.copy: itu memanggil __setstate__ yang mengalokasikan array kapasitas penuh
+        snap = object.__new__(ParticleSystem)
+        n = self.count
+        snap.capacity = n
+        snap.count = n
+        snap.dropped = self.dropped
+        snap.rng = self.rng
+        snap.x = self.x[:n].copy()
+        snap.y = self.y[:n].copy()
+        snap.velocity_x = self.velocity_x[:n].copy()
+        snap.velocity_y = self.velocity_y[:n].copy()
+        snap.radius = self.radius[:n].copy()
+        snap.lifetime = self.lifetime[:n].copy()
+        snap.max_lifetime = self.max_lifetime[:n].copy()
+        snap._arrays = (
+            snap.x, snap.y, snap.velocity_x, snap.velocity_y,
+            snap.radius, snap.lifetime, snap.max_lifetime
+        )
+        return snap
+
+    def __getstate__(self):
+        # Keyframe replay / pickle: simpan partikel hidup saja, bukan seluruh kapasitas
+        state = self.__dict__.copy()
+        del state["_arrays"]
+        for name in self.ARRAY_NAMES:
+            state[name] = state[name][:self.count].copy()
+        return state
 
-    def is_alive(self):
-        # Cek apakah particle masih hidup
-        return self.lifetime > 0
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for name in self.ARRAY_NAMES:
+            full = np.ones(self.capacity, dtype=np.float32)
+            full[:self.count] = state[name]
+            setattr(self, name, full)
+        self._arrays = tuple(getattr(self, name) for name in self.ARRAY_NAMES)
 
-    def get_alpha(self):
-        # Return alpha berdasarkan sisa lifetime (untuk fade out)
-        return max(0, self.lifetime / self.max_lifetime)
+    def bounds(self):
+        n = self.count
+        if n == 0:
+            return None
+        xs = self.x[:n]
+        ys = self.y[:n]
+        pad = float(self.radius[:n].max()) + 1
+        x0 = float(xs.min()) - pad
+        y0 = float(ys.min()) - pad
+        return (x0, y0, float(xs.max()) + pad - x0, float(ys.max()) + pad - y0)
 
-    def draw(self, ctx):
+    def alphas(self):
+        n = self.count
+        return np.clip(self.lifetime[:n] / self.max_lifetime[:n], 0, 1)
+
+    def draw_step(self, step=1):
+        # Jarak antar partikel yang digambar: step dari tingkat kualitas, dinaikkan bila
+        # jumlah yang tergambar akan melebihi PARTICLE_MAX_DRAWN
+        return max(step, -(-self.count // PARTICLE_MAX_DRAWN))
+
+    def draw(self, ctx, buckets=PARTICLE_ALPHA_BUCKETS, step=1):
+        # step > 1: hanya setiap partikel ke-step yang digambar (tingkat kualitas rendah)
+        n = self.count
+        if n == 0:
+            return
+        step = self.draw_step(step)
+        # Kelompokkan partikel per tingkat alpha agar cukup satu fill per kelompok
+        levels = np.minimum((self.alphas()[::step] * buckets).astype(np.int32), buckets - 1)
+        if len(levels) >= PARTICLE_SPLAT_MIN:
+            self._draw_splat(ctx, levels, self.x[:n:step], self.y[:n:step], self.radius[:n:step], buckets)
+            return
+        order = np.argsort(levels, kind="stable")
+        sorted_levels = levels[order]
+        bounds = np.searchsorted(sorted_levels, np.arange(buckets + 1))
+        xs = self.x[:n:step][order].tolist()
+        ys = self.y[:n:step][order].tolist()
+        rs = self.radius[:n:step][order].tolist()
+        two_pi = 2 * math.pi
         ctx.save()
-        # Gambar particle dengan alpha yang fade out
-        alpha = self.get_alpha()
-        ctx.set_source_rgba(
-            PARTICLE_COLOR[0] / 255.0,
-            PARTICLE_COLOR[1] / 255.0,
-            PARTICLE_COLOR[2] / 255.0,
-            alpha
-        )
-        ctx.arc(self.x, self.y, self.radius, 0, 2 * math.pi)
-        ctx.fill()
+        for level in range(buckets):
+            lo, hi = int(bounds[level]), int(bounds[level + 1])
+            if lo == hi:
+                continue
+            ctx.set_source_rgba(
+                PARTICLE_COLOR[0] / 255.0,
+                PARTICLE_COLOR[1] / 255.0,
+                PARTICLE_COLOR[2] / 255.0,
+                (level + 1) / float(buckets)
+            )
+            for i in range(lo, hi):
+                ctx.new_sub_path()
+                ctx.arc(xs[i], ys[i], rs[i], 0, two_pi)
+            ctx.fill()
+        ctx.restore()
+
+    def _draw_splat(self, ctx, levels, xs, ys, radius, buckets):
+        # Banyak partikel: cakram di-stamp dengan NumPy ke satu gambar lalu satu paint Cairo.
+        # Semua partikel berwarna sama, jadi hasil komposit "over" tidak bergantung urutan:
+        # alpha = 1 - prod(1 - a_i * coverage), dijumlahkan sebagai log lewat satu np.bincount.
+        # Posisi dibulatkan ke piksel (sama seperti sprite partikel di backend pygame).
+        import cairo
+        pad = SPLAT_HALF
+        px = np.rint(xs).astype(np.int32)
+        py = np.rint(ys).astype(np.int32)
+        visible = (px > -pad) & (px < SCREEN_WIDTH + pad) & (py > -pad) & (py < SCREEN_HEIGHT + pad)
+        if not visible.all():
+            px, py, levels, radius = px[visible], py[visible], levels[visible], radius[visible]
+            if len(px) == 0:
+                return
+        x0 = int(px.min()) - pad
+        y0 = int(py.min()) - pad
+        width = int(px.max()) + pad - x0
+        height = int(py.max()) + pad - y0
+        steps = np.clip(
+            np.rint((radius - PARTICLE_MIN_RADIUS) * 2), 0, PARTICLE_RADIUS_STEPS - 1
+        ).astype(np.int32)
+        base = (py - y0) * width + (px - x0)
+        level_alpha = (np.arange(buckets, dtype=np.float32) + 1) / buckets
+        indices = []
+        weights = []
+        for radius_step, (dy, dx, coverage) in enumerate(SPLAT_STAMPS):
+            chosen = steps == radius_step
+            if not chosen.any():
+                continue
+            log_keep = np.log1p(-np.minimum(level_alpha[:, None] * coverage, 0.999))
+            indices.append((base[chosen, None] + (dy * width + dx)).ravel())
+            weights.append(log_keep[levels[chosen]].ravel())
+        keep = np.exp(np.bincount(np.concatenate(indices), np.concatenate(weights), minlength=width * height))
+        alpha = np.rint(255.0 - 255.0 * keep).astype(np.uint8).reshape(height, width)
+        image = SPLAT_PIXELS[alpha]
+        surface = cairo.ImageSurface.create_for_data(image, cairo.FORMAT_ARGB32, width, height, width * 4)
+        ctx.save()
+        ctx.set_source_surface(surface, x0, y0)
+        ctx.paint()
         ctx.restore()
+        surface.finish()
@@ -0,0 +1,53 @@
+import queue
+import threading
+
+
+class RenderPipeline:
+    # Render thread yang merasterisasi snapshot frame N ke back buffer selagi main thread
+    # mensimulasikan frame N+1. Antrian berukuran 1 menjaga latensi maksimal satu frame.
+    # Cairo melepas GIL saat fill/stroke/paint, sehingga kedua thread benar-benar paralel.
+    def __init__(self, framebuffers, overlay=None):
+        if framebuffers.count != 2:
+            raise ValueError("RenderPipeline needs a double-buffered FrameBufferChain")
+        self.framebuffers = framebuffers
+        self.overlay = overlay
+        self.jobs = queue.Queue(maxsize=1)
+        self.results = queue.Queue(maxsize=1)
+        self.in_flight = False
+        self.thread = threading.Thread(target=self._run, name="render", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            snapshot, mouse_x, mouse_y, alpha = job
+            try:
+                ctx = self.framebuffers.begin_frame()
+                snapshot.draw(ctx, mouse_x, mouse_y, alpha)
+                if self.overlay is not None:
+                    self.overlay(ctx, snapshot._text_overlays)
+                surface = self.framebuffers.end_frame()
+                self.results.put((surface, snapshot._text_overlays, snapshot._button_texts))
+            except BaseException as exc:
+                self.results.put(exc)
+
+    def exchange(self, snapshot, mouse_x, mouse_y, alpha):
+        # Ambil frame yang sudah selesai (atau None di frame pertama), lalu kirim snapshot baru
+        frame = None
+        if self.in_flight:
+            frame = self.results.get()
+            self.in_flight = False
+            if isinstance(frame, BaseException):
+                raise frame
+        self.jobs.put((snapshot, mouse_x, mouse_y, alpha))
+        self.in_flight = True
+        return frame
+
+    def close(self):
+        if self.in_flight:
+            self.results.get()
+            self.in_flight = False
+        self.jobs.put(None)
+        self.thread.join()
@@ -0,0 +1,166 @@
+import argparse
+import time
+import cairo
+import numpy as np
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, SIM_TICK_RATE, PIXEL_OBS_WIDTH, PIXEL_OBS_HEIGHT
+from game import Game, INPUT_START
+
+# Bobot luma ITU-R BT.601 dalam fixed point /256 (R, G, B)
+LUMA_WEIGHTS = (77, 150, 29)
+
+
+def surface_array(surface):
+    # View NumPy (H, W, 4) uint8 ke memori ImageSurface ARGB32, tanpa salinan.
+    # Urutan byte di little-endian adalah B, G, R, A (premultiplied).
+    surface.flush()
+    height = surface.get_height()
+    data = np.frombuffer(surface.get_data(), dtype=np.uint8)
+    return data.reshape(height, surface.get_stride() // 4, 4)[:, :surface.get_width()]
+
+
+def rgb_view(bgra):
+    # View RGB dari array BGRA (masih tanpa salinan, hanya stride negatif di sumbu kanal)
+    return bgra[..., 2::-1]
+
+
+class PixelStack:
+    # Array (N, H, W, 4) uint8 yang dialokasikan sekali; tiap slot adalah ImageSurface Cairo
+    # (create_for_data) yang menunjuk langsung ke memori slot itu, jadi Game.draw
+    # menulis langsung ke array tanpa salinan ataupun pygame.
+    def __init__(self, count, width=PIXEL_OBS_WIDTH, height=PIXEL_OBS_HEIGHT):
+        stride = cairo.ImageSurface.format_stride_for_width(cairo.FORMAT_ARGB32, width)
+        if stride != width * 4:
+            raise ValueError("unexpected ARGB32 stride %d for width %d" % (stride, width))
+        self.width = width
+        self.height = height
+        self.frames = np.zeros((count, height, width, 4), dtype=np.uint8)
+        self.surfaces = []
+        self.contexts = []
+        for i in range(count):
+            surface = cairo.ImageSurface.create_for_data(
+                self.frames[i], cairo.FORMAT_ARGB32, width, height, stride
+            )
+            self.surfaces.append(surface)
+            self.contexts.append(cairo.Context(surface))
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def render(self, games, alpha=1.0):
+        # Dunia digambar pada resolusi slot dengan ctx.scale, bukan di-downscale setelahnya
+        scale_x = self.width / SCREEN_WIDTH
+        scale_y = self.height / SCREEN_HEIGHT
+        for game, surface, ctx in zip(games, self.surfaces, self.contexts):
+            ctx.save()
+            ctx.scale(scale_x, scale_y)
+            game.draw(ctx, alpha=alpha)
+            ctx.restore()
+            surface.flush()
+        return self.frames
+
+
+def to_grayscale(bgra, out=None, scratch=None):
+    # Luma integer: (77 R + 150 G + 29 B) >> 8, dengan akumulator uint16 yang bisa dipakai ulang
+    shape = bgra.shape[:-1]
+    if out is None:
+        out = np.empty(shape, dtype=np.uint8)
+    if scratch is None:
+        scratch = np.empty((2,) + shape, dtype=np.uint16)
+    acc, term = scratch
+    red, green, blue = LUMA_WEIGHTS
+    np.multiply(bgra[..., 2], red, out=acc, dtype=np.uint16)
+    np.multiply(bgra[..., 1], green, out=term, dtype=np.uint16)
+    acc += term
+    np.multiply(bgra[..., 0], blue, out=term, dtype=np.uint16)
+    acc += term
+    np.right_shift(acc, 8, out=acc)
+    np.copyto(out, acc, casting="unsafe")
+    return out
+
+
+class PixelObservations:
+    # Observasi piksel untuk banyak Game headless sekaligus. Setiap step mensimulasikan
+    # `frame_skip` tick per game; dengan max_pool, dua frame terakhir digambar ke dua stack
+    # terpisah lalu diambil maksimum per piksel (objek yang berkedip/bergerak tidak hilang).
+    # Cache background dan atlas dipakai bersama oleh semua game.
+    def __init__(self, games, width=PIXEL_OBS_WIDTH, height=PIXEL_OBS_HEIGHT, grayscale=False,
+                 frame_skip=1, max_pool=False, dt=1.0 / SIM_TICK_RATE):
+        if frame_skip < 1:
+            raise ValueError("frame_skip must be >= 1")
+        self.games = list(games)
+        self.frame_skip = frame_skip
+        self.max_pool = max_pool and frame_skip > 1
+        self.dt = dt
+        count = len(self.games)
+        self.current = PixelStack(count, width, height)
+        self.previous = PixelStack(count, width, height) if self.max_pool else None
+        self.pooled = np.empty_like(self.current.frames) if self.max_pool else None
+        self.grayscale = grayscale
+        if grayscale:
+            self.gray = np.empty((count, height, width), dtype=np.uint8)
+            self.scratch = np.empty((2, count, height, width), dtype=np.uint16)
+        shared = self.games[0]
+        shared.ensure_render_caches()
+        for game in self.games[1:]:
+            game.background = shared.background
+            game.pollution_atlas = shared.pollution_atlas
+
+    def observe(self):
+        frames = self.current.render(self.games)
+        return self._output(frames)
+
+    def step(self, inputs=None):
+        # inputs: None, atau satu kode input (atau None) per game, diterapkan di tick pertama
+        if inputs is not None:
+            for game, code in zip(self.games, inputs):
+                if code is not None:
+                    game.apply_input(code)
+        for tick in range(self.frame_skip):
+            for game in self.games:
+                game.update(self.dt)
+            if self.max_pool and tick == self.frame_skip - 2:
+                self.previous.render(self.games)
+        frames = self.current.render(self.games)
+        if self.max_pool:
+            frames = np.maximum(frames, self.previous.frames, out=self.pooled)
+        return self._output(frames)
+
+    def _output(self, frames):
+        if self.grayscale:
+            return to_grayscale(frames, self.gray, self.scratch)
+        return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure batched headless pixel-observation throughput.")
+    parser.add_argument("--games", type=int, default=64)
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--width", type=int, default=PIXEL_OBS_WIDTH)
+    parser.add_argument("--height", type=int, default=PIXEL_OBS_HEIGHT)
+    parser.add_argument("--grayscale", action="store_true")
+    parser.add_argument("--frame-skip", type=int, default=4)
+    parser.add_argument("--max-pool", action="store_true")
+    args = parser.parse_args()
+
+    games = []
+    for seed in range(args.games):
+        game = Game(seed=seed)
+        game.apply_input(INPUT_START)
+        games.append(game)
+    observations = PixelObservations(
+        games, args.width, args.height, args.grayscale, args.frame_skip, args.max_pool
+    )
+    observations.observe()
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        frames = observations.step()
+    wall = time.perf_counter() - start
+    rendered = args.games * args.steps * (2 if observations.max_pool else 1)
+    print("%d games x %d steps, obs %s %s: %.0f observations/s (%.0f rendered frames/s)" % (
+        args.games, args.steps, frames.shape, frames.dtype,
+        args.games * args.steps / wall, rendered / wall
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,4 @@
 import math
-import cairo
 from constants import (
     GROUND_Y, BLOCK_SIZE, DAMAGE_COOLDOWN, PARTICLE_DAMAGE,
     PLAYER_WIDTH, PLAYER_HEIGHT, PLAYER_DUCK_HEIGHT,
@@ -7,12 +6,17 @@ from constants import (
     PLAYER_COLOR, MASK_HEALTH_RESTORE, MASK_PROTECTION_DURATION,
     PLAYER_SKIN_COLOR, PLAYER_HEADBAND_COLOR
 )
+from quality import ULTRA, HIGH, MINIMAL
+from shape_cache import SHAPES, draw_shape, rgb
 
 class Player:
     def __init__(self, x, y):
         # Inisialisasi atribut player (posisi, ukuran, physics, animasi, health)
         self.x = x
         self.y = y
+        # Posisi pada tick sebelumnya, untuk interpolasi saat render
+        self.prev_x = x
+        self.prev_y = y
         self.width = PLAYER_WIDTH
         self.original_height = PLAYER_HEIGHT
         self.height = PLAYER_HEIGHT
@@ -35,6 +39,8 @@ class Player:
         self.is_protected = False
 
     def update(self, dt):
+        self.prev_x = self.x
+        self.prev_y = self.y
         # Update posisi player berdasarkan gravitasi
         self.velocity_y += self.gravity * dt
         self.y += self.velocity_y * dt
@@ -76,6 +82,7 @@ class Player:
             self.is_ducking = True
             self.height = PLAYER_DUCK_HEIGHT
             self.y = GROUND_Y - self.height
+            self.prev_y = self.y
 
     def unduck(self):
         # Kembalikan tinggi saat berhenti jongkok
@@ -83,6 +90,7 @@ class Player:
             self.is_ducking = False
             self.height = self.original_height
             self.y = GROUND_Y - self.height
+            self.prev_y = self.y
 
     def take_damage(self, amount):
         # Ambil damage jika tidak terlindungi dan cooldown habis
@@ -130,33 +138,47 @@ class Player:
             self.velocity_y = -self.jump_strength
             self.on_ground = False
 
-    def draw(self, ctx):
+    def render_position(self, alpha=1.0):
+        # Interpolasi antara tick sebelumnya dan tick terakhir
+        return (
+            self.prev_x + (self.x - self.prev_x) * alpha,
+            self.prev_y + (self.y - self.prev_y) * alpha
+        )
+
+    def bounds(self, alpha=1.0):
+        # Kotak yang mencakup ekor ikat kepala, kaki, animasi bob dan glow proteksi
+        render_x, render_y = self.render_position(alpha)
+        return (render_x - 32, render_y - 16, self.width + 56, self.height + 30)
+
+    def draw(self, ctx, alpha=1.0, quality=ULTRA):
         # Menggambar player: tubuh, kepala, animasi, efek proteksi
         ctx.save()
-        draw_x = self.x + self.animation_offset
-        draw_y = self.y - self.animation_vertical_offset
+        render_x, render_y = self.render_position(alpha)
+        draw_x = render_x + self.animation_offset
+        draw_y = render_y - self.animation_vertical_offset
         
         # Ekor ikat kepala
-        ctx.set_source_rgb(
-            PLAYER_HEADBAND_COLOR[0] / 255.0,
-            PLAYER_HEADBAND_COLOR[1] / 255.0,
-            PLAYER_HEADBAND_COLOR[2] / 255.0
-        )
-        ctx.set_line_width(4)
-        
-        headband_base_y = draw_y + (15 if not self.is_ducking else 10)
-        tail_y_offset = math.sin(self.animation_time * 1.5) * 5
-        
-        ctx.move_to(draw_x + 5, headband_base_y)
-        ctx.curve_to(
-            draw_x - 10, headband_base_y, 
-            draw_x - 15, headband_base_y - 5 + tail_y_offset, 
-            draw_x - 25, headband_base_y + 5 + tail_y_offset
-        )
-        ctx.stroke()
+        if quality >= HIGH:
+            ctx.set_source_rgb(
+                PLAYER_HEADBAND_COLOR[0] / 255.0,
+                PLAYER_HEADBAND_COLOR[1] / 255.0,
+                PLAYER_HEADBAND_COLOR[2] / 255.0
+            )
+            ctx.set_line_width(4)
+            
+            headband_base_y = draw_y + (15 if not self.is_ducking else 10)
+            tail_y_offset = math.sin(self.animation_time * 1.5) * 5
+            
+            ctx.move_to(draw_x + 5, headband_base_y)
+            ctx.curve_to(
+                draw_x - 10, headband_base_y, 
+                draw_x - 15, headband_base_y - 5 + tail_y_offset, 
+                draw_x - 25, headband_base_y + 5 + tail_y_offset
+            )
+            ctx.stroke()
 
         # Kaki
-        if self.on_ground:
+        if self.on_ground and quality > MINIMAL:
             ctx.set_source_rgb(0.2, 0.2, 0.2)
             leg_height = 18 if not self.is_ducking else 12
             leg_width = 8
@@ -170,7 +192,7 @@ class Player:
             right_leg_offset = math.sin(self.leg_animation_phase + math.pi) * 6
 
             ctx.set_line_width(leg_width)
-            ctx.set_line_cap(cairo.LINE_CAP_ROUND)
+            ctx.set_line_cap(1) # Round
             
             ctx.move_to(left_leg_x, left_leg_y)
             ctx.line_to(left_leg_x - left_leg_offset, left_leg_y + leg_height)
@@ -180,56 +202,13 @@ class Player:
             ctx.line_to(right_leg_x - right_leg_offset, right_leg_y + leg_height)
             ctx.stroke()
 
-        # Badan (rounded rectangle)
-        ctx.set_source_rgb(
-            PLAYER_COLOR[0] / 255.0,
-            PLAYER_COLOR[1] / 255.0,
-            PLAYER_COLOR[2] / 255.0
-        )
-        radius = 10
-        ctx.new_sub_path()
-        body_top_offset = 15 if not self.is_ducking else 5
-        
-        ctx.arc(draw_x + radius, draw_y + radius + body_top_offset, radius, math.pi, 1.5 * math.pi)
-        ctx.arc(draw_x + self.width - radius, draw_y + radius + body_top_offset, radius, 1.5 * math.pi, 0)
-        ctx.arc(draw_x + self.width - radius, draw_y + self.height - radius, radius, 0, 0.5 * math.pi)
-        ctx.arc(draw_x + radius, draw_y + self.height - radius, radius, 0.5 * math.pi, math.pi)
-        ctx.close_path()
-        ctx.fill()
+        # Badan, kepala, ikat kepala depan dan mata: path statis per state, diputar ulang dari cache
+        draw_shape(ctx, SHAPES.get(
+            ("player", self.width, self.height, self.is_ducking, quality > MINIMAL), Player.build_body
+        ), draw_x, draw_y)
 
-        # Kepala
-        ctx.set_source_rgb(
-            PLAYER_SKIN_COLOR[0] / 255.0,
-            PLAYER_SKIN_COLOR[1] / 255.0,
-            PLAYER_SKIN_COLOR[2] / 255.0
-        )
-        head_radius = 14
-        center_head_x = draw_x + self.width / 2
-        center_head_y = draw_y + (12 if not self.is_ducking else 8)
-        
-        ctx.arc(center_head_x, center_head_y, head_radius, 0, 2 * math.pi)
-        ctx.fill()
-        
-        # Ikat kepala depan
-        ctx.set_source_rgb(
-            PLAYER_HEADBAND_COLOR[0] / 255.0,
-            PLAYER_HEADBAND_COLOR[1] / 255.0,
-            PLAYER_HEADBAND_COLOR[2] / 255.0
-        )
-        ctx.set_line_width(4)
-        ctx.move_to(center_head_x - head_radius + 1, center_head_y - 5)
-        ctx.line_to(center_head_x + head_radius - 1, center_head_y - 5)
-        ctx.stroke()
-
-        # Mata
-        ctx.set_source_rgb(1, 1, 1)
-        ctx.arc(center_head_x + 6, center_head_y, 4, 0, 2 * math.pi)
-        ctx.fill()
-        ctx.set_source_rgb(0, 0, 0)
-        ctx.arc(center_head_x + 7, center_head_y, 1.5, 0, 2 * math.pi)
-        ctx.fill()
-
-        # Efek proteksi (glow)
+        # Efek proteksi (glow). Di bawah ultra hanya garis ring (lebih murah dari isi lingkaran),
+        # tetap digambar di semua tingkat karena menandai state permainan
         if self.is_protected:
             from constants import PROTECTION_COLOR
             ctx.save()
@@ -241,7 +220,8 @@ class Player:
             )
             glow_radius = max(self.width, self.height) / 2 + 10
             ctx.arc(draw_x + self.width/2, draw_y + self.height/2, glow_radius, 0, 2 * math.pi)
-            ctx.fill()
+            if quality == ULTRA:
+                ctx.fill()
             ctx.set_line_width(2)
             ctx.set_source_rgba(
                 PROTECTION_COLOR[0] / 255.0,
@@ -254,6 +234,43 @@ class Player:
             
         ctx.restore()
 
+    @staticmethod
+    def build_body(recorder, key):
+        # Dipanggil sekali per state (berdiri/jongkok, dengan/tanpa mata), relatif terhadap (draw_x, draw_y)
+        _, width, height, is_ducking, eyes = key
+        ctx = recorder.ctx
+        # Badan (rounded rectangle)
+        radius = 10
+        ctx.new_sub_path()
+        body_top_offset = 15 if not is_ducking else 5
+        
+        ctx.arc(radius, radius + body_top_offset, radius, math.pi, 1.5 * math.pi)
+        ctx.arc(width - radius, radius + body_top_offset, radius, 1.5 * math.pi, 0)
+        ctx.arc(width - radius, height - radius, radius, 0, 0.5 * math.pi)
+        ctx.arc(radius, height - radius, radius, 0.5 * math.pi, math.pi)
+        ctx.close_path()
+        recorder.fill(rgb(PLAYER_COLOR))
+
+        # Kepala
+        head_radius = 14
+        center_head_x = width / 2
+        center_head_y = 12 if not is_ducking else 8
+        
+        ctx.arc(center_head_x, center_head_y, head_radius, 0, 2 * math.pi)
+        recorder.fill(rgb(PLAYER_SKIN_COLOR))
+        
+        # Ikat kepala depan
+        ctx.move_to(center_head_x - head_radius + 1, center_head_y - 5)
+        ctx.line_to(center_head_x + head_radius - 1, center_head_y - 5)
+        recorder.stroke(rgb(PLAYER_HEADBAND_COLOR), 4)
+
+        # Mata (tidak ada di tingkat minimal)
+        if eyes:
+            ctx.arc(center_head_x + 6, center_head_y, 4, 0, 2 * math.pi)
+            recorder.fill((1, 1, 1, 1.0))
+            ctx.arc(center_head_x + 7, center_head_y, 1.5, 0, 2 * math.pi)
+            recorder.fill((0, 0, 0, 1.0))
+
     def get_spawn_area(self):
         # Area spawn objek di sekitar player
         spawn_width = BLOCK_SIZE
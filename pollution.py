@@ -3,50 +3,160 @@ from constants import (
     POLLUTION_MIN_RADIUS, POLLUTION_MAX_RADIUS,
     POLLUTION_MIN_SPEED, POLLUTION_MAX_SPEED,
     POLLUTION_MIN_ALPHA, POLLUTION_MAX_ALPHA,
-    POLLUTION_SPAWN_MIN_Y, POLLUTION_SPAWN_MID_Y, POLLUTION_SPAWN_MAX_Y
+    POLLUTION_SPAWN_MIN_Y, POLLUTION_SPAWN_MID_Y, POLLUTION_SPAWN_MAX_Y,
+    POLLUTION_LAYOUT_VARIANTS, POLLUTION_MAX_PUFFS
 )
 import random
 import math
+import numpy as np
+from particle import SmokeEmitter
+from quality import ULTRA, LOW, MINIMAL
+
+TWO_PI = 2 * math.pi
+
+
+class PuffLayout:
+    # Bentuk awan satu layout_seed, relatif terhadap radius (dist/size dikali radius saat digambar).
+    # Vektor arah tiap gumpalan dihitung sekali di sini, bukan cos/sin per gumpalan per frame.
+    __slots__ = ("count", "unit_x", "unit_y", "dist", "size", "offset_speed")
+
+    def __init__(self, layout_seed):
+        # Membuat bentuk awan acak (deterministik per seed)
+        layout = random.Random(layout_seed)
+        count = layout.randint(5, 7)
+        dist, size, offset_speed = [], [], []
+        for i in range(count):
+            # Acak jarak dan ukuran setiap gumpalan agar terlihat alami
+            dist.append(layout.uniform(0.4, 0.7))
+            size.append(layout.uniform(0.5, 0.8))
+            offset_speed.append(layout.uniform(2, 4)) # Kecepatan goyang tiap gumpalan
+        angles = [(i / count) * TWO_PI for i in range(count)]
+        self.count = count
+        self.unit_x = tuple(math.cos(angle) for angle in angles)
+        self.unit_y = tuple(math.sin(angle) for angle in angles)
+        self.dist = tuple(dist)
+        self.size = tuple(size)
+        self.offset_speed = tuple(offset_speed)
+
+
+# Semua layout dibuat sekali dan dipakai bersama; layout_seed adalah indeks 0..POLLUTION_LAYOUT_VARIANTS-1
+LAYOUTS = tuple(PuffLayout(seed) for seed in range(POLLUTION_LAYOUT_VARIANTS))
+
+
+def _offset_speed_table():
+    # Kecepatan goyang per layout sebagai tabel (layout, gumpalan) untuk breathing tervektorisasi;
+    # slot kosong bernilai 0 (sin(0) = 0)
+    table = np.zeros((len(LAYOUTS), POLLUTION_MAX_PUFFS))
+    for seed, layout in enumerate(LAYOUTS):
+        table[seed, :layout.count] = layout.offset_speed
+    return table
+
+
+OFFSET_SPEEDS = _offset_speed_table()
+
+
+def breathing_offsets(clouds):
+    # Offset "breathing" semua gumpalan semua awan dalam satu evaluasi NumPy:
+    # baris i = sin(anim_timer * offset_speed) * 2 untuk awan ke-i
+    count = len(clouds)
+    timers = np.fromiter([pollution.anim_timer for pollution in clouds], dtype=np.float64, count=count)
+    seeds = np.fromiter([pollution.layout_seed for pollution in clouds], dtype=np.intp, count=count)
+    moves = OFFSET_SPEEDS[seeds]
+    moves *= timers[:, None]
+    np.sin(moves, out=moves)
+    moves *= 2
+    return moves.tolist()
+
+
+def draw_clouds(ctx, clouds, alpha=1.0, quality=ULTRA):
+    if quality == MINIMAL or not clouds:
+        for pollution in clouds:
+            pollution.draw(ctx, alpha, quality)
+        return
+    for pollution, moves in zip(clouds, breathing_offsets(clouds)):
+        pollution.draw(ctx, alpha, quality, moves)
+
 
 class Pollution:
-    def __init__(self, x, y, radius, speed, alpha):
+    OFF_SCREEN_MARGIN = 30
+    # Tanpa __dict__: satu awan hanya menyimpan field di bawah; bentuknya dibagi lewat LAYOUTS
+    __slots__ = ("x", "y", "prev_x", "radius", "speed", "alpha", "anim_timer", "layout_seed", "emitter")
+
+    def __init__(self, x, y, radius, speed, alpha, layout_seed=None, rng=random, anim_timer=None):
+        self.emitter = SmokeEmitter()
+        self.reset(x, y, radius, speed, alpha, layout_seed, rng, anim_timer)
+
+    def reset(self, x, y, radius, speed, alpha, layout_seed=None, rng=random, anim_timer=None):
         self.x = x
         self.y = y
+        self.prev_x = x
         self.radius = radius
         self.speed = speed
         self.alpha = alpha
         
         # Animasi
-        self.anim_timer = random.uniform(0, 10.0)
+        if anim_timer is None:
+            anim_timer = rng.uniform(0, 10.0)
+        self.anim_timer = anim_timer
         
-        # Membuat bentuk awan acak
-        self.num_puffs = random.randint(5, 7)
-        self.puffs = []
-        for i in range(self.num_puffs):
-            angle = (i / self.num_puffs) * 2 * math.pi
-            # Acak jarak dan ukuran setiap gumpalan agar terlihat alami
-            dist = random.uniform(0.4, 0.7) * self.radius
-            size = random.uniform(0.5, 0.8) * self.radius
-            self.puffs.append({
-                'angle': angle,
-                'dist': dist,
-                'size': size,
-                'offset_speed': random.uniform(2, 4) # Kecepatan goyang tiap gumpalan
-            })
+        # Bentuk awan ditentukan oleh layout_seed agar bisa dipakai ulang oleh atlas sprite
+        if layout_seed is None:
+            layout_seed = rng.randrange(POLLUTION_LAYOUT_VARIANTS)
+        self.layout_seed = layout_seed
+        self.emitter.accumulator = 0.0
+
+    def snapshot(self):
+        # Salinan untuk render thread (semua field immutable; layout dibagi bersama)
+        snap = Pollution.__new__(Pollution)
+        for name in Pollution.__slots__:
+            setattr(snap, name, getattr(self, name))
+        return snap
 
     def update(self, dt):
+        self.prev_x = self.x
         self.x -= self.speed * dt
         self.anim_timer += dt
 
+    def smoke_origin(self):
+        # Asap keluar dari sisi belakang awan (awan bergerak ke kiri)
+        return self.x + self.radius * 0.8, self.y
+
     def is_off_screen(self):
-        return self.x + self.radius + 30 < 0
+        return self.x + self.radius + self.OFF_SCREEN_MARGIN < 0
 
-    def draw(self, ctx):
-        ctx.save()
-        ctx.translate(self.x, self.y)
-        
+    def hover_rotation(self):
         # Rotasi sedikit kiri-kanan agar terlihat melayang
-        hover_rot = math.sin(self.anim_timer * 2) * 0.1
+        return math.sin(self.anim_timer * 2) * 0.1
+
+    def is_blinking(self):
+        # Kedip (Blinking) setiap beberapa detik
+        return math.sin(self.anim_timer * 3) > 0.95
+
+    def render_x(self, alpha=1.0):
+        return self.prev_x + (self.x - self.prev_x) * alpha
+
+    def bounds(self, alpha=1.0):
+        # Gumpalan terjauh: dist (<= 0.7r) + breathing (<= 2) + size (<= 0.8r)
+        half = 1.5 * self.radius + 4
+        return (self.render_x(alpha) - half, self.y - half, half * 2, half * 2)
+
+    def draw(self, ctx, alpha=1.0, quality=ULTRA, moves=None):
+        # moves: offset breathing per gumpalan (lihat breathing_offsets); dihitung di sini bila tidak diberikan
+        layout = LAYOUTS[self.layout_seed]
+        if moves is None and quality > MINIMAL:
+            # Gumpalan bergerak sedikit (breathing effect)
+            anim_timer = self.anim_timer
+            moves = [math.sin(anim_timer * speed) * 2 for speed in layout.offset_speed]
+        ctx.save()
+        ctx.translate(self.render_x(alpha), self.y)
+        Pollution.draw_shape(
+            ctx, self.radius, self.alpha, layout,
+            self.hover_rotation(), self.is_blinking(), moves, quality
+        )
+        ctx.restore()
+
+    @staticmethod
+    def draw_shape(ctx, radius, alpha, layout, hover_rot, is_blinking, moves, quality=ULTRA):
         ctx.rotate(hover_rot)
         
         # Warna Dasar Asap
@@ -54,22 +164,33 @@ class Pollution:
             POLLUTION_COLOR[0] / 255.0,
             POLLUTION_COLOR[1] / 255.0,
             POLLUTION_COLOR[2] / 255.0,
-            self.alpha
+            alpha
         )
         
+        if quality == MINIMAL:
+            # Siluet: satu lingkaran seluas awan
+            ctx.arc(0, 0, radius * 1.2, 0, TWO_PI)
+            ctx.fill()
+            return
+
+        unit_x, unit_y, dists, sizes = layout.unit_x, layout.unit_y, layout.dist, layout.size
+
         # 1. Gambar Inti Awan
-        ctx.arc(0, 0, self.radius * 0.7, 0, 2 * math.pi)
+        ctx.arc(0, 0, radius * 0.7, 0, TWO_PI)
+        if quality == LOW:
+            # Inti dan gumpalan jadi satu path, satu fill
+            for i in range(layout.count):
+                dist = dists[i] * radius + moves[i]
+                ctx.new_sub_path()
+                ctx.arc(unit_x[i] * dist, unit_y[i] * dist, sizes[i] * radius, 0, TWO_PI)
+            ctx.fill()
+            return
         ctx.fill()
         
         # 2. Gambar Gumpalan-gumpalan (Puffs) di sekeliling
-        for puff in self.puffs:
-            # Gumpalan bergerak sedikit (breathing effect)
-            move = math.sin(self.anim_timer * puff['offset_speed']) * 2
-            
-            px = math.cos(puff['angle']) * (puff['dist'] + move)
-            py = math.sin(puff['angle']) * (puff['dist'] + move)
-            
-            ctx.arc(px, py, puff['size'], 0, 2 * math.pi)
+        for i in range(layout.count):
+            dist = dists[i] * radius + moves[i]
+            ctx.arc(unit_x[i] * dist, unit_y[i] * dist, sizes[i] * radius, 0, TWO_PI)
             ctx.fill()
             
         # 3. Wajah Lucu (Cute Face)
@@ -77,14 +198,11 @@ class Pollution:
         ctx.set_source_rgba(1, 1, 1, 0.9)
         
         # Mata Kiri & Kanan
-        eye_y = -self.radius * 0.1
-        eye_x_offset = self.radius * 0.25
-        eye_size = self.radius * 0.15
-        
-        # Kedip (Blinking) setiap beberapa detik
-        is_blinking = math.sin(self.anim_timer * 3) > 0.95
+        eye_y = -radius * 0.1
+        eye_x_offset = radius * 0.25
+        eye_size = radius * 0.15
         
-        if is_blinking:
+        if is_blinking and quality == ULTRA:
             # Mata tertutup (garis)
             ctx.set_line_width(2)
             ctx.move_to(-eye_x_offset - eye_size, eye_y)
@@ -99,12 +217,13 @@ class Pollution:
             ctx.arc(eye_x_offset, eye_y, eye_size, 0, 2 * math.pi)
             ctx.fill()
             
-            # Pupil (Hitam)
-            ctx.set_source_rgba(0.2, 0.2, 0.2, 1.0)
-            ctx.arc(-eye_x_offset, eye_y, eye_size * 0.5, 0, 2 * math.pi)
-            ctx.fill()
-            ctx.arc(eye_x_offset, eye_y, eye_size * 0.5, 0, 2 * math.pi)
-            ctx.fill()
+            if quality == ULTRA:
+                # Pupil (Hitam)
+                ctx.set_source_rgba(0.2, 0.2, 0.2, 1.0)
+                ctx.arc(-eye_x_offset, eye_y, eye_size * 0.5, 0, 2 * math.pi)
+                ctx.fill()
+                ctx.arc(eye_x_offset, eye_y, eye_size * 0.5, 0, 2 * math.pi)
+                ctx.fill()
 
         # Mulut Kecil
         ctx.set_source_rgba(1, 1, 1, 0.9)
@@ -112,23 +231,36 @@ class Pollution:
         ctx.set_line_cap(1) # Round
         
         # Mulut senyum kecil atau garis 'o'
-        mouth_y = self.radius * 0.2
+        mouth_y = radius * 0.2
         ctx.new_path()
-        ctx.arc(0, mouth_y, self.radius * 0.15, 0.1 * math.pi, 0.9 * math.pi)
+        ctx.arc(0, mouth_y, radius * 0.15, 0.1 * math.pi, 0.9 * math.pi)
         ctx.stroke()
 
-        ctx.restore()
-
     @staticmethod
-    def create_random():
-        radius = random.uniform(POLLUTION_MIN_RADIUS, POLLUTION_MAX_RADIUS)
-        speed = random.uniform(POLLUTION_MIN_SPEED, POLLUTION_MAX_SPEED)
-        alpha = random.uniform(POLLUTION_MIN_ALPHA, POLLUTION_MAX_ALPHA)
+    def random_placement(rng=random):
+        # Semua nilai acak satu awan diambil sekaligus: (y, radius, speed, alpha, layout_seed, anim_timer)
+        radius = rng.uniform(POLLUTION_MIN_RADIUS, POLLUTION_MAX_RADIUS)
+        speed = rng.uniform(POLLUTION_MIN_SPEED, POLLUTION_MAX_SPEED)
+        alpha = rng.uniform(POLLUTION_MIN_ALPHA, POLLUTION_MAX_ALPHA)
         
-        if random.random() < 0.5:
-            y = random.uniform(POLLUTION_SPAWN_MID_Y, POLLUTION_SPAWN_MAX_Y)
+        if rng.random() < 0.5:
+            y = rng.uniform(POLLUTION_SPAWN_MID_Y, POLLUTION_SPAWN_MAX_Y)
         else:
-            y = random.uniform(POLLUTION_SPAWN_MIN_Y, POLLUTION_SPAWN_MID_Y)
-            
+            y = rng.uniform(POLLUTION_SPAWN_MIN_Y, POLLUTION_SPAWN_MID_Y)
+
+        anim_timer = rng.uniform(0, 10.0)
+        layout_seed = rng.randrange(POLLUTION_LAYOUT_VARIANTS)
+        return (y, radius, speed, alpha, layout_seed, anim_timer)
+
+    @staticmethod
+    def from_placement(placement, pool=None):
+        # Tanpa pemanggilan random: dipakai saat spawn dari world stream
+        y, radius, speed, alpha, layout_seed, anim_timer = placement
         x = SCREEN_WIDTH + radius + 50
-        return Pollution(x, y, radius, speed, alpha)
\ No newline at end of file
+        if pool is not None:
+            return pool.acquire(x, y, radius, speed, alpha, layout_seed, anim_timer=anim_timer)
+        return Pollution(x, y, radius, speed, alpha, layout_seed, anim_timer=anim_timer)
+
+    @staticmethod
+    def create_random(rng=random, pool=None):
+        return Pollution.from_placement(Pollution.random_placement(rng), pool)
\ No newline at end of file
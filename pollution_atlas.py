@@ -0,0 +1,106 @@
+import math
+from collections import OrderedDict
+import cairo
+from constants import POLLUTION_ATLAS_MAX_BYTES
+from pollution import Pollution, LAYOUTS
+from quality import ULTRA, MINIMAL
+
+
+class PollutionAtlas:
+    # Cache sprite awan polusi yang sudah dirender, dikuantisasi per radius, layout,
+    # alpha, rotasi, kedip, fase "breathing" dan tingkat kualitas. Dibuang secara LRU bila melewati batas memori.
+    def __init__(self, max_bytes=POLLUTION_ATLAS_MAX_BYTES, rotation_steps=7,
+                 breath_steps=4, alpha_step=0.05, convert=None):
+        self.max_bytes = max_bytes
+        self.rotation_steps = rotation_steps
+        self.breath_steps = breath_steps
+        self.alpha_step = alpha_step
+        # Hook opsional untuk mengubah surface Cairo ke format lain (mis. surface pygame)
+        self.convert = convert
+        self.entries = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key_for(self, pollution, quality=ULTRA):
+        radius_bucket = int(round(pollution.radius))
+        alpha_bucket = int(round(pollution.alpha / self.alpha_step))
+        if quality == MINIMAL:
+            # Siluet lingkaran: rotasi, kedip dan breathing tidak terlihat, cukup satu sprite
+            return (radius_bucket, 0, alpha_bucket, 0, False, 0, quality)
+        # hover_rotation berada di rentang [-0.1, 0.1]
+        rot = pollution.hover_rotation()
+        rot_bucket = int(round((rot + 0.1) / 0.2 * (self.rotation_steps - 1)))
+        # Dalam mode atlas semua gumpalan "bernapas" dengan fase yang sama
+        phase = (pollution.anim_timer * 3) % (2 * math.pi)
+        breath_bucket = int(phase / (2 * math.pi) * self.breath_steps) % self.breath_steps
+        # Kedip hanya digambar di tingkat ultra
+        blinking = quality == ULTRA and pollution.is_blinking()
+        return (radius_bucket, pollution.layout_seed, alpha_bucket, rot_bucket,
+                blinking, breath_bucket, quality)
+
+    def _render(self, key):
+        radius_bucket, layout_seed, alpha_bucket, rot_bucket, blinking, breath_bucket, quality = key
+        radius = float(radius_bucket)
+        alpha = alpha_bucket * self.alpha_step
+        rot = rot_bucket / float(self.rotation_steps - 1) * 0.2 - 0.1
+        move = math.sin((breath_bucket + 0.5) / self.breath_steps * 2 * math.pi) * 2
+        layout = LAYOUTS[layout_seed]
+
+        # Gumpalan terjauh: dist (<= 0.7r) + move (<= 2) + size (<= 0.8r)
+        half = int(math.ceil(1.5 * radius + 2)) + 2
+        size = half * 2
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, size, size)
+        ctx = cairo.Context(surface)
+        ctx.translate(half, half)
+        Pollution.draw_shape(
+            ctx, radius, alpha, layout, rot, blinking, [move] * layout.count, quality
+        )
+        surface.flush()
+        nbytes = surface.get_stride() * size
+        sprite = surface if self.convert is None else self.convert(surface)
+        return sprite, half, nbytes
+
+    def lookup(self, pollution, quality=ULTRA):
+        key = self.key_for(pollution, quality)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry
+        self.misses += 1
+        entry = self._render(key)
+        self.entries[key] = entry
+        self.bytes_used += entry[2]
+        while self.bytes_used > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes_used -= evicted[2]
+            self.evictions += 1
+        return entry
+
+    def sprite_position(self, pollution, half, alpha=1.0):
+        # Sprite digambar di piksel bulat agar tidak di-resample
+        return (int(round(pollution.render_x(alpha))) - half, int(round(pollution.y)) - half)
+
+    def draw(self, ctx, pollution, alpha=1.0, quality=ULTRA):
+        sprite, half, _ = self.lookup(pollution, quality)
+        x, y = self.sprite_position(pollution, half, alpha)
+        ctx.set_source_surface(sprite, x, y)
+        ctx.rectangle(x, y, half * 2, half * 2)
+        ctx.fill()
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes_used = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes_used,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
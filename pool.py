@@ -0,0 +1,50 @@
+from constants import ENTITY_POOL_SIZE
+
+
+class EntityPool:
+    # Pool objek: objek yang dilepas disimpan lalu di-reset di tempat saat dibutuhkan lagi,
+    # sehingga spawn/despawn tidak membebani GC. Kelas entity harus punya reset(...)
+    # dengan argumen yang sama seperti __init__.
+    def __init__(self, factory, size=ENTITY_POOL_SIZE):
+        self.factory = factory
+        self.size = size
+        self.free = []
+        self.allocations = 0
+        self.reuses = 0
+        self.discards = 0
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.reuses += 1
+            return obj
+        self.allocations += 1
+        return self.factory(*args, **kwargs)
+
+    def prefill(self, count, create):
+        # Isi pool di muka (mis. saat menu), tanpa melebihi kapasitas
+        while len(self.free) < min(count, self.size):
+            self.free.append(create())
+            self.allocations += 1
+
+    def release(self, obj):
+        if len(self.free) < self.size:
+            self.free.append(obj)
+        else:
+            self.discards += 1
+
+    def release_all(self, objs):
+        for obj in objs:
+            self.release(obj)
+
+    def stats(self):
+        acquired = self.allocations + self.reuses
+        return {
+            "size": self.size,
+            "free": len(self.free),
+            "allocations": self.allocations,
+            "reuses": self.reuses,
+            "discards": self.discards,
+            "reuse_rate": self.reuses / acquired if acquired else 0.0,
+        }
@@ -0,0 +1,218 @@
+import json
+import time
+from array import array
+from collections import deque
+from constants import FPS, PROFILER_CAPACITY
+
+FRAME_PHASES = (
+    "events", "simulation", "background", "entities", "hud", "convert", "text", "flip"
+)
+
+
+class _NullSection:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class NullProfiler:
+    # Profiler kosong: dipakai saat profiling mati agar kode game tidak perlu cek None
+    enabled = False
+    visible = False
+    _section = _NullSection()
+
+    def section(self, name):
+        return self._section
+
+    def draw_overlay(self, ctx, text_overlays, *args, **kwargs):
+        pass
+
+    def set_label(self, name, text):
+        pass
+
+    def instant(self, name, args=None):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class _Section:
+    def __init__(self, profiler, index):
+        self.profiler = profiler
+        self.index = index
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = self.profiler.clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler._add(self.index, self.start, self.profiler.clock() - self.start)
+        return False
+
+
+class FrameProfiler:
+    # Mencatat durasi tiap fase per frame di ring buffer (array yang dialokasikan sekali)
+    enabled = True
+
+    def __init__(self, capacity=PROFILER_CAPACITY, phases=FRAME_PHASES, clock=time.perf_counter):
+        self.capacity = capacity
+        self.clock = clock
+        self.phases = list(phases)
+        self.phase_index = {name: i for i, name in enumerate(self.phases)}
+        self.sections = [_Section(self, i) for i in range(len(self.phases))]
+        self.frame_start = array('d', bytes(8 * capacity))
+        self.frame_time = array('d', bytes(8 * capacity))
+        self.phase_start = [array('d', bytes(8 * capacity)) for _ in self.phases]
+        self.phase_time = [array('d', bytes(8 * capacity)) for _ in self.phases]
+        self.origin = clock()
+        self.index = 0
+        self.count = 0
+        # Total frame yang pernah dicatat (count berhenti di capacity)
+        self.frames = 0
+        self.visible = False
+        self._frame_open = False
+        # Baris teks tambahan di bawah grafik (mis. skala render, tingkat kualitas)
+        self.labels = {}
+        # Event sesaat (mis. transisi tingkat kualitas) untuk trace Chrome
+        self.instants = deque(maxlen=capacity)
+
+    def _phase(self, name):
+        index = self.phase_index.get(name)
+        if index is None:
+            # Fase tambahan (mis. sub-bagian opt-in di Game.update) didaftarkan saat pertama dipakai
+            index = len(self.phases)
+            self.phases.append(name)
+            self.phase_index[name] = index
+            self.sections.append(_Section(self, index))
+            self.phase_start.append(array('d', bytes(8 * self.capacity)))
+            self.phase_time.append(array('d', bytes(8 * self.capacity)))
+        return index
+
+    def section(self, name):
+        return self.sections[self._phase(name)]
+
+    def _add(self, index, start, duration):
+        slot = self.index
+        if self.phase_time[index][slot] == 0.0:
+            self.phase_start[index][slot] = start
+        self.phase_time[index][slot] += duration
+
+    def begin_frame(self):
+        slot = self.index
+        for times in self.phase_time:
+            times[slot] = 0.0
+        self.frame_start[slot] = self.clock()
+        self._frame_open = True
+
+    def end_frame(self):
+        if not self._frame_open:
+            return
+        slot = self.index
+        self.frame_time[slot] = self.clock() - self.frame_start[slot]
+        self._frame_open = False
+        self.index = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.frames += 1
+
+    @property
+    def last_frame_time(self):
+        return self.frame_time[(self.index - 1) % self.capacity] if self.count else 0.0
+
+    def _slots(self):
+        # Indeks slot dari frame terlama ke terbaru
+        start = (self.index - self.count) % self.capacity
+        return [(start + i) % self.capacity for i in range(self.count)]
+
+    def frame_times(self):
+        return [self.frame_time[slot] for slot in self._slots()]
+
+    def percentile(self, pct):
+        times = sorted(self.frame_times())
+        if not times:
+            return 0.0
+        return times[min(len(times) - 1, int(round(pct / 100.0 * (len(times) - 1))))]
+
+    def phase_means(self):
+        slots = self._slots()
+        if not slots:
+            return {}
+        return {
+            name: sum(self.phase_time[i][slot] for slot in slots) / len(slots)
+            for i, name in enumerate(self.phases)
+        }
+
+    def set_label(self, name, text):
+        self.labels[name] = text
+
+    def instant(self, name, args=None):
+        self.instants.append((name, self.clock(), args or {}))
+
+    def toggle_overlay(self):
+        self.visible = not self.visible
+
+    def draw_overlay(self, ctx, text_overlays, x=10, y=70, width=240, height=80):
+        # Grafik waktu frame (ms) + garis budget 1/FPS, teks p50/p99 lewat overlay pygame
+        if not self.visible:
+            return
+        budget = 1.0 / FPS
+        times = self.frame_times()[-width:]
+        ctx.save()
+        ctx.set_source_rgba(0, 0, 0, 0.5)
+        ctx.rectangle(x, y, width, height)
+        ctx.fill()
+        scale = height / (budget * 2)
+        for i, frame_time in enumerate(times):
+            bar = min(height, frame_time * scale)
+            if frame_time > budget:
+                ctx.set_source_rgba(0.93, 0.32, 0.33, 0.9)
+            else:
+                ctx.set_source_rgba(0.11, 0.82, 0.63, 0.9)
+            ctx.rectangle(x + width - len(times) + i, y + height - bar, 1, bar)
+            ctx.fill()
+        ctx.set_source_rgba(1, 1, 1, 0.8)
+        ctx.set_line_width(1)
+        ctx.move_to(x, y + height - budget * scale)
+        ctx.line_to(x + width, y + height - budget * scale)
+        ctx.stroke()
+        ctx.restore()
+        label = "p50 %.1f ms   p99 %.1f ms" % (self.percentile(50) * 1000, self.percentile(99) * 1000)
+        text_overlays.append((label, x + width / 2, y + height + 12, 20, (255, 255, 255), False))
+        for i, (name, text) in enumerate(self.labels.items(), 1):
+            text_overlays.append(("%s: %s" % (name, text), x + width / 2, y + height + 12 + 22 * i,
+                                  20, (255, 255, 255), False))
+
+    def export_chrome_trace(self, path, metadata=None):
+        # Format Trace Event (chrome://tracing / Perfetto): satu event "X" per fase per frame.
+        # metadata (opsional) ditulis apa adanya ke kunci "metadata" file trace
+        events = []
+        for frame_number, slot in enumerate(self._slots()):
+            events.append({
+                "name": "frame", "cat": "frame", "ph": "X", "pid": 0, "tid": 0,
+                "ts": (self.frame_start[slot] - self.origin) * 1e6,
+                "dur": self.frame_time[slot] * 1e6,
+                "args": {"frame": frame_number},
+            })
+            for i, name in enumerate(self.phases):
+                duration = self.phase_time[i][slot]
+                if duration <= 0.0:
+                    continue
+                events.append({
+                    "name": name, "cat": "phase", "ph": "X", "pid": 0, "tid": 0,
+                    "ts": (self.phase_start[i][slot] - self.origin) * 1e6,
+                    "dur": duration * 1e6,
+                })
+        for name, timestamp, args in self.instants:
+            events.append({
+                "name": name, "cat": "instant", "ph": "i", "s": "g", "pid": 0, "tid": 0,
+                "ts": (timestamp - self.origin) * 1e6, "args": args,
+            })
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if metadata:
+            trace["metadata"] = metadata
+        with open(path, "w") as f:
+            json.dump(trace, f)
+        return len(events)
@@ -0,0 +1,99 @@
+from collections import deque
+from constants import (
+    FPS, QUALITY_START_LEVEL, QUALITY_MIN_LEVEL, QUALITY_WINDOW,
+    QUALITY_DOWN_THRESHOLD, QUALITY_UP_THRESHOLD, QUALITY_UP_WINDOWS, QUALITY_MAX_TRANSITIONS
+)
+
+# Tingkat detail entity, dibaca oleh draw() tiap entity (angka lebih besar = lebih detail).
+#   ultra:   semua detail (gumpalan bernapas sendiri-sendiri, wajah + kedip, glow mask/proteksi)
+#   high:    tanpa kedip/pupil awan dan glow mask; ring proteksi tanpa isi
+#   low:     awan tanpa wajah (gumpalan satu fill), mask tanpa detail tengah,
+#            player tanpa ekor ikat kepala, setengah partikel asap
+#   minimal: siluet saja: awan satu lingkaran, mask badan saja, player tanpa kaki/mata, tanpa asap
+MINIMAL = 0
+LOW = 1
+HIGH = 2
+ULTRA = 3
+LEVEL_NAMES = ("minimal", "low", "high", "ultra")
+
+
+def level_from_name(name):
+    try:
+        return LEVEL_NAMES.index(name)
+    except ValueError:
+        raise ValueError("unknown quality level %r (expected one of %s)" % (name, ", ".join(LEVEL_NAMES)))
+
+
+class QualityGovernor:
+    # Turun satu tingkat begitu rata-rata waktu frame satu jendela melewati batas atas;
+    # naik kembali hanya setelah `up_windows` jendela berturut-turut di bawah batas bawah.
+    # Turun cepat, naik lambat: tingkat tidak bolak-balik saat beban di sekitar batas.
+    def __init__(self, budget=1.0 / FPS, level=None, min_level=None, max_level=ULTRA,
+                 window=QUALITY_WINDOW, down_threshold=QUALITY_DOWN_THRESHOLD,
+                 up_threshold=QUALITY_UP_THRESHOLD, up_windows=QUALITY_UP_WINDOWS,
+                 max_transitions=QUALITY_MAX_TRANSITIONS):
+        if budget <= 0:
+            raise ValueError("budget must be positive, got %r" % (budget,))
+        if up_threshold >= down_threshold:
+            raise ValueError("up_threshold must be below down_threshold")
+        self.budget = budget
+        self.min_level = level_from_name(QUALITY_MIN_LEVEL) if min_level is None else min_level
+        self.max_level = max_level
+        start = level_from_name(QUALITY_START_LEVEL) if level is None else level
+        self.level = max(self.min_level, min(self.max_level, start))
+        self.down_threshold = down_threshold
+        self.up_threshold = up_threshold
+        self.up_windows = up_windows
+        self.samples = deque(maxlen=window)
+        self.good_windows = 0
+        self.frames = 0
+        self.frames_at_level = [0] * len(LEVEL_NAMES)
+        # (frame, tingkat lama, tingkat baru, rata-rata waktu frame) untuk transisi terakhir
+        self.transitions = deque(maxlen=max_transitions)
+        self.transition_count = 0
+
+    @property
+    def level_name(self):
+        return LEVEL_NAMES[self.level]
+
+    def observe(self, frame_time):
+        # Dipanggil sekali per frame dengan waktu kerja frame; True jika tingkat berubah
+        self.frames += 1
+        self.frames_at_level[self.level] += 1
+        samples = self.samples
+        samples.append(frame_time)
+        if len(samples) < samples.maxlen:
+            return False
+        mean = sum(samples) / len(samples)
+        samples.clear()
+        if mean > self.budget * self.down_threshold:
+            self.good_windows = 0
+            return self._set_level(self.level - 1, mean)
+        if mean < self.budget * self.up_threshold:
+            self.good_windows += 1
+            if self.good_windows >= self.up_windows:
+                self.good_windows = 0
+                return self._set_level(self.level + 1, mean)
+        else:
+            self.good_windows = 0
+        return False
+
+    def _set_level(self, level, mean):
+        level = max(self.min_level, min(self.max_level, level))
+        if level == self.level:
+            return False
+        self.transitions.append((self.frames, self.level, level, mean))
+        self.transition_count += 1
+        self.level = level
+        return True
+
+    def stats(self):
+        return {
+            "level": self.level_name,
+            "transitions": self.transition_count,
+            "recent_transitions": [
+                {"frame": frame, "from": LEVEL_NAMES[old], "to": LEVEL_NAMES[new], "mean_ms": mean * 1000}
+                for frame, old, new, mean in self.transitions
+            ],
+            "frames_at_level": dict(zip(LEVEL_NAMES, self.frames_at_level)),
+        }
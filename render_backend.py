@@ -0,0 +1,264 @@
+import copy
+import math
+import random
+import cairo
+import numpy as np
+import pygame
+from constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, HEALTH_BAR_COLOR, PARTICLE_ALPHA_BUCKETS,
+    PARTICLE_COLOR, MASK_SPRITE_ROTATIONS, PLAYER_SPRITE_FRAMES
+)
+from game import MENU, GAME_OVER, GAME_OVER_DIM, Game, health_fill_rect
+from background import ParallaxLayerCache
+from pollution_atlas import PollutionAtlas
+from mask import Mask
+from particle import PARTICLE_MIN_RADIUS, PARTICLE_RADIUS_STEPS
+from quality import ULTRA, LOW, MINIMAL
+
+# Semua animasi player periodik dalam animation_time dengan periode 4*pi
+# (kaki: 2t, periode pi; ekor ikat kepala: 1.5t, periode 4*pi/3)
+PLAYER_ANIMATION_PERIOD = 4 * math.pi
+# Margin sprite player relatif ke (draw_x, draw_y), sama dengan Player.bounds
+PLAYER_SPRITE_LEFT = 32
+PLAYER_SPRITE_TOP = 16
+
+
+def to_pygame(surface, opaque=False):
+    # Salin surface Cairo (ARGB32 premultiplied, urutan byte BGRA di little-endian) ke pygame.
+    # Hasilnya di-blit dengan BLEND_PREMULTIPLIED, jadi nilainya tidak perlu di-unpremultiply.
+    surface.flush()
+    size = (surface.get_width(), surface.get_height())
+    sprite = pygame.image.frombuffer(bytes(surface.get_data()), size, "BGRA")
+    if pygame.display.get_surface() is None:
+        return sprite
+    return sprite.convert() if opaque else sprite.convert_alpha()
+
+
+def bake(width, height, draw):
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    draw(cairo.Context(surface))
+    return to_pygame(surface)
+
+
+class CairoBackend:
+    # Backend bawaan: seluruh frame digambar dengan Cairo, lalu framebuffer di-blit ke layar
+    name = "cairo"
+
+    def __init__(self, framebuffers, resolution=None):
+        self.framebuffers = framebuffers
+        # Opsional (dynamic resolution): ResolutionController memilih skala, dunia digambar
+        # ScaledRenderer lalu di-upscale; tombol, HUD dan profiler tetap resolusi penuh
+        self.resolution = resolution
+        self.scaled = None
+        if resolution is not None:
+            from resolution import ScaledRenderer
+            self.scaled = ScaledRenderer(framebuffers.width, framebuffers.height, resolution.max_scale)
+
+    def draw_frame(self, screen, game, mouse_x, mouse_y, alpha, profiler):
+        ctx = self.framebuffers.begin_frame()
+        if self.scaled is None:
+            game.draw(ctx, mouse_x, mouse_y, alpha)
+        else:
+            scale = self.resolution.scale
+            self.scaled.draw(ctx, scale, lambda world: game.draw(world, mouse_x, mouse_y, alpha, ui=False))
+            game.draw_ui(ctx, mouse_x, mouse_y)
+            profiler.set_label("render scale", "%d%%" % round(scale * 100))
+        profiler.draw_overlay(ctx, game._text_overlays)
+        with profiler.section("convert"):
+            # Satu-satunya salinan per frame (lihat FrameBufferChain): BGRA -> format display
+            screen.blit(self.framebuffers.end_frame(), (0, 0))
+
+
+class PygameBackend:
+    # Backend ringan: bentuk digambar sekali dengan kode Cairo yang sama ke sprite, lalu
+    # setiap frame hanya blit pygame (dan pygame.draw untuk isi health bar). Tidak ada
+    # path antialiasing dan konversi framebuffer per frame; posisi dibulatkan ke piksel.
+    name = "pygame"
+
+    def __init__(self):
+        self.background = ParallaxLayerCache()
+        self.background_key = None
+        self.sky = None
+        self.layers = []
+        self.atlas = PollutionAtlas(convert=to_pygame)
+        self.mask_sprites = {}
+        self.player_sprites = {}
+        self.particle_sprites = self._bake_particles()
+        self.button_sprites = {}
+        # Bayangan bar berakhir di x=263, ikon hati di x=15..51
+        self.hud_frame = bake(270, 60, Game.draw_hud_frame)
+        self.dim = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.dim.set_alpha(int(round(GAME_OVER_DIM * 255)))
+        self.overlay_surface = None
+
+    def draw_frame(self, screen, game, mouse_x, mouse_y, alpha, profiler):
+        game.render_alpha = alpha
+        game._text_overlays = []
+        game._button_texts = []
+        with profiler.section("background"):
+            self.draw_background(screen, game, alpha)
+        if game.state == MENU:
+            game._text_overlays.extend(game.menu_overlays())
+            self.draw_button(screen, game, mouse_x, mouse_y, game.button_label())
+        elif game.state == GAME_OVER:
+            screen.blit(self.dim, (0, 0))
+            game._text_overlays.extend(game.game_over_overlays())
+            self.draw_button(screen, game, mouse_x, mouse_y, game.button_label())
+        else:
+            with profiler.section("entities"):
+                self.draw_entities(screen, game, alpha)
+            with profiler.section("hud"):
+                self.draw_hud(screen, game)
+            game._text_overlays.extend(game.score_overlays())
+        self.draw_profiler_overlay(screen, profiler, game._text_overlays)
+
+    def draw_background(self, screen, game, alpha):
+        cache = self.background
+        if cache.key != cache.current_key():
+            cache.build()
+        if self.background_key != cache.key:
+            self.sky = to_pygame(cache.sky, opaque=True)
+            self.layers = [(layer, to_pygame(layer.tile)) for layer in (cache.city, cache.clouds, cache.ground)]
+            self.background_key = cache.key
+        sky_scroll, city_scroll, ground_scroll = game.render_scrolls(alpha)
+        screen.blit(self.sky, (0, 0))
+        for (layer, sprite), scroll in zip(self.layers, (city_scroll, sky_scroll, ground_scroll)):
+            screen.blit(sprite, (layer.offset(scroll), layer.top), special_flags=pygame.BLEND_PREMULTIPLIED)
+
+    def draw_entities(self, screen, game, alpha):
+        # Tingkat kualitas (quality.py) sama seperti Game.draw_entities; tiap tingkat punya sprite sendiri
+        quality = game.quality
+        blend = pygame.BLEND_PREMULTIPLIED
+        if quality > MINIMAL:
+            blits = self.particle_blits(game.particles, step=2 if quality == LOW else 1)
+        else:
+            blits = []
+        for pollution in game.pollution_objects:
+            sprite, half, _ = self.atlas.lookup(pollution, quality)
+            blits.append((sprite, self.atlas.sprite_position(pollution, half, alpha), None, blend))
+        for mask in game.masks:
+            blits.append(self.mask_blit(mask, alpha, quality))
+        blits.append(self.player_blit(game.player, alpha, quality))
+        screen.blits(blits, doreturn=False)
+
+    def _bake_particles(self):
+        sprites = []
+        for step in range(PARTICLE_RADIUS_STEPS):
+            radius = PARTICLE_MIN_RADIUS + step * 0.5
+            half = int(math.ceil(radius)) + 1
+            row = []
+            for level in range(PARTICLE_ALPHA_BUCKETS):
+                def draw(ctx, radius=radius, half=half, level=level):
+                    ctx.set_source_rgba(
+                        PARTICLE_COLOR[0] / 255.0,
+                        PARTICLE_COLOR[1] / 255.0,
+                        PARTICLE_COLOR[2] / 255.0,
+                        (level + 1) / float(PARTICLE_ALPHA_BUCKETS)
+                    )
+                    ctx.arc(half, half, radius, 0, 2 * math.pi)
+                    ctx.fill()
+                row.append((bake(half * 2, half * 2, draw), half))
+            sprites.append(row)
+        return sprites
+
+    def particle_blits(self, particles, step=1):
+        # step > 1: hanya setiap partikel ke-step (sama seperti ParticleSystem.draw)
+        n = particles.count
+        if n == 0:
+            return []
+        step = particles.draw_step(step)
+        buckets = PARTICLE_ALPHA_BUCKETS
+        levels = np.minimum((particles.alphas()[::step] * buckets).astype(np.int32), buckets - 1).tolist()
+        steps = np.clip(
+            np.rint((particles.radius[:n:step] - PARTICLE_MIN_RADIUS) * 2), 0, PARTICLE_RADIUS_STEPS - 1
+        ).astype(np.int32).tolist()
+        xs = np.rint(particles.x[:n:step]).astype(np.int32).tolist()
+        ys = np.rint(particles.y[:n:step]).astype(np.int32).tolist()
+        blend = pygame.BLEND_PREMULTIPLIED
+        blits = []
+        sprites = self.particle_sprites
+        for i in range(len(xs)):
+            sprite, half = sprites[steps[i]][levels[i]]
+            blits.append((sprite, (xs[i] - half, ys[i] - half), None, blend))
+        return blits
+
+    def mask_blit(self, mask, alpha, quality=ULTRA):
+        step = int(round(mask.rotation / (2 * math.pi) * MASK_SPRITE_ROTATIONS)) % MASK_SPRITE_ROTATIONS
+        key = (mask.radius, step, quality)
+        entry = self.mask_sprites.get(key)
+        if entry is None:
+            half = int(math.ceil(mask.radius)) + 8
+            template = Mask(half, half, rng=random.Random(0))
+            template.radius = mask.radius
+            template.rotation = step * 2 * math.pi / MASK_SPRITE_ROTATIONS
+            entry = (bake(half * 2, half * 2, lambda ctx: template.draw(ctx, quality=quality)), half)
+            self.mask_sprites[key] = entry
+        sprite, half = entry
+        x, y = mask.render_position(alpha)
+        return (sprite, (int(round(x)) - half, int(round(y)) - half), None, pygame.BLEND_PREMULTIPLIED)
+
+    def player_blit(self, player, alpha, quality=ULTRA):
+        phase = player.animation_time % PLAYER_ANIMATION_PERIOD
+        frame = int(phase / PLAYER_ANIMATION_PERIOD * PLAYER_SPRITE_FRAMES) % PLAYER_SPRITE_FRAMES
+        key = (player.is_ducking, player.on_ground, player.is_protected, frame, quality)
+        sprite = self.player_sprites.get(key)
+        if sprite is None:
+            template = copy.copy(player)
+            template.x = template.prev_x = PLAYER_SPRITE_LEFT
+            template.y = template.prev_y = PLAYER_SPRITE_TOP
+            template.animation_offset = 0
+            template.animation_vertical_offset = 0
+            template.animation_time = (frame + 0.5) / PLAYER_SPRITE_FRAMES * PLAYER_ANIMATION_PERIOD
+            if template.on_ground:
+                template.leg_animation_phase = (template.animation_time * 2) % (2 * math.pi)
+            sprite = bake(player.width + 56, player.height + 30, lambda ctx: template.draw(ctx, quality=quality))
+            self.player_sprites[key] = sprite
+        render_x, render_y = player.render_position(alpha)
+        x = int(round(render_x + player.animation_offset)) - PLAYER_SPRITE_LEFT
+        y = int(round(render_y - player.animation_vertical_offset)) - PLAYER_SPRITE_TOP
+        return (sprite, (x, y), None, pygame.BLEND_PREMULTIPLIED)
+
+    def draw_hud(self, screen, game):
+        screen.blit(self.hud_frame, (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+        fill_x, fill_y, fill_w, fill_h = health_fill_rect(
+            max(0, game.player.health / game.player.max_health)
+        )
+        if fill_w > 0:
+            screen.fill(HEALTH_BAR_COLOR, (fill_x, fill_y, fill_w, fill_h))
+            # Highlight putih 30% di atas warna bar yang opak = campuran warna yang sudah jadi
+            highlight = tuple(int(round(c * 0.7 + 255 * 0.3)) for c in HEALTH_BAR_COLOR)
+            pygame.draw.rect(screen, highlight, (fill_x, fill_y, fill_w, fill_h // 2))
+
+    def draw_button(self, screen, game, mouse_x, mouse_y, text):
+        x, y, width, height = game.button_rect()
+        hover = game.check_button_click(mouse_x, mouse_y, x, y, width, height)
+        key = (width, height, hover)
+        sprite = self.button_sprites.get(key)
+        if sprite is None:
+            # Margin 2px untuk garis tepi dan +4px untuk bayangan
+            sprite = bake(width + 8, height + 8, lambda ctx: Game.draw_button_shape(ctx, 2, 2, width, height, hover))
+            self.button_sprites[key] = sprite
+        screen.blit(sprite, (int(x) - 2, int(y) - 2), special_flags=pygame.BLEND_PREMULTIPLIED)
+        game._button_texts.append((x, y, width, height, text))
+
+    def draw_profiler_overlay(self, screen, profiler, text_overlays):
+        # Grafik profiler (F3) tetap digambar Cairo, hanya saat terlihat
+        if not profiler.visible:
+            return
+        if self.overlay_surface is None:
+            self.overlay_surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 240, 80)
+        ctx = cairo.Context(self.overlay_surface)
+        ctx.set_operator(cairo.OPERATOR_CLEAR)
+        ctx.paint()
+        ctx.set_operator(cairo.OPERATOR_OVER)
+        ctx.translate(-10, -70)
+        profiler.draw_overlay(ctx, text_overlays)
+        screen.blit(to_pygame(self.overlay_surface), (10, 70), special_flags=pygame.BLEND_PREMULTIPLIED)
+
+
+def create_backend(name, framebuffers=None, resolution=None):
+    if name == "cairo":
+        return CairoBackend(framebuffers, resolution)
+    if name == "pygame":
+        return PygameBackend()
+    raise ValueError("unknown render backend %r" % (name,))
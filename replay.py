@@ -0,0 +1,200 @@
+import argparse
+import bisect
+import struct
+import time
+from constants import SIM_TICK_RATE, REPLAY_KEYFRAME_INTERVAL
+from game import Game, INPUT_START
+
+# Format file: header (magic, versi, seed, tick rate) lalu satu varint per event.
+# Varint berisi (selisih tick << 3) | kode, jadi input yang berdekatan cukup 1-2 byte.
+MAGIC = b"HBRR"
+# Versi 2: rintangan berasal dari world stream (course per run), log versi 1 tidak bisa diputar sama
+VERSION = 2
+HEADER = struct.Struct("<4sBqd")
+CODE_BITS = 3
+CODE_END = 7
+
+
+def write_varint(out, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+class InputRecorder:
+    def __init__(self, seed, tick_rate=SIM_TICK_RATE):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.data = bytearray(HEADER.pack(MAGIC, VERSION, seed, tick_rate))
+        self.last_tick = 0
+        self.count = 0
+        self.finished = False
+
+    def record(self, tick, code):
+        if tick < self.last_tick:
+            raise ValueError("input ticks must not go backwards")
+        write_varint(self.data, ((tick - self.last_tick) << CODE_BITS) | code)
+        self.last_tick = tick
+        self.count += 1
+
+    def finish(self, tick):
+        # Penanda akhir menyimpan panjang sesi (tick terakhir)
+        if not self.finished:
+            self.record(tick, CODE_END)
+            self.count -= 1
+            self.finished = True
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.data)
+        return len(self.data)
+
+
+class Replay:
+    def __init__(self, seed, tick_rate, ticks, codes, end_tick):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        # Dua list paralel: indeks tick per event (terurut) dan kode inputnya
+        self.ticks = ticks
+        self.codes = codes
+        self.end_tick = end_tick
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, seed, tick_rate = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a replay file (magic %r, version %d)" % (magic, version))
+        ticks = []
+        codes = []
+        tick = 0
+        end_tick = None
+        pos = HEADER.size
+        while pos < len(data):
+            value, pos = read_varint(data, pos)
+            tick += value >> CODE_BITS
+            code = value & ((1 << CODE_BITS) - 1)
+            if code == CODE_END:
+                end_tick = tick
+                break
+            ticks.append(tick)
+            codes.append(code)
+        if end_tick is None:
+            # Sesi yang terputus (crash) tetap bisa diputar sampai input terakhir
+            end_tick = tick
+        return cls(seed, tick_rate, ticks, codes, end_tick)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayPlayer:
+    # Memutar ulang log input lewat Game.update. Keyframe state disimpan tiap
+    # `keyframe_interval` tick selama pemutaran maju, sehingga seek mundur tidak perlu mulai dari 0.
+    def __init__(self, replay, keyframe_interval=REPLAY_KEYFRAME_INTERVAL):
+        self.replay = replay
+        self.dt = 1.0 / replay.tick_rate
+        self.keyframe_interval = keyframe_interval
+        self.game = Game(seed=replay.seed)
+        self.next_event = 0
+        self.keyframe_ticks = [0]
+        self.keyframes = [self.game.save_state()]
+
+    @property
+    def tick(self):
+        return self.game.tick
+
+    @property
+    def finished(self):
+        return self.game.tick >= self.replay.end_tick
+
+    def step(self):
+        game = self.game
+        replay = self.replay
+        while self.next_event < len(replay.ticks) and replay.ticks[self.next_event] == game.tick:
+            game.apply_input(replay.codes[self.next_event])
+            self.next_event += 1
+        game.update(self.dt)
+        if game.tick % self.keyframe_interval == 0 and game.tick > self.keyframe_ticks[-1]:
+            self.keyframe_ticks.append(game.tick)
+            self.keyframes.append(game.save_state())
+
+    def run_to(self, tick):
+        while self.game.tick < tick:
+            self.step()
+
+    def seek(self, tick):
+        # Mulai dari keyframe terdekat sebelum tick, kecuali posisi sekarang lebih dekat
+        index = bisect.bisect_right(self.keyframe_ticks, tick) - 1
+        if tick < self.game.tick or self.keyframe_ticks[index] > self.game.tick:
+            self.game.restore_state(self.keyframes[index])
+            self.next_event = bisect.bisect_left(self.replay.ticks, self.game.tick)
+        self.run_to(tick)
+
+    def run(self):
+        # Putar sampai akhir secepat mungkin, tanpa render
+        start = time.perf_counter()
+        start_tick = self.game.tick
+        self.run_to(self.replay.end_tick)
+        return time.perf_counter() - start, self.game.tick - start_tick
+
+
+def summarize(game):
+    return {
+        "tick": game.tick,
+        "state": game.state,
+        "score": game.score,
+        "best_score": game.best_score,
+        "survival_time": game.survival_time,
+        "health": game.player.health,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded Healthy Breath Runner session.")
+    parser.add_argument("path", help="replay file written by `python game.py --record PATH`")
+    parser.add_argument("--play", action="store_true", help="render the replay in a window")
+    parser.add_argument("--fps", type=int, default=None, help="render frame rate for --play")
+    parser.add_argument("--seek", type=float, default=None, help="print the game state at this time (seconds)")
+    args = parser.parse_args()
+
+    if args.play:
+        from game import main as play
+        from constants import FPS
+        play(replay_path=args.path, fps=args.fps or FPS)
+        return
+
+    replay = Replay.load(args.path)
+    player = ReplayPlayer(replay)
+    print("seed %d, %d inputs (%d restarts), %d ticks" % (
+        replay.seed, len(replay.codes), replay.codes.count(INPUT_START), replay.end_tick
+    ))
+    if args.seek is not None:
+        player.seek(int(round(args.seek * replay.tick_rate)))
+        print("at %.2f s: %s" % (args.seek, summarize(player.game)))
+    wall, ticks = player.run()
+    print("end: %s" % (summarize(player.game),))
+    if wall > 0:
+        print("%d ticks in %.3f s wall (%.0fx real time)" % (ticks, wall, ticks / replay.tick_rate / wall))
+
+
+if __name__ == "__main__":
+    main()
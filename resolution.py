@@ -0,0 +1,110 @@
+import math
+from collections import deque
+from constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS,
+    DYNAMIC_RESOLUTION_MIN_SCALE, DYNAMIC_RESOLUTION_MAX_SCALE, DYNAMIC_RESOLUTION_STEP,
+    DYNAMIC_RESOLUTION_WINDOW, DYNAMIC_RESOLUTION_DOWN_THRESHOLD, DYNAMIC_RESOLUTION_UP_THRESHOLD,
+    DYNAMIC_RESOLUTION_SMOOTH
+)
+
+
+class ResolutionController:
+    # Memilih skala render dari waktu frame terakhir. Keputusan diambil sekali per `window` frame
+    # (rata-rata), lalu jendela dikosongkan, jadi setelah berubah skala harus diukur ulang dulu.
+    # Naik skala hanya jika perkiraan biaya di skala baru (sebanding luas piksel) masih di bawah
+    # batas turun, supaya tidak bolak-balik di antara dua skala.
+    def __init__(self, budget=1.0 / FPS, min_scale=DYNAMIC_RESOLUTION_MIN_SCALE,
+                 max_scale=DYNAMIC_RESOLUTION_MAX_SCALE, step=DYNAMIC_RESOLUTION_STEP,
+                 window=DYNAMIC_RESOLUTION_WINDOW, down_threshold=DYNAMIC_RESOLUTION_DOWN_THRESHOLD,
+                 up_threshold=DYNAMIC_RESOLUTION_UP_THRESHOLD):
+        if budget <= 0:
+            raise ValueError("budget must be positive, got %r" % (budget,))
+        if not 0 < min_scale <= max_scale <= 1.0:
+            raise ValueError("need 0 < min_scale <= max_scale <= 1, got %r..%r" % (min_scale, max_scale))
+        if up_threshold >= down_threshold:
+            raise ValueError("up_threshold must be below down_threshold")
+        self.budget = budget
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.step = step
+        self.down_threshold = down_threshold
+        self.up_threshold = up_threshold
+        self.samples = deque(maxlen=window)
+        self.scale = max_scale
+        self.changes = 0
+
+    def observe(self, frame_time):
+        # Dipanggil sekali per frame dengan waktu kerja frame (tanpa waktu tidur clock.tick).
+        # Mengembalikan True jika skala berubah.
+        samples = self.samples
+        samples.append(frame_time)
+        if len(samples) < samples.maxlen:
+            return False
+        mean = sum(samples) / len(samples)
+        samples.clear()
+        scale = self.scale
+        if mean > self.budget * self.down_threshold:
+            scale = max(self.min_scale, scale - self.step)
+        elif mean < self.budget * self.up_threshold:
+            scale = min(self.max_scale, scale + self.step)
+            if mean * (scale / self.scale) ** 2 > self.budget * self.down_threshold:
+                scale = self.scale
+        if abs(scale - self.scale) < 1e-9:
+            return False
+        self.scale = scale
+        self.changes += 1
+        return True
+
+
+class ScaledRenderer:
+    # Buffer internal seukuran skala maksimum dialokasikan sekali; skala yang lebih kecil
+    # memakai pojok kiri atasnya. Hasilnya di-upscale ke context tujuan dengan Cairo.
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, max_scale=DYNAMIC_RESOLUTION_MAX_SCALE,
+                 smooth=DYNAMIC_RESOLUTION_SMOOTH):
+        from framebuffer import FrameBuffer
+        self.width = width
+        self.height = height
+        self.buffer = FrameBuffer(int(math.ceil(width * max_scale)), int(math.ceil(height * max_scale)))
+        self.smooth = smooth
+        self.views = {}
+
+    def render_size(self, scale):
+        return (
+            max(1, min(self.buffer.width, int(round(self.width * scale)))),
+            max(1, min(self.buffer.height, int(round(self.height * scale)))),
+        )
+
+    def draw(self, ctx, scale, draw_world):
+        import cairo
+        render_width, render_height = self.render_size(scale)
+        if render_width == self.width and render_height == self.height:
+            # Resolusi penuh: langsung ke tujuan, tanpa salinan tambahan
+            draw_world(ctx)
+            return
+        small = self.buffer.ctx
+        small.save()
+        small.rectangle(0, 0, render_width, render_height)
+        small.clip()
+        small.set_operator(cairo.OPERATOR_CLEAR)
+        small.paint()
+        small.set_operator(cairo.OPERATOR_OVER)
+        small.scale(render_width / self.width, render_height / self.height)
+        draw_world(small)
+        small.restore()
+        self.buffer.surface.flush()
+        key = (render_width, render_height)
+        view = self.views.get(key)
+        if view is None:
+            # Subsurface + EXTEND_PAD: filter di tepi tidak mengambil piksel basi di luar area render
+            view = self.buffer.surface.create_for_rectangle(0, 0, render_width, render_height)
+            self.views[key] = view
+        ctx.save()
+        ctx.scale(self.width / render_width, self.height / render_height)
+        ctx.set_source_surface(view, 0, 0)
+        pattern = ctx.get_source()
+        pattern.set_extend(cairo.EXTEND_PAD)
+        pattern.set_filter(cairo.FILTER_BILINEAR if self.smooth else cairo.FILTER_FAST)
+        ctx.set_operator(cairo.OPERATOR_SOURCE)
+        ctx.rectangle(0, 0, render_width, render_height)
+        ctx.fill()
+        ctx.restore()
@@ -0,0 +1,30 @@
+import random
+
+
+class RngStreams:
+    # Satu seed utama dipecah menjadi stream random terpisah per subsistem,
+    # sehingga menambah pemanggilan random di satu subsistem tidak menggeser subsistem lain.
+    NAMES = ("spawn", "pollution", "mask", "particles")
+
+    def __init__(self, seed=None):
+        self.seed = seed
+
+    def __getattr__(self, name):
+        # Stream dibuat saat pertama dipakai, jadi hanya stream yang dipakai
+        # ikut tersalin di save_state/keyframe replay
+        if name not in self.NAMES:
+            raise AttributeError(name)
+        stream = self.stream(name)
+        setattr(self, name, stream)
+        return stream
+
+    def stream(self, name):
+        if self.seed is None:
+            return random.Random()
+        return random.Random("%s/%s" % (self.seed, name))
+
+    def numpy_seed(self, name):
+        # Seed integer untuk numpy.random.default_rng (None = entropi OS)
+        if self.seed is None:
+            return None
+        return self.stream(name).getrandbits(64)
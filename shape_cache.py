@@ -0,0 +1,82 @@
+class ShapeRecorder:
+    # Dipakai oleh fungsi build(recorder, key): gambar path di self.ctx, lalu tutup dengan fill()/stroke().
+    # Setiap layer disimpan sebagai (warna rgba atau None, lebar garis atau None untuk fill, cairo.Path).
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.layers = []
+
+    def fill(self, color=None):
+        self._record(color, None)
+
+    def stroke(self, color=None, line_width=1.0):
+        self._record(color, line_width)
+
+    def _record(self, color, line_width):
+        self.layers.append((color, line_width, self.ctx.copy_path()))
+        self.ctx.new_path()
+
+
+class ShapeCache:
+    # Bentuk statis (badan player per state, mask per tingkat kualitas, tombol) direkam sekali
+    # per kunci sebagai cairo.Path lewat copy_path, lalu tiap frame cukup append_path di bawah
+    # translate/rotate. Path direkam di context 1x1 sendiri dengan transform identitas,
+    # jadi hasilnya tidak bergantung pada transform context yang kebetulan sedang menggambar.
+    # Jumlah kunci terbatas (semua dari konstanta), jadi tidak perlu eviction.
+    def __init__(self):
+        self._ctx = None
+        self.shapes = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _context(self):
+        # Cairo diimpor lazily: modul entity tetap bisa diimpor di mode headless
+        if self._ctx is None:
+            import cairo
+            self._ctx = cairo.Context(cairo.ImageSurface(cairo.FORMAT_ARGB32, 1, 1))
+        return self._ctx
+
+    def get(self, key, build):
+        shape = self.shapes.get(key)
+        if shape is not None:
+            self.hits += 1
+            return shape
+        self.misses += 1
+        ctx = self._context()
+        ctx.new_path()
+        recorder = ShapeRecorder(ctx)
+        build(recorder, key)
+        shape = tuple(recorder.layers)
+        self.shapes[key] = shape
+        return shape
+
+    def clear(self):
+        self.shapes.clear()
+
+    def stats(self):
+        return {"shapes": len(self.shapes), "hits": self.hits, "misses": self.misses}
+
+
+def draw_shape(ctx, shape, x=0.0, y=0.0):
+    # Putar ulang layer di (x, y). Layer tanpa warna memakai source context saat ini;
+    # line cap/join juga diwarisi dari context, sama seperti menggambar path-nya langsung.
+    ctx.save()
+    ctx.translate(x, y)
+    for color, line_width, path in shape:
+        if color is not None:
+            ctx.set_source_rgba(*color)
+        ctx.append_path(path)
+        if line_width is None:
+            ctx.fill()
+        else:
+            ctx.set_line_width(line_width)
+            ctx.stroke()
+    ctx.restore()
+
+
+def rgb(color):
+    # Warna konstanta (0..255) ke rgba Cairo
+    return (color[0] / 255.0, color[1] / 255.0, color[2] / 255.0, 1.0)
+
+
+# Dipakai bersama oleh semua entity dan game (render thread / proses yang sama)
+SHAPES = ShapeCache()
@@ -0,0 +1,140 @@
+import time
+
+# Origin semua mark: saat modul ini diimpor, bukan saat proses mulai
+# (start-up interpreter dan impor sebelum startup.py tidak ikut terhitung)
+IMPORT_START = time.perf_counter()
+
+import argparse
+import importlib
+import json
+import random
+import sys
+from constants import (
+    PREWARM_FRAME_BUDGET, PREWARM_POLLUTION_OBJECTS, PREWARM_MASK_OBJECTS,
+    SCORE_COLOR, SHADOW_COLOR, BUTTON_TEXT_COLOR
+)
+
+# Diimpor berurutan: waktu tiap baris adalah biaya eksklusif modul itu,
+# karena dependensi yang sudah dimuat baris sebelumnya tidak dihitung lagi.
+STARTUP_IMPORTS = (
+    "numpy", "pygame", "cairo",
+    "particle", "pollution", "mask", "shape_cache", "player", "collision", "pool", "rng_streams",
+    "quality", "world_stream", "profiler", "game",
+    # Diimpor lazily oleh game.main(); tanpa baris ini biayanya masuk ke mark "window"/"first_frame"
+    "framebuffer", "timestep", "text_cache", "dirty", "pipeline",
+    "background", "pollution_atlas", "render_backend",
+)
+
+
+class StartupReport:
+    def __init__(self, origin=IMPORT_START, clock=time.perf_counter):
+        self.origin = origin
+        self.clock = clock
+        self.imports = []
+        self.marks = []
+
+    def timed_imports(self, names=STARTUP_IMPORTS):
+        for name in names:
+            start = self.clock()
+            importlib.import_module(name)
+            self.imports.append((name, self.clock() - start))
+
+    def mark(self, name):
+        # Waktu sejak origin; mark yang sama hanya dicatat sekali
+        if all(existing != name for existing, _ in self.marks):
+            self.marks.append((name, self.clock() - self.origin))
+
+    def elapsed(self, name):
+        for existing, seconds in self.marks:
+            if existing == name:
+                return seconds
+        return None
+
+    def as_dict(self):
+        return {
+            "imports_ms": {name: seconds * 1000 for name, seconds in self.imports},
+            "marks_ms": {name: seconds * 1000 for name, seconds in self.marks},
+        }
+
+    def format(self):
+        lines = ["imports:"]
+        for name, seconds in self.imports:
+            lines.append("  %-16s %7.1f ms" % (name, seconds * 1000))
+        lines.append("  %-16s %7.1f ms" % ("total", sum(s for _, s in self.imports) * 1000))
+        lines.append("since startup.py import:")
+        for name, seconds in self.marks:
+            lines.append("  %-16s %7.1f ms" % (name, seconds * 1000))
+        return "\n".join(lines)
+
+
+class Prewarmer:
+    # Pekerjaan pemanasan yang dijalankan sedikit demi sedikit di sela frame menu,
+    # dibatasi `budget` detik per frame agar animasi menu tetap mulus.
+    def __init__(self, tasks, clock=time.perf_counter):
+        self.tasks = list(tasks)
+        self.clock = clock
+        self.completed = 0
+
+    @property
+    def done(self):
+        return not self.tasks
+
+    def run(self, budget=PREWARM_FRAME_BUDGET):
+        # Minimal satu task per pemanggilan, supaya selalu ada kemajuan
+        deadline = self.clock() + budget
+        while self.tasks:
+            self.tasks.pop(0)()
+            self.completed += 1
+            if self.clock() >= deadline:
+                break
+        return self.done
+
+
+def menu_prewarm_tasks(game, text_renderer):
+    from pollution import Pollution
+    from mask import Mask
+    tasks = []
+    # Font dan teks yang baru muncul setelah menu: HUD skor, layar game over, overlay profiler
+    for size in (20, 24, 32, 48, 64, 70):
+        tasks.append(lambda size=size: text_renderer.get_font(size))
+    for color in (SCORE_COLOR, SHADOW_COLOR):
+        for first in range(0, 100, 10):
+            tasks.append(lambda color=color, first=first: [
+                text_renderer.render(str(score), 48, color) for score in range(first, first + 10)
+            ])
+    tasks.append(lambda: text_renderer.render("GAME OVER", 70, (238, 82, 83)))
+    tasks.append(lambda: text_renderer.render("GAME OVER", 70, SHADOW_COLOR))
+    tasks.append(lambda: text_renderer.render("TRY AGAIN", 32, BUTTON_TEXT_COLOR))
+    # Isi pool entity lebih dulu, supaya detik-detik pertama permainan tidak mengalokasikan objek.
+    # RNG terpisah: objek di pool ditimpa seluruhnya oleh reset() saat dipakai.
+    scratch = random.Random(0)
+    tasks.append(lambda: game.pollution_pool.prefill(
+        PREWARM_POLLUTION_OBJECTS, lambda: Pollution.create_random(scratch)
+    ))
+    tasks.append(lambda: game.mask_pool.prefill(
+        PREWARM_MASK_OBJECTS, lambda: Mask.create_random(scratch)
+    ))
+    return tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Start the game and report import times and time-to-first-frame."
+    )
+    parser.add_argument("--first-frame-only", action="store_true",
+                        help="quit as soon as the first frame is on screen (cold-start measurement)")
+    parser.add_argument("--json", metavar="PATH", help="append the report as a JSON line to PATH")
+    args = parser.parse_args()
+
+    report = StartupReport()
+    report.timed_imports()
+    import game
+    game.main(startup=report, exit_after_first_frame=args.first_frame_only)
+    print(report.format(), file=sys.stderr)
+    if args.json:
+        with open(args.json, "a") as f:
+            f.write(json.dumps(report.as_dict()) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import numpy as np
+from collision import circles_vs_aabb, circles_vs_circle, swap_remove
+
+
+def test_circles_vs_aabb_edges_and_corners():
+    # Kotak (100, 100)-(200, 150); lingkaran radius 10
+    xs = np.array([150.0, 95.0, 89.0, 150.0, 150.0, 207.0, 208.0, 300.0])
+    ys = np.array([125.0, 125.0, 125.0, 91.0, 160.0, 157.0, 158.0, 125.0])
+    radii = np.full(len(xs), 10.0)
+    hits = circles_vs_aabb(xs, ys, radii, 100, 100, 200, 150)
+    # di dalam, sisi kiri, lewat sisi kiri, sisi atas, bersinggungan (tidak kena), sudut, lewat sudut, jauh
+    assert hits.tolist() == [True, True, False, True, False, True, False, False]
+
+
+def test_circles_vs_aabb_matches_scalar_check():
+    rng = np.random.default_rng(0)
+    xs = rng.uniform(0, 400, 500)
+    ys = rng.uniform(0, 400, 500)
+    radii = rng.uniform(1, 40, 500)
+    hits = circles_vs_aabb(xs, ys, radii, 150, 120, 230, 260)
+    for x, y, r, hit in zip(xs, ys, radii, hits):
+        nearest_x = min(max(x, 150), 230)
+        nearest_y = min(max(y, 120), 260)
+        assert hit == ((x - nearest_x) ** 2 + (y - nearest_y) ** 2 < r * r)
+
+
+def test_circles_vs_circle():
+    xs = np.array([0.0, 29.0, 30.0, 0.0])
+    ys = np.array([0.0, 0.0, 0.0, -31.0])
+    radii = np.array([5.0, 10.0, 10.0, 10.0])
+    assert circles_vs_circle(xs, ys, radii, 0.0, 0.0, 20.0).tolist() == [True, True, False, False]
+
+
+def test_swap_remove_returns_removed_and_keeps_the_rest():
+    items = list("abcdefg")
+    removed = swap_remove(items, np.array([1, 6, 3]))
+    assert sorted(removed) == ["b", "d", "g"]
+    assert sorted(items) == ["a", "c", "e", "f"]
+    assert len(items) == 4
+
+
+def test_swap_remove_duplicates_last_and_empty():
+    items = [0, 1, 2, 3]
+    assert swap_remove(items, []) == []
+    assert items == [0, 1, 2, 3]
+    removed = swap_remove(items, [3, 3, 0])
+    assert sorted(removed) == [0, 3]
+    assert sorted(items) == [1, 2]
+    assert sorted(swap_remove(items, [0, 1])) == [1, 2]
+    assert items == []
@@ -0,0 +1,62 @@
+from game import Game, INPUT_START, INPUT_JUMP, INPUT_DUCK, INPUT_UNDUCK
+from replay import InputRecorder, Replay, ReplayPlayer, summarize
+
+
+def world_state(game):
+    state = summarize(game)
+    player = game.player
+    state["player"] = (player.y, player.velocity_y, player.damage_cooldown, player.protection_timer)
+    state["pollution"] = [(p.x, p.y, p.radius) for p in game.pollution_objects]
+    state["masks"] = [(m.x, m.y) for m in game.masks]
+    state["particles"] = game.particles.x[:game.particles.count].tolist()
+    return state
+
+
+def record_session(path, seed=7, end_tick=3000):
+    recorder = InputRecorder(seed)
+    recorder.record(0, INPUT_START)
+    codes = (INPUT_JUMP, INPUT_DUCK, INPUT_UNDUCK)
+    for i, tick in enumerate(range(50, end_tick, 97)):
+        recorder.record(tick, codes[i % 3])
+    recorder.finish(end_tick)
+    recorder.save(path)
+
+
+def test_replay_file_round_trip(tmp_path):
+    path = tmp_path / "session.hbr"
+    record_session(path)
+    replay = Replay.load(path)
+    assert replay.seed == 7
+    assert replay.end_tick == 3000
+    assert replay.ticks[0] == 0 and replay.codes[0] == INPUT_START
+    assert replay.ticks == sorted(replay.ticks)
+
+
+def test_seek_reproduces_the_forward_run(tmp_path):
+    path = tmp_path / "session.hbr"
+    record_session(path)
+    player = ReplayPlayer(Replay.load(path), keyframe_interval=500)
+    forward = {}
+    for tick in (700, 1234, 3000):
+        player.run_to(tick)
+        forward[tick] = world_state(player.game)
+    assert player.keyframe_ticks[:3] == [0, 500, 1000]
+    # Mundur lewat keyframe, lalu maju lagi ke titik yang sama
+    for tick in (1234, 700, 3000, 1234):
+        player.seek(tick)
+        assert world_state(player.game) == forward[tick]
+
+
+def test_restore_state_matches_uninterrupted_game():
+    game = Game(seed=3)
+    game.apply_input(INPUT_START)
+    for _ in range(400):
+        game.update(1.0 / 60)
+    state = game.save_state()
+    for _ in range(600):
+        game.update(1.0 / 60)
+    expected = world_state(game)
+    game.restore_state(state)
+    for _ in range(600):
+        game.update(1.0 / 60)
+    assert world_state(game) == expected
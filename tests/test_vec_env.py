@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from game import Game, INPUT_START, INPUT_JUMP, INPUT_DUCK, INPUT_UNDUCK, GAME_OVER
+from vec_env import VecRunnerEnv, ACTION_RUN, ACTION_JUMP, ACTION_DUCK
+from world_stream import POLLUTION, MASK
+
+ACTION_INPUTS = {ACTION_RUN: INPUT_UNDUCK, ACTION_JUMP: INPUT_JUMP, ACTION_DUCK: INPUT_DUCK}
+
+
+class RecordingEnv(VecRunnerEnv):
+    # Catat rintangan/mask yang baru di-spawn per env, untuk diberikan ke Game yang sama
+    def _spawn(self):
+        free_obstacles = np.isinf(self.obstacle_x)
+        free_masks = np.isinf(self.mask_x)
+        super()._spawn()
+        self.spawned = {}
+        for env, slot in zip(*np.nonzero(free_obstacles & ~np.isinf(self.obstacle_x))):
+            placement = (self.obstacle_y[env, slot], self.obstacle_radius[env, slot],
+                         self.obstacle_speed[env, slot], 0.9, 0, 0.0)
+            self.spawned.setdefault(env, []).append((0.0, POLLUTION, placement))
+        for env, slot in zip(*np.nonzero(free_masks & ~np.isinf(self.mask_x))):
+            placement = (self.mask_y[env, slot], self.mask_speed[env, slot], self.mask_float_time[env, slot])
+            self.spawned.setdefault(env, []).append((0.0, MASK, placement))
+
+
+class ScriptedWorld:
+    # Pengganti WorldStream: mengeluarkan persis apa yang di-spawn env pada tick ini
+    def __init__(self):
+        self.pending = []
+
+    def entering(self, t0, t1):
+        events, self.pending = self.pending, []
+        return events
+
+    def discard_before(self, time):
+        pass
+
+
+def new_game():
+    game = Game(seed=0)
+    game.apply_input(INPUT_START)
+    game.world = ScriptedWorld()
+    return game
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_vec_env_matches_game_update(seed):
+    num_envs = 8
+    env = RecordingEnv(num_envs, seed=seed)
+    env.reset()
+    games = [new_game() for _ in range(num_envs)]
+    rng = np.random.default_rng(seed)
+    deaths = 0
+    max_error = 0.0
+    for _ in range(2000):
+        actions = rng.choice(3, size=num_envs, p=(0.93, 0.04, 0.03))
+        _, _, done, info = env.step(actions)
+        for i in range(num_envs):
+            game = games[i]
+            game.apply_input(ACTION_INPUTS[int(actions[i])])
+            game.world.pending = env.spawned.get(i, [])
+            game.update(env.dt)
+            if done[i]:
+                deaths += 1
+                assert game.state == GAME_OVER
+                assert info["final_score"][i] == game.score
+                games[i] = new_game()
+                continue
+            assert game.state != GAME_OVER
+            player = game.player
+            expected = (player.y, player.velocity_y, player.health, player.damage_cooldown, player.protection_timer)
+            actual = (env.y[i], env.velocity_y[i], env.health[i], env.damage_cooldown[i], env.protection_timer[i])
+            max_error = max(max_error, max(abs(a - b) for a, b in zip(expected, actual)))
+            assert (player.is_ducking, player.on_ground) == (env.ducking[i], env.on_ground[i])
+    assert max_error < 1e-9
+    assert deaths > 0
+    assert env.dropped_spawns == 0
+
+
+def test_observation_is_a_copy_unless_requested():
+    env = VecRunnerEnv(4, seed=0)
+    first = env.reset()
+    second, _, _, _ = env.step(np.zeros(4, dtype=np.int64))
+    assert not np.shares_memory(first, second)
+    assert not np.shares_memory(second, env.obs)
+    buffer, _, _, _ = env.step(np.zeros(4, dtype=np.int64), copy=False)
+    assert buffer is env.obs
@@ -0,0 +1,49 @@
+import pytest
+from world_stream import WorldStream, POLLUTION, MASK
+
+
+def windows(stream, edges):
+    events = []
+    for t0, t1 in zip(edges, edges[1:]):
+        events.extend(stream.entering(t0, t1))
+    return events
+
+
+def test_windows_split_at_chunk_boundaries_match_one_query():
+    expected = list(WorldStream(11, chunk_seconds=10.0).entering(0.0, 60.0))
+    assert expected and {kind for _, kind, _ in expected} == {POLLUTION, MASK}
+    # Tepat di batas chunk, dan tepat di sekitar batas
+    edges = [0.0, 9.999, 10.0, 10.001, 20.0, 29.5, 30.0, 40.0, 50.0, 60.0]
+    assert windows(WorldStream(11, chunk_seconds=10.0), edges) == expected
+
+
+def test_per_tick_windows_match_one_query():
+    dt = 1.0 / 60
+    edges = [tick * dt for tick in range(int(45 / dt) + 1)]
+    expected = list(WorldStream(5, chunk_seconds=10.0).entering(0.0, edges[-1]))
+    assert windows(WorldStream(5, chunk_seconds=10.0), edges) == expected
+
+
+def test_window_is_half_open_and_sorted():
+    stream = WorldStream(2, chunk_seconds=10.0)
+    events = list(stream.entering(0.0, 30.0))
+    times = [time for time, _, _ in events]
+    assert times == sorted(times)
+    boundary = times[len(times) // 2]
+    before = list(WorldStream(2, chunk_seconds=10.0).entering(0.0, boundary))
+    after = list(WorldStream(2, chunk_seconds=10.0).entering(boundary, 30.0))
+    assert before + after == events
+    assert after[0][0] == boundary
+    assert list(stream.entering(boundary, boundary)) == []
+
+
+def test_lookahead_and_discard():
+    stream = WorldStream(3, chunk_seconds=10.0, lookahead=1)
+    list(stream.entering(0.0, 5.0))
+    assert stream.generated == 2
+    list(stream.entering(19.0, 21.0))
+    assert stream.generated == 4
+    stream.discard_before(21.0)
+    assert stream.chunks[0].index == 2
+    with pytest.raises(ValueError):
+        list(stream.entering(15.0, 16.0))
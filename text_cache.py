@@ -0,0 +1,70 @@
+from collections import OrderedDict
+import pygame
+from constants import TEXT_CACHE_MAX_ENTRIES
+
+
+class TextRenderer:
+    # Cache LRU untuk surface teks yang sudah dirender, dengan key (teks, ukuran, warna).
+    # Skor hanya berubah 10x per detik dan judul menu statis, jadi hampir semua frame kena cache.
+    def __init__(self, max_entries=TEXT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
+
+    def _render(self, text, size, color):
+        # Font.render mengabaikan alpha warna, jadi alpha (0..1 atau 0..255) dipasang ke surface
+        alpha = None
+        if len(color) == 4:
+            alpha = color[3]
+            if isinstance(alpha, float) and alpha <= 1.0:
+                alpha = int(round(alpha * 255))
+            color = color[:3]
+        surface = self.get_font(size).render(text, True, color)
+        if alpha is not None and alpha < 255:
+            surface.set_alpha(alpha)
+        return surface
+
+    def render(self, text, size, color):
+        key = (text, size, color)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = self._render(text, size, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def rect(self, text, size, color, center):
+        return self.render(text, size, color).get_rect(center=center)
+
+    def blit_centered(self, target, text, size, color, center):
+        surface = self.render(text, size, color)
+        rect = surface.get_rect(center=center)
+        target.blit(surface, rect)
+        return rect
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "fonts": len(self.fonts),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,30 @@
+from constants import SIM_TICK_RATE, SIM_MAX_STEPS_PER_FRAME
+
+
+class FixedTimestep:
+    # Akumulator fixed-step: waktu frame nyata dikumpulkan lalu dipecah menjadi tick simulasi
+    # dengan dt tetap. Sisa waktu dipakai sebagai faktor interpolasi saat render.
+    def __init__(self, tick_rate=SIM_TICK_RATE, max_steps=SIM_MAX_STEPS_PER_FRAME):
+        self.tick_rate = tick_rate
+        self.step_dt = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.dropped_time = 0.0
+
+    def advance(self, frame_dt):
+        self.accumulator += frame_dt
+        steps = int(self.accumulator / self.step_dt)
+        if steps > self.max_steps:
+            # Hindari "spiral of death" setelah hitch panjang: buang waktu yang tidak terkejar
+            self.dropped_time += (steps - self.max_steps) * self.step_dt
+            self.accumulator -= (steps - self.max_steps) * self.step_dt
+            steps = self.max_steps
+        self.accumulator -= steps * self.step_dt
+        self.ticks += steps
+        return steps
+
+    @property
+    def alpha(self):
+        # Posisi render di antara tick sebelumnya (0.0) dan tick terakhir (1.0)
+        return min(1.0, self.accumulator / self.step_dt)
@@ -0,0 +1,288 @@
+import argparse
+import time
+import numpy as np
+from constants import (
+    SCREEN_WIDTH, SIM_TICK_RATE, GROUND_Y, DAMAGE_COOLDOWN,
+    PLAYER_WIDTH, PLAYER_HEIGHT, PLAYER_DUCK_HEIGHT, PLAYER_GRAVITY, PLAYER_JUMP_STRENGTH,
+    POLLUTION_MIN_RADIUS, POLLUTION_MAX_RADIUS, POLLUTION_MIN_SPEED, POLLUTION_MAX_SPEED,
+    POLLUTION_SPAWN_MIN_Y, POLLUTION_SPAWN_MID_Y, POLLUTION_SPAWN_MAX_Y, POLLUTION_DAMAGE,
+    POLLUTION_SPAWN_INTERVAL_MIN, POLLUTION_SPAWN_INTERVAL_MAX,
+    MASK_SPAWN_INTERVAL_MIN, MASK_SPAWN_INTERVAL_MAX, MASK_SIZE, MASK_HEALTH_RESTORE,
+    MASK_PROTECTION_DURATION, MASK_SPAWN_MIN_Y, MASK_SPAWN_MAX_Y,
+    VEC_ENV_MAX_OBSTACLES, VEC_ENV_MAX_MASKS, VEC_ENV_OBS_OBSTACLES
+)
+from pollution import Pollution
+from mask import Mask
+
+# Aksi per env, dipetakan ke input Game: RUN = INPUT_UNDUCK, JUMP = INPUT_JUMP, DUCK = INPUT_DUCK
+ACTION_RUN = 0
+ACTION_JUMP = 1
+ACTION_DUCK = 2
+NUM_ACTIONS = 3
+
+# Sama dengan Game.reset_game dan Player.max_health
+PLAYER_X = 100
+MAX_HEALTH = 100
+
+PLAYER_FEATURES = ("y", "velocity_y", "health", "on_ground", "ducking", "protection_timer", "damage_cooldown")
+OBSTACLE_FEATURES = ("present", "dx", "y", "radius", "speed")
+MASK_FEATURES = ("present", "dx", "dy")
+
+
+class VecRunnerEnv:
+    # N game independen dengan aturan Game.update (fisika Player.update, tabrakan awan/mask,
+    # damage cooldown, proteksi) disimpan sebagai array NumPy; step() memajukan semuanya
+    # sekaligus tanpa loop Python per game. Slot awan/mask kosong ditandai x = inf,
+    # sehingga tes tabrakan dan pengurutan tidak butuh mask "aktif" terpisah.
+    # Jadwal spawn mengikuti distribusi WorldStream, tetapi diambil dari satu generator NumPy.
+    def __init__(self, num_envs, seed=None, dt=1.0 / SIM_TICK_RATE, max_obstacles=VEC_ENV_MAX_OBSTACLES,
+                 max_masks=VEC_ENV_MAX_MASKS, obs_obstacles=VEC_ENV_OBS_OBSTACLES, max_seconds=None):
+        if min(POLLUTION_SPAWN_INTERVAL_MIN, MASK_SPAWN_INTERVAL_MIN) <= dt:
+            # Paling banyak satu spawn per jenis per tick
+            raise ValueError("spawn intervals must be longer than dt")
+        self.num_envs = num_envs
+        self.dt = dt
+        self.max_seconds = max_seconds
+        self.obs_obstacles = obs_obstacles
+        self.rng = np.random.default_rng(seed)
+        n = num_envs
+        self.y = np.zeros(n)
+        self.velocity_y = np.zeros(n)
+        self.height = np.zeros(n)
+        self.on_ground = np.zeros(n, dtype=bool)
+        self.ducking = np.zeros(n, dtype=bool)
+        self.health = np.zeros(n)
+        self.damage_cooldown = np.zeros(n)
+        self.protection_timer = np.zeros(n)
+        self.protected = np.zeros(n, dtype=bool)
+        self.survival_time = np.zeros(n)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.next_pollution = np.zeros(n)
+        self.next_mask = np.zeros(n)
+        self.obstacle_x = np.full((n, max_obstacles), np.inf)
+        self.obstacle_y = np.zeros((n, max_obstacles))
+        self.obstacle_radius = np.zeros((n, max_obstacles))
+        self.obstacle_speed = np.zeros((n, max_obstacles))
+        self.mask_x = np.full((n, max_masks), np.inf)
+        self.mask_y = np.zeros((n, max_masks))
+        self.mask_speed = np.zeros((n, max_masks))
+        self.mask_float_time = np.zeros((n, max_masks))
+        self.dropped_spawns = 0
+        self.obs = np.zeros((n, self.observation_size), dtype=np.float32)
+
+    @property
+    def observation_size(self):
+        return len(PLAYER_FEATURES) + self.obs_obstacles * len(OBSTACLE_FEATURES) + len(MASK_FEATURES)
+
+    def reset(self, seed=None, copy=True):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset(np.ones(self.num_envs, dtype=bool))
+        return self.observe(copy)
+
+    def _reset(self, envs):
+        count = int(np.count_nonzero(envs))
+        if count == 0:
+            return
+        self.y[envs] = GROUND_Y - PLAYER_HEIGHT
+        self.velocity_y[envs] = 0.0
+        self.height[envs] = PLAYER_HEIGHT
+        self.on_ground[envs] = True
+        self.ducking[envs] = False
+        self.health[envs] = MAX_HEALTH
+        self.damage_cooldown[envs] = 0.0
+        self.protection_timer[envs] = 0.0
+        self.protected[envs] = False
+        self.survival_time[envs] = 0.0
+        self.score[envs] = 0
+        self.next_pollution[envs] = self.rng.uniform(POLLUTION_SPAWN_INTERVAL_MIN, POLLUTION_SPAWN_INTERVAL_MAX, count)
+        self.next_mask[envs] = self.rng.uniform(MASK_SPAWN_INTERVAL_MIN, MASK_SPAWN_INTERVAL_MAX, count)
+        self.obstacle_x[envs] = np.inf
+        self.obstacle_speed[envs] = 0.0
+        self.mask_x[envs] = np.inf
+        self.mask_speed[envs] = 0.0
+
+    def step(self, actions, copy=True):
+        # Mengembalikan (obs, reward, done, info). reward = kenaikan skor Game (10 per detik),
+        # env yang selesai langsung di-reset dan obs-nya adalah obs awal episode baru.
+        # copy=False: obs adalah buffer internal self.obs yang ditimpa oleh step berikutnya.
+        dt = self.dt
+        actions = np.asarray(actions)
+
+        # Input dulu, seperti Game.apply_input sebelum Game.update
+        jump = (actions == ACTION_JUMP) & self.on_ground
+        duck = (actions == ACTION_DUCK) & self.on_ground & ~self.ducking
+        # Lompat saat jongkok = unduck lalu jump
+        unduck = ((actions == ACTION_RUN) | jump) & self.ducking
+        self.ducking = (self.ducking & ~unduck) | duck
+        self.height = np.where(self.ducking, float(PLAYER_DUCK_HEIGHT), float(PLAYER_HEIGHT))
+        self.y = np.where(duck | unduck, GROUND_Y - self.height, self.y)
+        self.velocity_y[jump] = -PLAYER_JUMP_STRENGTH
+        self.on_ground &= ~jump
+
+        # Player.update
+        previous_score = self.score
+        self.survival_time += dt
+        self.score = (self.survival_time * 10).astype(np.int64)
+        self.velocity_y += PLAYER_GRAVITY * dt
+        self.y += self.velocity_y * dt
+        ground = GROUND_Y - self.height
+        self.on_ground = self.y >= ground
+        np.copyto(self.y, ground, where=self.on_ground)
+        self.velocity_y[self.on_ground] = 0.0
+        np.subtract(self.damage_cooldown, dt, out=self.damage_cooldown, where=self.damage_cooldown > 0)
+        self.protected = self.protection_timer > 0
+        np.subtract(self.protection_timer, dt, out=self.protection_timer, where=self.protected)
+        # Game memeriksa kematian setelah Player.update, sebelum tabrakan tick yang sama
+        done = self.health <= 0
+        if self.max_seconds is not None:
+            done |= self.survival_time >= self.max_seconds
+
+        self._spawn()
+
+        # Awan: gerak, lalu lingkaran vs AABB player (circles_vs_aabb)
+        self.obstacle_x -= self.obstacle_speed * dt
+        xs = self.obstacle_x
+        radii = self.obstacle_radius
+        dx = xs - np.clip(xs, PLAYER_X, PLAYER_X + PLAYER_WIDTH)
+        dy = self.obstacle_y - np.clip(self.obstacle_y, self.y[:, None], (self.y + self.height)[:, None])
+        hits = dx * dx + dy * dy < radii * radii
+        # take_damage: beberapa awan di tick yang sama tetap satu kali damage karena cooldown
+        damaged = hits.any(axis=1) & ~self.protected & (self.damage_cooldown <= 0)
+        self.health = np.where(damaged, np.maximum(0.0, self.health - POLLUTION_DAMAGE), self.health)
+        self.damage_cooldown[damaged] = DAMAGE_COOLDOWN
+        gone = hits | (xs + radii + Pollution.OFF_SCREEN_MARGIN < 0)
+        xs[gone] = np.inf
+        self.obstacle_speed[gone] = 0.0
+
+        # Mask: gerak + floating, lalu lingkaran vs lingkaran player (circles_vs_circle)
+        self.mask_x -= self.mask_speed * dt
+        self.mask_float_time += dt * 3
+        mask_dx = self.mask_x - (PLAYER_X + PLAYER_WIDTH / 2)
+        mask_dy = (self.mask_y + np.sin(self.mask_float_time) * 3) - (self.y + self.height / 2)[:, None]
+        reach = MASK_SIZE + (np.maximum(PLAYER_WIDTH, self.height) / 2)[:, None]
+        mask_hits = mask_dx * mask_dx + mask_dy * mask_dy < reach * reach
+        if mask_hits.any():
+            self._collect_masks(mask_hits.sum(axis=1))
+        gone = mask_hits | (self.mask_x + MASK_SIZE + Mask.OFF_SCREEN_MARGIN < 0)
+        self.mask_x[gone] = np.inf
+        self.mask_speed[gone] = 0.0
+
+        reward = (self.score - previous_score).astype(np.float32)
+        info = {}
+        if done.any():
+            info["final_survival_time"] = np.where(done, self.survival_time, 0.0)
+            info["final_score"] = np.where(done, self.score, 0)
+            self._reset(done)
+        return self.observe(copy), reward, done, info
+
+    def _collect_masks(self, count):
+        # Player.collect_mask berurutan: +25 darah sampai penuh, mask berikutnya memberi proteksi
+        health = self.health
+        needed = np.where(health < MAX_HEALTH, np.ceil((MAX_HEALTH - health) / MASK_HEALTH_RESTORE), 0)
+        protect = count > needed
+        self.health = np.minimum(MAX_HEALTH, health + MASK_HEALTH_RESTORE * count)
+        self.protection_timer[protect] = MASK_PROTECTION_DURATION
+        self.protected |= protect
+
+    def _spawn(self):
+        # Spawn yang jatuh di [t0, t1) tick ini, sama seperti WorldStream.entering
+        t1 = self.survival_time
+        rng = self.rng
+        envs = np.flatnonzero(self.next_pollution < t1)
+        if len(envs):
+            self.next_pollution[envs] += rng.uniform(
+                POLLUTION_SPAWN_INTERVAL_MIN, POLLUTION_SPAWN_INTERVAL_MAX, len(envs)
+            )
+            envs, slots = self._free_slots(self.obstacle_x, envs)
+            count = len(envs)
+            radius = rng.uniform(POLLUTION_MIN_RADIUS, POLLUTION_MAX_RADIUS, count)
+            high = rng.random(count) < 0.5
+            y = np.where(
+                high,
+                rng.uniform(POLLUTION_SPAWN_MID_Y, POLLUTION_SPAWN_MAX_Y, count),
+                rng.uniform(POLLUTION_SPAWN_MIN_Y, POLLUTION_SPAWN_MID_Y, count)
+            )
+            self.obstacle_x[envs, slots] = SCREEN_WIDTH + radius + 50
+            self.obstacle_y[envs, slots] = y
+            self.obstacle_radius[envs, slots] = radius
+            self.obstacle_speed[envs, slots] = rng.uniform(POLLUTION_MIN_SPEED, POLLUTION_MAX_SPEED, count)
+        envs = np.flatnonzero(self.next_mask < t1)
+        if len(envs):
+            self.next_mask[envs] += rng.uniform(MASK_SPAWN_INTERVAL_MIN, MASK_SPAWN_INTERVAL_MAX, len(envs))
+            envs, slots = self._free_slots(self.mask_x, envs)
+            count = len(envs)
+            self.mask_x[envs, slots] = SCREEN_WIDTH + MASK_SIZE
+            self.mask_y[envs, slots] = rng.uniform(MASK_SPAWN_MIN_Y, MASK_SPAWN_MAX_Y, count)
+            self.mask_speed[envs, slots] = rng.uniform(POLLUTION_MIN_SPEED, POLLUTION_MAX_SPEED, count)
+            self.mask_float_time[envs, slots] = rng.uniform(0, 2 * np.pi, count)
+
+    def _free_slots(self, xs, envs):
+        # Slot kosong pertama per env; env yang semua slotnya terisi melewatkan spawn ini
+        free = np.isinf(xs[envs])
+        slots = free.argmax(axis=1)
+        ok = free[np.arange(len(envs)), slots]
+        self.dropped_spawns += len(envs) - int(np.count_nonzero(ok))
+        return envs[ok], slots[ok]
+
+    def observe(self, copy=True):
+        # copy=False mengembalikan self.obs apa adanya (tanpa alokasi), hanya valid sampai step berikutnya
+        obs = self.obs
+        obs[:, 0] = self.y
+        obs[:, 1] = self.velocity_y
+        obs[:, 2] = self.health / MAX_HEALTH
+        obs[:, 3] = self.on_ground
+        obs[:, 4] = self.ducking
+        obs[:, 5] = self.protection_timer
+        obs[:, 6] = self.damage_cooldown
+        column = len(PLAYER_FEATURES)
+        # Awan terdekat diurutkan menurut x (slot kosong = inf, jadi selalu di belakang)
+        order = np.argsort(self.obstacle_x, axis=1)[:, :self.obs_obstacles]
+        xs = np.take_along_axis(self.obstacle_x, order, axis=1)
+        present = np.isfinite(xs)
+        fields = (
+            present,
+            np.where(present, xs - PLAYER_X, 0.0),
+            np.take_along_axis(self.obstacle_y, order, axis=1),
+            np.take_along_axis(self.obstacle_radius, order, axis=1),
+            np.take_along_axis(self.obstacle_speed, order, axis=1),
+        )
+        width = len(OBSTACLE_FEATURES)
+        for i, values in enumerate(fields):
+            obs[:, column + i:column + width * self.obs_obstacles:width] = np.where(present, values, 0.0)
+        column += width * self.obs_obstacles
+        nearest = np.argmin(self.mask_x, axis=1)[:, None]
+        mask_x = np.take_along_axis(self.mask_x, nearest, axis=1)[:, 0]
+        present = np.isfinite(mask_x)
+        mask_y = np.take_along_axis(self.mask_y, nearest, axis=1)[:, 0]
+        obs[:, column] = present
+        obs[:, column + 1] = np.where(present, mask_x - PLAYER_X, 0.0)
+        obs[:, column + 2] = np.where(present, mask_y - self.y, 0.0)
+        return obs.copy() if copy else obs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure VecRunnerEnv throughput with random actions.")
+    parser.add_argument("--envs", type=int, default=4096)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    env = VecRunnerEnv(args.envs, seed=args.seed)
+    env.reset(copy=False)
+    rng = np.random.default_rng(args.seed)
+    # Sebagian besar lari, sesekali lompat/jongkok
+    actions = rng.choice(NUM_ACTIONS, size=(args.steps, args.envs), p=(0.9, 0.05, 0.05))
+    episodes = 0
+    start = time.perf_counter()
+    for step in range(args.steps):
+        _, _, done, _ = env.step(actions[step], copy=False)
+        episodes += int(np.count_nonzero(done))
+    wall = time.perf_counter() - start
+    print("%d envs x %d steps in %.3f s: %.0f env-steps/s, %d episodes finished" % (
+        args.envs, args.steps, wall, args.envs * args.steps / wall, episodes
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import bisect
+from collections import deque
+from constants import (
+    POLLUTION_SPAWN_INTERVAL_MIN, POLLUTION_SPAWN_INTERVAL_MAX,
+    MASK_SPAWN_INTERVAL_MIN, MASK_SPAWN_INTERVAL_MAX,
+    WORLD_CHUNK_SECONDS, WORLD_LOOKAHEAD_CHUNKS
+)
+from rng_streams import RngStreams
+from pollution import Pollution
+from mask import Mask
+
+POLLUTION = 0
+MASK = 1
+
+
+class WorldChunk:
+    # Semua penempatan dengan waktu masuk di [start, end), terurut waktu (list paralel)
+    def __init__(self, index, start, end):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.times = []
+        self.kinds = []
+        self.placements = []
+
+
+class WorldStream:
+    # Jadwal rintangan satu run, dibangkitkan lazily per chunk `chunk_seconds` dari seed.
+    # Waktu dihitung dalam survival_time. Chunk dibangkitkan berurutan (jarak antar spawn
+    # berlanjut melewati batas chunk) dan selalu `lookahead` chunk di depan yang sedang dibaca,
+    # jadi simulasi tidak memanggil random sama sekali saat spawn.
+    def __init__(self, seed=None, chunk_seconds=WORLD_CHUNK_SECONDS, lookahead=WORLD_LOOKAHEAD_CHUNKS):
+        self.seed = seed
+        self.chunk_seconds = chunk_seconds
+        self.lookahead = lookahead
+        streams = RngStreams(seed)
+        # Hanya stream yang dipakai disimpan (ikut tersalin di keyframe replay)
+        self.spawn_rng = streams.spawn
+        self.pollution_rng = streams.pollution
+        self.mask_rng = streams.mask
+        self.next_pollution_time = self._pollution_interval()
+        self.next_mask_time = self._mask_interval()
+        # Chunk yang masih disimpan; chunk yang sudah lewat dibuang
+        self.chunks = deque()
+        self.generated = 0
+        self._generate()
+
+    def _pollution_interval(self):
+        return self.spawn_rng.uniform(POLLUTION_SPAWN_INTERVAL_MIN, POLLUTION_SPAWN_INTERVAL_MAX)
+
+    def _mask_interval(self):
+        return self.spawn_rng.uniform(MASK_SPAWN_INTERVAL_MIN, MASK_SPAWN_INTERVAL_MAX)
+
+    def _generate(self):
+        index = self.generated
+        chunk = WorldChunk(index, index * self.chunk_seconds, (index + 1) * self.chunk_seconds)
+        events = []
+        while self.next_pollution_time < chunk.end:
+            events.append((self.next_pollution_time, POLLUTION, Pollution.random_placement(self.pollution_rng)))
+            self.next_pollution_time += self._pollution_interval()
+        while self.next_mask_time < chunk.end:
+            events.append((self.next_mask_time, MASK, Mask.random_placement(self.mask_rng)))
+            self.next_mask_time += self._mask_interval()
+        events.sort(key=lambda event: (event[0], event[1]))
+        for time, kind, placement in events:
+            chunk.times.append(time)
+            chunk.kinds.append(kind)
+            chunk.placements.append(placement)
+        self.chunks.append(chunk)
+        self.generated += 1
+        return chunk
+
+    def chunk_index(self, time):
+        return int(time // self.chunk_seconds)
+
+    def ensure(self, index):
+        # Bangkitkan sampai chunk `index` (plus lookahead) tersedia
+        while self.generated <= index + self.lookahead:
+            self._generate()
+
+    def entering(self, t0, t1):
+        # Penempatan yang masuk layar di [t0, t1), sebagai (time, kind, placement).
+        # Bisect per chunk yang disentuh, lalu hanya k hasil yang dibaca.
+        if t1 <= t0:
+            return
+        first = self.chunk_index(t0)
+        last = self.chunk_index(t1)
+        if first < self.chunks[0].index:
+            raise ValueError("time %.3f is before the oldest retained chunk" % t0)
+        self.ensure(last)
+        for chunk in self.chunks:
+            if chunk.index < first:
+                continue
+            if chunk.index > last:
+                break
+            times = chunk.times
+            lo = bisect.bisect_left(times, t0)
+            hi = bisect.bisect_left(times, t1)
+            for i in range(lo, hi):
+                yield times[i], chunk.kinds[i], chunk.placements[i]
+
+    def upcoming(self, t0, horizon):
+        # Look-ahead untuk bot/policy: semua yang akan masuk dalam `horizon` detik berikutnya
+        return list(self.entering(t0, t0 + horizon))
+
+    def discard_before(self, time):
+        # Buang chunk yang seluruhnya sudah lewat (simulasi tidak pernah mundur)
+        first = self.chunk_index(time)
+        while len(self.chunks) > 1 and self.chunks[0].index < first:
+            self.chunks.popleft()